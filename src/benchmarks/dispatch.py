@@ -0,0 +1,719 @@
+################################################################################
+#                                                                              #
+#                                 dispatch.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a frozen copy of the match dispatch of the parsers.           #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+#
+# globals
+#
+
+# the objectid counters of the csv sources, which numbered
+# their rows as each cell was dispatched
+#
+habitat_mapper_count = 0
+land_cover_count = 0
+
+#
+# habitat-mapper dispatch
+#
+
+def get_habitat_mapper_value(observation, key):
+	global habitat_mapper_count
+
+	match key:
+
+		case 'OBJECTID':
+			habitat_mapper_count += 1
+			return habitat_mapper_count
+
+		case 'title':
+			return 'GLOBE Observer Mosquito Habitats'
+
+		case 'dataStreamName':
+			return 'Mosquito Habitats ' + observation['mhm_Userid']
+
+		case 'dataStreamDescription':
+			return 'Mosquito Habitats as documented by a photo'
+
+		case 'observationType':
+			return 'Sensor'
+
+		case 'unitOfCategory':
+			return 'Mosquito Habitat, NA, NC'
+
+		case 'phenomenonTime':
+			return observation['mhm_MeasuredAt']
+
+		case 'resultTime':
+			return observation['mhm_measuredDate']
+
+		case 'result':
+			return observation['mhm_WaterSourcePhotoUrls']
+
+		case 'submitTime':
+			return observation['mhm_createDate']
+
+		case 'imageStatus':
+			return 1 if observation['mhm_WaterSourcePhotoUrls'] else 0
+
+		case 'parameters':
+			return observation['mhm_WaterSourcePhotoUrls']
+
+		case 'licenseName':
+			return 'NA'
+
+		case 'licenseURI':
+			return 'https://www.globe.gov/documents/10157/2592674/GLOBE+Data+User+Guide_v1_final.pdf/863a971d-95c5-4dd9-b75c-46713f019088'
+
+		case 'attributionDataSource':
+			return 'User: ' + observation['mhm_Userid']
+
+		case 'attributionDataAggregator':
+			return "Global Learning and Observations to Benefit the Environment (GLOBE)"
+
+		case 'validationStatus':
+			return '1'
+
+		case 'validationMethod':
+			return "Our Validation method is as follows: 1) GLOBE Observer App has its own validators to ensure the requested data type matches the received value. 2) GLOBE Observer Team validates the photos to ensure they are useful and match the area where the photographer took the photo. 3) Our pre-processing algorithms ensure values entered are appropriate and reasonable. Our code also creates quality assurance flag to allow Users to better summarize the data."
+
+		case 'validationResult':
+			return "FALSE (Entries with their photos undergoing GLOBE's validation process will have a 'pending' code for their photos. NOTE: Some entries' photos will be listed as 'rejected'. Photos that pass our validation process will include GLOBE's URL to that photo)"
+
+		case 'qualityDescription':
+			return "GLOBE Observer Data Guide: https://www.globe.gov/documents/10157/2592674/GLOBE+Data+User+Guide_v1_final.pdf/863a971d-95c5-4dd9-b75c-46713f019088 (Page 25)"
+
+		case 'qualityGrade':
+			return 'research'
+
+		case 'observedPropertyName':
+			return 'Mosquito Habitats'
+
+		case 'observedPropertyDescription':
+			return 'Mosquito Habitats as documented by a photo'
+
+		case 'observedPropertyDefinition':
+			return 'https://observer.globe.gov/toolkit/mosquito-habitat-mapper-toolkit'
+
+		case 'sensorName':
+			return 'NA'
+
+		case 'sensorDescription':
+			return 'NA'
+
+		case 'sensorEncodingType':
+			return 'NA'
+
+		case 'sensorMetadata':
+			return 'NA'
+
+		case 'locationName':
+			return observation['mhm_siteName']
+
+		case 'locationDescription':
+			return observation['mhm_siteId']
+
+		case 'locationEncodingType':
+			return 'GeoJSON'
+
+		case 'latitude':
+			return observation['mhm_MGRSLatitude']
+
+		case 'longitude':
+			return observation['mhm_MGRSLongitude']
+
+		case 'volunteerName':
+			return 'User: ' + observation['mhm_Userid']
+
+		case 'volunteerDescription':
+			return observation['mhm_organizationName']
+
+		case 'volunteerProperties':
+			return observation['mhm_WaterSource']
+
+		case 'featureName':
+			return observation['mhm_siteName']
+
+		case 'featureDescription':
+			return observation['mhm_siteId']
+
+		case 'featureEncodingType':
+			return 'GeoJSON'
+
+		case 'featureLocation':
+			return ''
+
+		case 'type':
+			return 'Point'
+
+		case 'coordinates':
+			return ''
+
+		case 'x':
+			return ''
+
+		case 'y':
+			return ''
+
+	return ''
+
+#
+# inaturalist dispatch
+#
+
+def get_inaturalist_value(observation, key):
+	match key:
+
+		case 'OBJECTID':
+			return observation['id']
+
+		case 'title':
+			return 'Citizen·science·data·on·mosquitos·from·iNaturalist·with·additional·automated·ID'
+
+		case 'description':
+			return 'Data·is·generated·from·the·iNaturalist·database·filtered·by·Mosquitoes·and·quality·grade·before·additional·automated·identifications·are·added'
+
+		case 'dataStreamName':
+			return '·Research·grade·mosquito·species·occurrence·data·from·user·cell·phone'
+
+		case 'dataStreamDescription':
+			return 'All·species·occurrence·observations·from·a·particular·user·taken·with·a·sensor·or·manually'
+
+		case 'dataStreamObsType':
+			return 'category observation'
+
+		case 'dataStreamUniCategory':
+			return {
+				"Type": "Annotations potentially including lifecycle phase",
+				"Identified by Human": "Annotations potentially including lifecycle phase",
+				"Identified by Machine": "Annotations potentially including lifecycle phase"
+			}
+
+		case 'observationProObsUID':
+			return observation['uuid']
+
+		case 'observationResCatObsPheTime':
+			return observation['time_observed_at']
+
+		case 'observationResCatObsResTime':
+			return ''
+
+		case 'observationResCatObsResult':
+			return {
+				'Type': 'adult',
+				'Human ID': observation['taxon']['name'],
+				'Automated ID': []
+			}
+
+		case 'obsResCatObsResult_Type':
+			return 'adult'
+
+		case 'Identified by Human' | 'Indentified by Human':
+			return observation['taxon']['name']
+
+		case 'Identified by Machine' | 'Identified by Machine':
+			return ''
+
+		case 'observationResCatObsSubTime':
+			return ''
+
+		case 'observationImaImaStatus':
+			return 1 if observation['observation_photos'] else 0
+
+		case 'observationImaImaResult':
+			photos = observation['observation_photos']
+			if photos:
+				return photos[0]['photo']['url']
+
+		case 'observationConParameters':
+			return {
+				'captive': observation['captive'],
+				'comments': observation['comments'],
+				'time_zone_offset': observation['time_zone_offset'],
+				'uri': observation['uri'],
+				'icon_url': observation['user']['icon_url'],
+				'sounds': observation['sounds']
+			}
+
+		case 'Aegypti_Certainty':
+			return ''
+
+		case 'Tiger_Certainty':
+			return ''
+
+		case 'omProcessLicLicName':
+			return observation['taxon']['default_photo']['license_code']
+
+		case 'omProcessLicLicURI':
+			return ''
+
+		case 'omProcessLicLicAttSource':
+			return ''
+
+		case 'omProcessLicLicAttAggregator':
+			return 'iNaturalist'
+
+		case 'omProcessProType' | 'omPrcoessProType':
+			return 'Sensor'
+
+		case 'omProcessProReference':
+			return 'https://www.inaturalist.org/pages/help'
+
+		case 'omProcessResQuaValStatus' | 'omPrcoessResQuaValStatus':
+			return 1
+
+		case 'omProcessResQuaValMethod' | 'omPrcoessResQuaValMethod':
+			return 'Human expert validation'
+
+		case 'omProcessResQuaValResult' | 'omPrcoessResQuaValResult':
+			return 1
+
+		case 'omProcessResQuaQuaGrade' | 'omPrcoessResQuaQuaGrade':
+			return observation['quality_grade']
+
+		case 'observedProName':
+			return 'Species occurrence'
+
+		case 'observedProDescription':
+			return 'Whether a species is observed at a location'
+
+		case 'observedProDefinition':
+			return 'https://www.sciencedirect.com/topics/earth-and-planetary-sciences/species-occurrence'
+
+		case 'sensorName':
+			return observation['uuid']
+
+		case 'sensorDescription':
+			return 'Observation take by mobile phone of user: ' + observation['uuid']
+
+		case 'sensorEncType':
+			return 'NC'
+
+		case 'locationName':
+			return 'Anonymous location'
+
+		case 'locationDescription':
+			return 'location.name'
+
+		case 'locationEncType':
+			return 'GeoJSON Point'
+
+		case 'latitude':
+			location = observation['location']
+			return location.split(',')[0] if location else None
+
+		case 'longitude':
+			location = observation['location']
+			return location.split(',')[1] if location else None
+
+		case 'thingName':
+			return 'sensor.name'
+
+		case 'thingDescription':
+			return 'sensor.description'
+
+		case 'featureIntName':
+			return 'location.name'
+
+		case 'featureIntDescription':
+			return 'location.description'
+
+		case 'featureIntEncType':
+			return 'GeoJSON Point'
+
+		case 'featureIntLocation':
+			return 'latitude, longitude'
+
+		case 'type':
+			return 'FeatureCollection'
+
+		case 'coordinates':
+			return '[' + observation['location'] + ']' if observation['location'] else ''
+
+		case 'nuts_3':
+			return ''
+
+		case 'nuts_2':
+			return ''
+
+		case 'X':
+			return ''
+
+		case 'Y':
+			return ''
+
+		case _:
+			return ''
+
+	return ''
+
+#
+# land-cover dispatch
+#
+
+def get_land_cover_value(observation, key):
+	global land_cover_count
+
+	match key:
+
+		case 'OBJECTID':
+			land_cover_count += 1
+			return land_cover_count
+
+		case 'title':
+			return 'Globe Land Cover v1.0.0 OGC'
+
+		case 'description':
+			return 'Land Cover Data Generated by Globe'
+
+		case 'dataStreamName':
+			return 'Globe Land Cover'
+
+		case 'dataStreamDescription':
+			return ''
+
+		case 'dataStreamObsType':
+			return ''
+
+		case 'dataStreamUniCategory':
+			return ''
+
+		case 'observationProObsUID':
+			return ''
+
+		case 'observationResCatObsPheTime':
+			return ''
+
+		case 'observationResCatObsResTime':
+			return ''
+
+		case 'observationResCatObsResult':
+			return ''
+
+		case 'obsResCatObsResult_Type':
+			return ''
+
+		case 'Identified by Human' | 'Indentified by Human':
+			return ''
+
+		case 'Identified by Machine' | 'Identified by Machine':
+			return ''
+
+		case 'observationResCatObsSubTime':
+			return ''
+
+		case 'observationImaImaStatus':
+			return ''
+
+		case 'observationImaImaResult':
+			return ''
+
+		case 'observationConParameters':
+			return ''
+
+		case 'Aegypti_Certainty':
+			return ''
+
+		case 'Tiger_Certainty':
+			return ''
+
+		case 'omProcessLicLicName':
+			return ''
+
+		case 'omProcessLicLicURI':
+			return ''
+
+		case 'omProcessLicLicAttSource':
+			return ''
+
+		case 'omProcessLicLicAttAggregator':
+			return ''
+
+		case 'omProcessProType' | 'omPrcoessProType':
+			return ''
+
+		case 'omProcessProReference':
+			return ''
+
+		case 'omProcessResQuaValStatus' | 'omPrcoessResQuaValStatus':
+			return ''
+
+		case 'omProcessResQuaValMethod' | 'omPrcoessResQuaValMethod':
+			return ''
+
+		case 'omProcessResQuaValResult' | 'omPrcoessResQuaValResult':
+			return ''
+
+		case 'omProcessResQuaQuaGrade' | 'omPrcoessResQuaQuaGrade':
+			return ''
+
+		case 'observedProName':
+			return ''
+
+		case 'observedProDescription':
+			return ''
+
+		case 'observedProDefinition':
+			return ''
+
+		case 'sensorName':
+			return ''
+
+		case 'sensorDescription':
+			return ''
+
+		case 'sensorEncType':
+			return ''
+
+		case 'locationName':
+			return ''
+
+		case 'locationDescription':
+			return ''
+
+		case 'locationEncType':
+			return ''
+
+		case 'latitude':
+			return ''
+
+		case 'longitude':
+			return ''
+
+		case 'thingName':
+			return ''
+
+		case 'thingDescription':
+			return ''
+
+		case 'featureIntName':
+			return ''
+
+		case 'featureIntDescription':
+			return ''
+
+		case 'featureIntEncType':
+			return ''
+
+		case 'featureIntLocation':
+			return ''
+
+		case 'type':
+			return ''
+
+		case 'coordinates':
+			return ''
+
+		case 'nuts_3':
+			return ''
+
+		case 'nuts_2':
+			return ''
+
+		case 'X':
+			return ''
+
+		case 'Y':
+			return ''
+
+		case _:
+			return ''
+
+	return ''
+
+#
+# mosquito-alert dispatch
+#
+
+def get_mosquito_alert_value(observation, key):
+	match key:
+
+		case 'OBJECTID':
+			return ''
+
+		case 'title':
+			return ''
+
+		case 'description':
+			return ''
+
+		case 'dataStreamName':
+			return ''
+
+		case 'dataStreamDescription':
+			return ''
+
+		case 'dataStreamObsType':
+			return ''
+
+		case 'dataStreamUniCategory':
+			return ''
+
+		case 'observationProObsUID':
+			return ''
+
+		case 'observationResCatObsPheTime':
+			return ''
+
+		case 'observationResCatObsResTime':
+			return ''
+
+		case 'observationResCatObsResult':
+			return ''
+
+		case 'obsResCatObsResult_Type':
+			return ''
+
+		case 'Identified by Human' | 'Indentified by Human':
+			return ''
+
+		case 'Identified by Machine' | 'Identified by Machine':
+			return ''
+
+		case 'observationResCatObsSubTime':
+			return ''
+
+		case 'observationImaImaStatus':
+			return ''
+
+		case 'observationImaImaResult':
+			return ''
+
+		case 'observationConParameters':
+			return ''
+
+		case 'Aegypti_Certainty':
+			return ''
+
+		case 'Tiger_Certainty':
+			return ''
+
+		case 'omProcessLicLicName':
+			return ''
+
+		case 'omProcessLicLicURI':
+			return ''
+
+		case 'omProcessLicLicAttSource':
+			return ''
+
+		case 'omProcessLicLicAttAggregator':
+			return ''
+
+		case 'omProcessProType' | 'omPrcoessProType':
+			return ''
+
+		case 'omProcessProReference':
+			return ''
+
+		case 'omProcessResQuaValStatus' | 'omPrcoessResQuaValStatus':
+			return ''
+
+		case 'omProcessResQuaValMethod' | 'omPrcoessResQuaValMethod':
+			return ''
+
+		case 'omProcessResQuaValResult' | 'omPrcoessResQuaValResult':
+			return ''
+
+		case 'omProcessResQuaQuaGrade' | 'omPrcoessResQuaQuaGrade':
+			return ''
+
+		case 'observedProName':
+			return ''
+
+		case 'observedProDescription':
+			return ''
+
+		case 'observedProDefinition':
+			return ''
+
+		case 'sensorName':
+			return ''
+
+		case 'sensorDescription':
+			return ''
+
+		case 'sensorEncType':
+			return ''
+
+		case 'locationName':
+			return ''
+
+		case 'locationDescription':
+			return ''
+
+		case 'locationEncType':
+			return ''
+
+		case 'latitude':
+			return ''
+
+		case 'longitude':
+			return ''
+
+		case 'thingName':
+			return ''
+
+		case 'thingDescription':
+			return ''
+
+		case 'featureIntName':
+			return ''
+
+		case 'featureIntDescription':
+			return ''
+
+		case 'featureIntEncType':
+			return ''
+
+		case 'featureIntLocation':
+			return ''
+
+		case 'type':
+			return ''
+
+		case 'coordinates':
+			return ''
+
+		case 'nuts_3':
+			return ''
+
+		case 'nuts_2':
+			return ''
+
+		case 'X':
+			return ''
+
+		case 'Y':
+			return ''
+
+		case _:
+			return ''
+
+	return ''
+
+#
+# dispatch functions
+#
+
+# the cell functions of each source as they were before
+# columns were compiled into plans
+#
+dispatchers = {
+	'habitat-mapper': get_habitat_mapper_value,
+	'inaturalist': get_inaturalist_value,
+	'land-cover': get_land_cover_value,
+	'mosquito-alert': get_mosquito_alert_value
+}
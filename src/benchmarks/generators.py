@@ -0,0 +1,202 @@
+################################################################################
+#                                                                              #
+#                                generators.py                                 #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for generating synthetic benchmark data.            #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import csv
+import json
+import random
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.readers import read_csv
+from pipeline.sources import names
+
+#
+# globals
+#
+
+current = os.path.dirname(os.path.abspath(__file__))
+data = current + '/../../data'
+pool_size = 256
+words = ['aedes', 'culex', 'anopheles', 'larvae', 'pupae', 'container', 'bucket', 'tire', 'pond', 'ditch', 'shade', 'sun', 'water', 'clear', 'murky', 'green']
+marker = '"__ID__"'
+uuid_marker = '__UUID__'
+
+#
+# value functions
+#
+
+def get_date(random):
+	return '%04d-%02d-%02d %02d:%02d:00' % (random.randint(2017, 2025), random.randint(1, 12), random.randint(1, 28), random.randint(0, 23), random.randint(0, 59))
+
+def get_value(random, name, samples):
+	lower = name.lower()
+
+	# keep values that look like the real data where possible
+	#
+	if 'latitude' in lower:
+		return '%.5f' % random.uniform(-60, 70)
+	if 'longitude' in lower:
+		return '%.5f' % random.uniform(-180, 180)
+	if 'date' in lower or lower.endswith('measuredat'):
+		return get_date(random)
+	if samples:
+		return random.choice(samples)
+	if 'photourl' in lower:
+		return 'https://data.globe.gov/system/photos/%d/original.jpg' % random.randint(1, 10000000) if random.random() < 0.7 else ''
+	if lower.endswith('id') or 'count' in lower or 'score' in lower:
+		return str(random.randint(0, 100000))
+	return ' '.join(random.choice(words) for count in range(random.randint(0, 3)))
+
+def get_uuid(count):
+	return '00000000-0000-4000-8000-%012d' % count
+
+#
+# pool functions
+#
+
+def get_csv_pool(random, name, id_column):
+
+	# build a pool of distinct rows from the input schema, drawing
+	# values from the sample input for columns that it has
+	#
+	with open(data + '/' + name + '/input/schema.txt', 'r') as file:
+		columns = [line.strip() for line in file if line.strip()]
+	samples = {}
+	sample = data + '/' + name + '/input/sample.csv'
+	if os.path.exists(sample):
+		for record in read_csv(sample):
+			for column, value in zip(type(record).columns, record):
+				samples.setdefault(column, []).append(value)
+
+	rows = []
+	for count in range(pool_size):
+		rows.append([get_value(random, column, samples.get(column)) for column in columns])
+	return columns, columns.index(id_column), rows
+
+def get_inaturalist_pool(random):
+	with open(data + '/inaturalist/input/observation.json', 'r') as file:
+		observation = json.load(file)
+
+	# vary the fields that the parser reads, and keep only one
+	# identification so that records stay a realistic size
+	#
+	texts = []
+	for count in range(pool_size):
+		variant = dict(observation)
+		variant['id'] = '__ID__'
+		variant['uuid'] = uuid_marker
+		variant['identifications'] = observation['identifications'][:1]
+		variant['quality_grade'] = random.choice(['research', 'needs_id', 'casual'])
+		variant['time_observed_at'] = get_date(random).replace(' ', 'T') + '-03:00'
+		variant['location'] = '%.6f,%.6f' % (random.uniform(-60, 70), random.uniform(-180, 180)) if random.random() < 0.95 else None
+		variant['observation_photos'] = observation['observation_photos'] if random.random() < 0.9 else []
+		variant['taxon'] = dict(observation['taxon'], name=random.choice(['Aedes aegypti', 'Aedes albopictus', 'Culex pipiens', 'Aedes albifasciatus']))
+		texts.append(json.dumps(variant))
+	return texts
+
+def get_mosquito_alert_pool(random):
+	with open(data + '/mosquito-alert/input/schema.txt', 'r') as file:
+		columns = [line.strip() for line in file if line.strip()]
+	texts = []
+	for count in range(pool_size):
+		report = {column: get_value(random, column, None) for column in columns}
+		report['version_UUID'] = uuid_marker
+		report['lat'] = round(random.uniform(-60, 70), 5)
+		report['lon'] = round(random.uniform(-180, 180), 5)
+		texts.append(json.dumps(report))
+	return texts
+
+#
+# writing functions
+#
+
+def write_csv_records(filename, columns, id_index, rows, records, random):
+	with open(filename, 'w', newline='') as file:
+		writer = csv.writer(file)
+		writer.writerow(columns)
+		for count in range(records):
+			row = rows[random.randrange(len(rows))]
+			row[id_index] = str(count + 1)
+			writer.writerow(row)
+
+def write_json_records(filename, texts, records, random, key = None):
+	with open(filename, 'w') as file:
+		if key:
+			file.write('{"total_results": %d, "page": 1, "per_page": %d, "%s": [' % (records, records, key))
+		else:
+			file.write('[')
+		for count in range(records):
+			if count:
+				file.write(',\n')
+			text = texts[random.randrange(len(texts))]
+			file.write(text.replace(marker, str(count + 1)).replace(uuid_marker, get_uuid(count + 1)))
+		file.write(']}' if key else ']')
+
+def write_records(name, filename, records, seed = 0):
+	generator = random.Random(seed)
+	match name:
+
+		case 'habitat-mapper':
+			columns, id_index, rows = get_csv_pool(generator, name, 'mhm_MosquitoHabitatMapperId')
+			write_csv_records(filename, columns, id_index, rows, records, generator)
+
+		case 'land-cover':
+			columns, id_index, rows = get_csv_pool(generator, name, 'lc_LandCoverId')
+			write_csv_records(filename, columns, id_index, rows, records, generator)
+
+		case 'inaturalist':
+			write_json_records(filename, get_inaturalist_pool(generator), records, generator, 'results')
+
+		case 'mosquito-alert':
+			write_json_records(filename, get_mosquito_alert_pool(generator), records, generator)
+
+def write_recipe(filename, lines, seed = 0):
+	generator = random.Random(seed)
+
+	# cycle through the lines of the recipes of every source
+	#
+	recipe = []
+	for name in names:
+		with open(current + '/../' + name + '/recipe.txt', 'r') as file:
+			recipe.extend(line.rstrip('\n') + '\n' for line in file if line.strip())
+	with open(filename, 'w') as file:
+		for count in range(lines):
+			file.write(recipe[generator.randrange(len(recipe))])
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 generators.py <source-name> <records> <output-file-name> [options]')
+	parser.add_argument('source', metavar='source-name', choices=names + ['trifacta'])
+	parser.add_argument('records', type=int)
+	parser.add_argument('filename', metavar='output-file-name')
+	parser.add_argument('--seed', type=int, default=0)
+	arguments = parser.parse_args()
+
+	# write synthetic data
+	#
+	if arguments.source == 'trifacta':
+		write_recipe(arguments.filename, arguments.records, arguments.seed)
+	else:
+		write_records(arguments.source, arguments.filename, arguments.records, arguments.seed)
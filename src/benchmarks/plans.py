@@ -0,0 +1,109 @@
+################################################################################
+#                                                                              #
+#                                   plans.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a benchmark of compiled column extraction plans.              #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.plans import read_columns, compile_plan
+from pipeline.sources import names, load_parser
+from generators import write_records
+from dispatch import dispatchers
+
+#
+# globals
+#
+
+current = os.path.dirname(os.path.abspath(__file__))
+extensions = {
+	'habitat-mapper': '.csv',
+	'inaturalist': '.json',
+	'land-cover': '.csv',
+	'mosquito-alert': '.json'
+}
+sample_size = 1000
+
+#
+# sample functions
+#
+
+def get_samples(parser, name, directory):
+
+	# the same synthetic records are read as records for the
+	# plans and as dicts for the match dispatch, the way the
+	# baseline parsers read them
+	#
+	filename = os.path.join(directory, name + extensions[name])
+	write_records(name, filename, sample_size)
+	samples = list(parser.read_observations(filename))
+	if extensions[name] == '.csv':
+		with open(filename, 'r', newline='') as file:
+			baseline_samples = list(csv.DictReader(file))
+	else:
+		with open(filename, 'r') as file:
+			data = json.load(file)
+		baseline_samples = data['results'] if isinstance(data, dict) else data
+	return samples, baseline_samples
+
+#
+# timing functions
+#
+
+def time_match(name, columns, samples, rows):
+	get_observation_value = dispatchers[name]
+	start = time.perf_counter()
+	for count in range(rows):
+		observation = samples[count % len(samples)]
+		[get_observation_value(observation, column) for column in columns]
+	return time.perf_counter() - start
+
+def time_plan(parser, samples, rows):
+	get_observation_values = parser.get_observation_values
+	start = time.perf_counter()
+	for count in range(rows):
+		get_observation_values(samples[count % len(samples)])
+	return time.perf_counter() - start
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 plans.py [<rows>]')
+	parser.add_argument('rows', type=int, nargs='?', default=1000000)
+	arguments = parser.parse_args()
+	rows = arguments.rows
+
+	print('source'.ljust(16), 'match rows/s'.rjust(16), 'plan rows/s'.rjust(16), 'speedup'.rjust(8))
+	with tempfile.TemporaryDirectory() as directory:
+		for name in names:
+			parser = load_parser(name)
+			parser.columns = read_columns(parser.schema)
+			parser.plan = compile_plan(parser.columns, parser.extractors)
+			samples, baseline_samples = get_samples(parser, name, directory)
+
+			match = time_match(name, parser.columns, baseline_samples, rows)
+			plan = time_plan(parser, samples, rows)
+			print(name.ljust(16), str(int(rows / match)).rjust(16), str(int(rows / plan)).rjust(16), ('%.1fx' % (match / plan)).rjust(8))
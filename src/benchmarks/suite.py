@@ -0,0 +1,159 @@
+################################################################################
+#                                                                              #
+#                                   suite.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a suite of throughput benchmarks for every parser.            #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.sources import names, get_parser_path
+from generators import write_records, write_recipe
+
+#
+# globals
+#
+
+current = os.path.dirname(os.path.abspath(__file__))
+trifacta = os.path.normpath(current + '/../trifacta/parser.py')
+extensions = {
+	'habitat-mapper': '.csv',
+	'inaturalist': '.json',
+	'land-cover': '.csv',
+	'mosquito-alert': '.json',
+	'trifacta': '.txt'
+}
+startup_runs = 5
+
+#
+# size functions
+#
+
+def parse_size(text):
+	multipliers = {'k': 1000, 'm': 1000000}
+	suffix = text[-1].lower()
+	if suffix in multipliers:
+		return int(float(text[:-1]) * multipliers[suffix])
+	return int(text)
+
+#
+# data functions
+#
+
+def get_input(directory, name, records, seed):
+
+	# generated inputs are kept between runs since the large
+	# sizes take much longer to generate than to transform
+	#
+	filename = os.path.join(directory, name + '-' + str(records) + '-' + str(seed) + extensions[name])
+	if not os.path.exists(filename):
+		if name == 'trifacta':
+			write_recipe(filename + '.tmp', records, seed)
+		else:
+			write_records(name, filename + '.tmp', records, seed)
+		os.replace(filename + '.tmp', filename)
+	return filename
+
+#
+# measuring functions
+#
+
+def measure(command):
+
+	# wait for the child directly so that its own peak resident
+	# set size is reported rather than that of all children
+	#
+	start = time.perf_counter()
+	process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+	pid, status, usage = os.wait4(process.pid, 0)
+	seconds = time.perf_counter() - start
+	process.returncode = os.waitstatus_to_exitcode(status)
+	if process.returncode != 0:
+		raise RuntimeError('Command failed: ' + ' '.join(command))
+	return seconds, usage.ru_maxrss
+
+def get_command(name, filename, outfilename, workers):
+	if name == 'trifacta':
+		return [sys.executable, trifacta, filename, outfilename]
+	return [sys.executable, get_parser_path(name), filename, outfilename, '--workers', str(workers)]
+
+def run_benchmark(directory, name, records, seed, workers):
+	filename = get_input(directory, name, records, seed)
+	outfilename = os.path.join(directory, name + '-' + str(records) + '.out')
+	seconds, peak = measure(get_command(name, filename, outfilename, workers))
+	return {
+		'target': name,
+		'records': records,
+		'seconds': seconds,
+		'rows_per_second': records / seconds,
+		'peak_rss_kb': peak,
+		'input_bytes': os.path.getsize(filename)
+	}
+
+def run_startup(directory, name, seed):
+
+	# startup time is the best of several runs on an empty input
+	#
+	filename = get_input(directory, name, 0, seed)
+	outfilename = os.path.join(directory, name + '-0.out')
+	runs = [measure(get_command(name, filename, outfilename, 1)) for count in range(startup_runs)]
+	return min(seconds for seconds, peak in runs)
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 suite.py [options]')
+	parser.add_argument('--sizes', nargs='+', default=['10k'], help='numbers of records to benchmark, such as 10k 1M 10M')
+	parser.add_argument('--targets', nargs='+', default=names + ['trifacta'], choices=names + ['trifacta'], help='parsers to benchmark')
+	parser.add_argument('--directory', default=os.path.join(tempfile.gettempdir(), 'mosquito-benchmarks'), help='directory for generated inputs and outputs')
+	parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic data generators')
+	parser.add_argument('--workers', type=int, default=1, help='number of worker processes for each parser')
+	parser.add_argument('--output', default='benchmarks.json', help='file to write machine readable results to')
+	arguments = parser.parse_args()
+	os.makedirs(arguments.directory, exist_ok=True)
+
+	# run benchmarks
+	#
+	results = []
+	for name in arguments.targets:
+		startup = run_startup(arguments.directory, name, arguments.seed)
+		for size in arguments.sizes:
+			result = run_benchmark(arguments.directory, name, parse_size(size), arguments.seed, arguments.workers)
+			result['startup_seconds'] = startup
+			results.append(result)
+			print(name.ljust(16), str(result['records']).rjust(10), ('%.2f s' % result['seconds']).rjust(10), ('%d rows/s' % result['rows_per_second']).rjust(16), ('%d MB' % (result['peak_rss_kb'] // 1024)).rjust(8), ('%.3f s startup' % startup).rjust(18))
+
+	# write results
+	#
+	with open(arguments.output, 'w') as file:
+		file.write(json.dumps({
+			'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'seed': arguments.seed,
+			'workers': arguments.workers,
+			'results': results
+		}, indent=4))
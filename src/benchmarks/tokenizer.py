@@ -0,0 +1,74 @@
+################################################################################
+#                                                                              #
+#                                 tokenizer.py                                 #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a benchmark of tokenizing large Wrangle recipes.              #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'trifacta'))
+from utilities.tokenizer import Tokenizer
+from generators import write_recipe
+
+#
+# timing functions
+#
+
+def time_lines(lines):
+	tokenizer = Tokenizer()
+	tokens = 0
+	start = time.perf_counter()
+	for number, line in enumerate(lines, 1):
+		tokens += len(tokenizer.scan(line, number))
+	return time.perf_counter() - start, tokens
+
+def time_string(size):
+
+	# a single line with a large embedded string, which used
+	# to take time that grew with the square of its size
+	#
+	line = "derive type: single value: '" + 'x' * size + "' as: 'column'\n"
+	start = time.perf_counter()
+	Tokenizer().scan(line)
+	return time.perf_counter() - start
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# get command line arguments
+	#
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+	# tokenize a synthetic recipe made of lines of the recipes
+	# of every source
+	#
+	with tempfile.TemporaryDirectory() as directory:
+		filename = os.path.join(directory, 'recipe.txt')
+		write_recipe(filename, count)
+		with open(filename, 'r') as file:
+			lines = file.readlines()
+	seconds, tokens = time_lines(lines)
+	print('lines'.ljust(16), 'tokens'.rjust(12), 'seconds'.rjust(10), 'lines/s'.rjust(12), 'tokens/s'.rjust(12))
+	print(str(len(lines)).ljust(16), str(tokens).rjust(12), ('%.2f' % seconds).rjust(10), str(int(len(lines) / seconds)).rjust(12), str(int(tokens / seconds)).rjust(12))
+	print()
+
+	print('string size'.ljust(16), 'seconds'.rjust(12))
+	for size in [1000, 100000, 10000000]:
+		print(str(size).ljust(16), ('%.4f' % time_string(size)).rjust(12))
@@ -0,0 +1,103 @@
+################################################################################
+#                                                                              #
+#                                duplicates.py                                 #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a check that duplicates are flagged across sources.           #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import csv
+import json
+import datetime
+import tempfile
+import subprocess
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.sources import get_parser_path
+from pipeline.duplicates import duplicate_column
+
+#
+# globals
+#
+
+current = os.path.dirname(os.path.abspath(__file__))
+data = current + '/../../data'
+
+#
+# input functions
+#
+
+def write_inaturalist(filename):
+
+	# the sample observation is written as a page of results
+	#
+	with open(data + '/inaturalist/input/observation.json', 'r') as file:
+		observation = json.load(file)
+	with open(filename, 'w') as file:
+		json.dump({'results': [observation]}, file)
+	return observation
+
+def write_habitat_mapper(filename, observation):
+
+	# the first sample row is moved to where and when the
+	# iNaturalist observation was made, with its genus, and
+	# the other rows are left where they were
+	#
+	with open(data + '/habitat-mapper/input/sample.csv', 'r', newline='') as file:
+		rows = list(csv.reader(file))
+	header = rows[0]
+	latitude, longitude = observation['location'].split(',')
+	time = datetime.datetime.fromisoformat(observation['time_observed_at']).astimezone(datetime.timezone.utc)
+	row = rows[1]
+	row[header.index('mhm_MGRSLatitude')] = latitude
+	row[header.index('mhm_MGRSLongitude')] = longitude
+	row[header.index('mhm_MeasuredAt')] = time.strftime('%Y-%m-%d %H:%M:%S')
+	row[header.index('mhm_Genus')] = observation['taxon']['name'].split()[0]
+	with open(filename, 'w', newline='') as file:
+		csv.writer(file, quoting=csv.QUOTE_ALL).writerows(rows)
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	with tempfile.TemporaryDirectory() as directory:
+		index = os.path.join(directory, 'duplicates.sqlite')
+		inaturalist = os.path.join(directory, 'inaturalist-input.json')
+		habitat_mapper = os.path.join(directory, 'habitat-mapper-input.csv')
+		observation = write_inaturalist(inaturalist)
+		write_habitat_mapper(habitat_mapper, observation)
+
+		# run both sources with one index in the order of the
+		# registry, where habitat-mapper comes first
+		#
+		for name, filename in [('habitat-mapper', habitat_mapper), ('inaturalist', inaturalist)]:
+			subprocess.run([sys.executable, get_parser_path(name), filename, os.path.join(directory, name + '.csv'), '--duplicates', index], check=True)
+
+		# only the iNaturalist observation should be flagged, as
+		# a duplicate of the habitat-mapper row that was moved
+		#
+		flagged = {}
+		for name in ['habitat-mapper', 'inaturalist']:
+			with open(os.path.join(directory, name + '.csv'), 'r', newline='') as file:
+				rows = list(csv.DictReader(file))
+			for number, row in enumerate(rows, 1):
+				if row[duplicate_column]:
+					print('Row ' + str(number) + ' of ' + str(len(rows)) + ' of ' + name + ' is a duplicate of ' + row[duplicate_column])
+					flagged[name] = flagged.get(name, []) + [number]
+		if flagged != {'inaturalist': [1]}:
+			print('Expected only the iNaturalist observation to be flagged')
+			sys.exit(1)
+		print('ok')
@@ -18,168 +18,92 @@
 import os
 import sys
 import json
-import csv
 import uuid
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.readers import read_csv
+from pipeline.plans import constant, blank, id_column, read_schema, read_columns, compile_plan
+from pipeline.shards import write_csv as write_csv_shards
+from pipeline.writers import get_format, get_writer
+from pipeline.sources import sources
+from pipeline.commands import get_arguments
+
 #
 # globals
 #
 
 current = os.path.dirname(os.path.abspath(__file__))
+source = 'habitat-mapper'
 schema = current + '/../../data/habitat-mapper/output/schema.txt'
 columns = []
+plan = None
 count = 0
 
 #
-# parsing functions
+# column extractors
 #
 
-def get_observation_value(observation, key):
+def get_object_id(observation):
 	global count
+	count += 1
+	return count
+
+extractors = {
+	'OBJECTID': get_object_id,
+	'title': constant('GLOBE Observer Mosquito Habitats'),
+	'dataStreamName': lambda observation: 'Mosquito Habitats ' + observation['mhm_Userid'],
+	'dataStreamDescription': constant('Mosquito Habitats as documented by a photo'),
+	'observationType': constant('Sensor'),
+	'unitOfCategory': constant('Mosquito Habitat, NA, NC'),
+	'phenomenonTime': lambda observation: observation['mhm_MeasuredAt'],
+	'resultTime': lambda observation: observation['mhm_measuredDate'],
+	'result': lambda observation: observation['mhm_WaterSourcePhotoUrls'],
+	'submitTime': lambda observation: observation['mhm_createDate'],
+	'imageStatus': lambda observation: 1 if observation['mhm_WaterSourcePhotoUrls'] else 0,
+	'parameters': lambda observation: observation['mhm_WaterSourcePhotoUrls'],
+	'licenseName': constant('NA'),
+	'licenseURI': constant('https://www.globe.gov/documents/10157/2592674/GLOBE+Data+User+Guide_v1_final.pdf/863a971d-95c5-4dd9-b75c-46713f019088'),
+	'attributionDataSource': lambda observation: 'User: ' + observation['mhm_Userid'],
+	'attributionDataAggregator': constant("Global Learning and Observations to Benefit the Environment (GLOBE)"),
+	'validationStatus': constant('1'),
+	'validationMethod': constant("Our Validation method is as follows: 1) GLOBE Observer App has its own validators to ensure the requested data type matches the received value. 2) GLOBE Observer Team validates the photos to ensure they are useful and match the area where the photographer took the photo. 3) Our pre-processing algorithms ensure values entered are appropriate and reasonable. Our code also creates quality assurance flag to allow Users to better summarize the data."),
+	'validationResult': constant("FALSE (Entries with their photos undergoing GLOBE's validation process will have a 'pending' code for their photos. NOTE: Some entries' photos will be listed as 'rejected'. Photos that pass our validation process will include GLOBE's URL to that photo)"),
+	'qualityDescription': constant("GLOBE Observer Data Guide: https://www.globe.gov/documents/10157/2592674/GLOBE+Data+User+Guide_v1_final.pdf/863a971d-95c5-4dd9-b75c-46713f019088 (Page 25)"),
+	'qualityGrade': constant('research'),
+	'observedPropertyName': constant('Mosquito Habitats'),
+	'observedPropertyDescription': constant('Mosquito Habitats as documented by a photo'),
+	'observedPropertyDefinition': constant('https://observer.globe.gov/toolkit/mosquito-habitat-mapper-toolkit'),
+	'sensorName': constant('NA'),
+	'sensorDescription': constant('NA'),
+	'sensorEncodingType': constant('NA'),
+	'sensorMetadata': constant('NA'),
+	'locationName': lambda observation: observation['mhm_siteName'],
+	'locationDescription': lambda observation: observation['mhm_siteId'],
+	'locationEncodingType': constant('GeoJSON'),
+	'latitude': lambda observation: observation['mhm_MGRSLatitude'],
+	'longitude': lambda observation: observation['mhm_MGRSLongitude'],
+	'volunteerName': lambda observation: 'User: ' + observation['mhm_Userid'],
+	'volunteerDescription': lambda observation: observation['mhm_organizationName'],
+	'volunteerProperties': lambda observation: observation['mhm_WaterSource'],
+	'featureName': lambda observation: observation['mhm_siteName'],
+	'featureDescription': lambda observation: observation['mhm_siteId'],
+	'featureEncodingType': constant('GeoJSON'),
+	'featureLocation': blank,
+	'type': constant('Point'),
+	'coordinates': blank,
+	'x': blank,
+	'y': blank
+}
 
-	match key:
-
-		case 'OBJECTID':
-			count += 1
-			return count
-
-		case 'title':
-			return 'GLOBE Observer Mosquito Habitats'
-
-		case 'dataStreamName':
-			return 'Mosquito Habitats ' + observation['mhm_Userid']
-
-		case 'dataStreamDescription':
-			return 'Mosquito Habitats as documented by a photo'
-
-		case 'observationType':
-			return 'Sensor'
-
-		case 'unitOfCategory':
-			return 'Mosquito Habitat, NA, NC'
-
-		case 'phenomenonTime':
-			return observation['mhm_MeasuredAt']
-
-		case 'resultTime':
-			return observation['mhm_measuredDate']
-
-		case 'result':
-			return observation['mhm_WaterSourcePhotoUrls']
-
-		case 'submitTime':
-			return observation['mhm_createDate']
-
-		case 'imageStatus':
-			return 1 if observation['mhm_WaterSourcePhotoUrls'] else 0
-
-		case 'parameters':
-			return observation['mhm_WaterSourcePhotoUrls']
-
-		case 'licenseName':
-			return 'NA'
-
-		case 'licenseURI':
-			return 'https://www.globe.gov/documents/10157/2592674/GLOBE+Data+User+Guide_v1_final.pdf/863a971d-95c5-4dd9-b75c-46713f019088'
-
-		case 'attributionDataSource':
-			return 'User: ' + observation['mhm_Userid']
-
-		case 'attributionDataAggregator':
-			return "Global Learning and Observations to Benefit the Environment (GLOBE)"
-
-		case 'validationStatus':
-			return '1'
-
-		case 'validationMethod':
-			return "Our Validation method is as follows: 1) GLOBE Observer App has its own validators to ensure the requested data type matches the received value. 2) GLOBE Observer Team validates the photos to ensure they are useful and match the area where the photographer took the photo. 3) Our pre-processing algorithms ensure values entered are appropriate and reasonable. Our code also creates quality assurance flag to allow Users to better summarize the data."
-
-		case 'validationResult':
-			return "FALSE (Entries with their photos undergoing GLOBE's validation process will have a 'pending' code for their photos. NOTE: Some entries' photos will be listed as 'rejected'. Photos that pass our validation process will include GLOBE's URL to that photo)"
-
-		case 'qualityDescription':
-			return "GLOBE Observer Data Guide: https://www.globe.gov/documents/10157/2592674/GLOBE+Data+User+Guide_v1_final.pdf/863a971d-95c5-4dd9-b75c-46713f019088 (Page 25)"
-
-		case 'qualityGrade':
-			return 'research'
-
-		case 'observedPropertyName':
-			return 'Mosquito Habitats'
-
-		case 'observedPropertyDescription':
-			return 'Mosquito Habitats as documented by a photo'
-
-		case 'observedPropertyDefinition':
-			return 'https://observer.globe.gov/toolkit/mosquito-habitat-mapper-toolkit'
-
-		case 'sensorName':
-			return 'NA'
-
-		case 'sensorDescription':
-			return 'NA'
-
-		case 'sensorEncodingType':
-			return 'NA'
-
-		case 'sensorMetadata':
-			return 'NA'
-
-		case 'locationName':
-			return observation['mhm_siteName']
-
-		case 'locationDescription':
-			return observation['mhm_siteId']
-
-		case 'locationEncodingType':
-			return 'GeoJSON'
-
-		case 'latitude':
-			return observation['mhm_MGRSLatitude']
-
-		case 'longitude':
-			return observation['mhm_MGRSLongitude']
-
-		case 'volunteerName':
-			return 'User: ' + observation['mhm_Userid']
-
-		case 'volunteerDescription':
-			return observation['mhm_organizationName']
-
-		case 'volunteerProperties':
-			return observation['mhm_WaterSource']
-
-		case 'featureName':
-			return observation['mhm_siteName']
-
-		case 'featureDescription':
-			return observation['mhm_siteId']
-
-		case 'featureEncodingType':
-			return 'GeoJSON'
-
-		case 'featureLocation':
-			return ''
-
-		case 'type':
-			return 'Point'
-
-		case 'coordinates':
-			return ''
-
-		case 'x':
-			return ''
-
-		case 'y':
-			return ''
+#
+# parsing functions
+#
 
-	return ''
+def get_observation_value(observation, key):
+	return extractors.get(key, blank)(observation)
 
 def get_observation_values(observation):
-	values = []
-	for column in columns:
-		value = get_observation_value(observation, column)
-		values.append(value)
-	return values
+	return plan.apply(observation)
 
 #
 # utility functions
@@ -191,38 +115,19 @@ def read_file(filename):
 	return data
 
 def read_observations(filename):
-	observations = []
-	with open(filename) as csvfile:
-		reader = csv.reader(csvfile)
-		index = 0
-		input_columns = []
-		for row in reader:
-			index += 1
-			if index == 1:
-				input_columns = row
-			else:
-				values = {}
-				for i in range(0, len(row)):
-					values[input_columns[i]] = row[i]
-				observations.append(values)
-	return observations
+	return read_csv(filename)
 
 #
 # output functions
 #
 
-def write_csv(filename, observations):
-	with open(filename, 'w', newline='') as file:
-		writer = csv.writer(file)
-
-		# add headers
-		#
-		writer.writerow(columns)
+def write_csv(filename, observations, appending = False, format = None, duplicates = None):
+	with get_writer(filename, columns, format, plan.constants, appending, duplicates) as writer:
 
 		# add columns
 		#
 		for observation in observations:
-			writer.writerow(get_observation_values(observation))
+			writer.write(get_observation_values(observation))
 
 #
 # main
@@ -232,26 +137,86 @@ if __name__ == '__main__':
 
 	# parse arguments
 	#
-	if (len(sys.argv) < 3):
-		print("Usage: python3 parser.py <input-file-name> <output-file-name");
-		exit();
+	arguments = get_arguments()
 
 	# get command line arguments
 	#
-	filename = sys.argv[1]
-	outfilename = sys.argv[2]
+	filename = arguments.filename
+	outfilename = arguments.outfilename
 
 	# parse columns to read from schema
 	#
-	columns = []
-	with open(schema, 'r') as file:
-		for line in file:
-			columns.append(line.replace(',', '').replace('REQUIRED', '').replace('MANDATORY', '').strip())
+	columns = read_columns(schema)
+
+	# choose the output format, where databases are also
+	# keyed by the id of each observation in its source
+	#
+	format = get_format(outfilename, arguments.format)
+	if format == 'sqlite':
+		columns.append(id_column)
+
+	# check for observations that other sources have already
+	# reported, which are flagged in a column of their own
+	# unless they are dropped, where optional stages are only
+	# imported when they are used to keep startup short
+	#
+	duplicate_index = None
+	duplicates = None
+	if arguments.duplicates:
+		from pipeline.duplicates import DuplicateIndex, duplicate_column
+		duplicate_index = DuplicateIndex(arguments.duplicates, arguments.drop_duplicates)
+		duplicates = duplicate_index.get_source(source)
+		if not arguments.drop_duplicates:
+			columns.append(duplicate_column)
+
+	# compile columns into a plan of extractors
+	#
+	plan = compile_plan(columns, extractors, key = sources[source]['id'], schema = read_schema(schema))
+
+	# time each stage and column when profiling
+	#
+	profile = None
+	if arguments.profile:
+		from pipeline.profiles import Profile
+		profile = Profile(plan)
+
+	# only keep new or changed observations when appending
+	#
+	index = None
+	if arguments.delta:
+		from pipeline.deltas import DeltaIndex
+		index = DeltaIndex(arguments.delta, outfilename)
+
+	# transform observations in parallel
+	#
+	if arguments.workers > 1:
+		write_csv_shards(source, columns, filename, outfilename, arguments.workers, index = index, format = format, duplicates = duplicates)
+
+	else:
+
+		# stream observations
+		#
+		observations = read_observations(filename)
+		if index:
+			count = index.count
+			observations = index.select(observations, sources[source]['id'])
+
+		# write transformed data to the output file
+		#
+		if profile:
+			profile.write_csv(outfilename, columns, observations, get_observation_values, index and index.appending, format, plan.constants, duplicates)
+		else:
+			write_csv(outfilename, observations, index and index.appending, format, duplicates)
 
-	# parse observations
+	# save indexes of written observations
 	#
-	observations = read_observations(filename)
+	if index:
+		index.commit()
+	if duplicate_index:
+		duplicate_index.close()
 
-	# write transformed data to csv file
+	# report time spent per stage and column
 	#
-	write_csv(outfilename, observations)
\ No newline at end of file
+	if profile:
+		profile.print_summary()
+		profile.write_summary(arguments.profile)
\ No newline at end of file
@@ -17,213 +17,161 @@
 
 import os
 import sys
-import json
-import csv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.readers import is_url, read_json_array
+from pipeline.records import project
+from pipeline.plans import constant, blank, nested, id_column, read_schema, read_columns, compile_plan
+from pipeline.shards import write_csv as write_csv_shards
+from pipeline.writers import get_format, get_writer, is_line_output
+from pipeline.sources import sources
+from pipeline.commands import get_arguments, add_fetch_arguments
 
 #
 # globals
 #
 
 current = os.path.dirname(os.path.abspath(__file__))
+source = 'inaturalist'
 schema = current + '/../../data/inaturalist/output/schema.txt'
 columns = []
+plan = None
+fetching = {}
 
 #
-# parsing functions
+# observation fields
 #
 
-def get_observation_value(observation, key):
-	match key:
-
-		case 'OBJECTID':
-			return observation['id']
-
-		case 'title':
-			return 'Citizen·science·data·on·mosquitos·from·iNaturalist·with·additional·automated·ID'
-
-		case 'description':
-			return 'Data·is·generated·from·the·iNaturalist·database·filtered·by·Mosquitoes·and·quality·grade·before·additional·automated·identifications·are·added'
-
-		case 'dataStreamName':
-			return '·Research·grade·mosquito·species·occurrence·data·from·user·cell·phone'
-
-		case 'dataStreamDescription':
-			return 'All·species·occurrence·observations·from·a·particular·user·taken·with·a·sensor·or·manually'
-
-		case 'dataStreamObsType':
-			return 'category observation'
-
-		case 'dataStreamUniCategory':
-			return {
-				"Type": "Annotations potentially including lifecycle phase",
-				"Identified by Human": "Annotations potentially including lifecycle phase",
-				"Identified by Machine": "Annotations potentially including lifecycle phase"
-			}
-
-		case 'observationProObsUID':
-			return observation['uuid']
-
-		case 'observationResCatObsPheTime':
-			return observation['time_observed_at']
-
-		case 'observationResCatObsResTime':
-			return ''
-
-		case 'observationResCatObsResult':
-			return {
-				'Type': 'adult',
-				'Human ID': observation['taxon']['name'],
-				'Automated ID': []
-			}
-
-		case 'obsResCatObsResult_Type':
-			return 'adult'
-
-		case 'Identified by Human' | 'Indentified by Human':
-			return observation['taxon']['name']
-
-		case 'Identified by Machine' | 'Identified by Machine':
-			return ''
-
-		case 'observationResCatObsSubTime':
-			return ''
-
-		case 'observationImaImaStatus':
-			return 1 if observation['observation_photos'] else 0
-
-		case 'observationImaImaResult':
-			photos = observation['observation_photos']
-			if photos:
-				return photos[0]['photo']['url']
-
-		case 'observationConParameters':
-			return {
-				'captive': observation['captive'],
-				'comments': observation['comments'],
-				'time_zone_offset': observation['time_zone_offset'],
-				'uri': observation['uri'],
-				'icon_url': observation['user']['icon_url'],
-				'sounds': observation['sounds']
-			}
-
-		case 'Aegypti_Certainty':
-			return ''
-
-		case 'Tiger_Certainty':
-			return ''
-
-		case 'omProcessLicLicName':
-			return observation['taxon']['default_photo']['license_code']
-
-		case 'omProcessLicLicURI':
-			return ''
-
-		case 'omProcessLicLicAttSource':
-			return ''
-
-		case 'omProcessLicLicAttAggregator':
-			return 'iNaturalist'
-
-		case 'omProcessProType' | 'omPrcoessProType':
-			return 'Sensor'
-
-		case 'omProcessProReference':
-			return 'https://www.inaturalist.org/pages/help'
-
-		case 'omProcessResQuaValStatus' | 'omPrcoessResQuaValStatus':
-			return 1
-
-		case 'omProcessResQuaValMethod' | 'omPrcoessResQuaValMethod':
-			return 'Human expert validation'
-
-		case 'omProcessResQuaValResult' | 'omPrcoessResQuaValResult':
-			return 1
-
-		case 'omProcessResQuaQuaGrade' | 'omPrcoessResQuaQuaGrade':
-			return observation['quality_grade']
-
-		case 'observedProName':
-			return 'Species occurrence'
-
-		case 'observedProDescription':
-			return 'Whether a species is observed at a location'
-
-		case 'observedProDefinition':
-			return 'https://www.sciencedirect.com/topics/earth-and-planetary-sciences/species-occurrence'
-
-		case 'sensorName':
-			return observation['uuid']
-
-		case 'sensorDescription':
-			return 'Observation take by mobile phone of user: ' + observation['uuid']
-
-		case 'sensorEncType':
-			return 'NC'
-
-		case 'locationName':
-			return 'Anonymous location'
-
-		case 'locationDescription':
-			return 'location.name'
-
-		case 'locationEncType':
-			return 'GeoJSON Point'
-
-		case 'latitude':
-			location = observation['location']
-			return location.split(',')[0] if location else None
-
-		case 'longitude':
-			location = observation['location']
-			return location.split(',')[1] if location else None
-
-		case 'thingName':
-			return 'sensor.name'
-
-		case 'thingDescription':
-			return 'sensor.description'
-
-		case 'featureIntName':
-			return 'location.name'
-
-		case 'featureIntDescription':
-			return 'location.description'
-
-		case 'featureIntEncType':
-			return 'GeoJSON Point'
-
-		case 'featureIntLocation':
-			return 'latitude, longitude'
-
-		case 'type':
-			return 'FeatureCollection'
-
-		case 'coordinates':
-			return '[' + observation['location'] + ']' if observation['location'] else ''
-
-		case 'nuts_3':
-			return ''
+# the fields that the extractors read, which are all that is
+# kept of each observation, where None keeps a whole value
+#
+fields = {
+	'id': None,
+	'uuid': None,
+	'time_observed_at': None,
+	'taxon': {
+		'name': None,
+		'default_photo': {
+			'license_code': None
+		}
+	},
+	'observation_photos': None,
+	'captive': None,
+	'comments': None,
+	'time_zone_offset': None,
+	'uri': None,
+	'user': {
+		'icon_url': None
+	},
+	'sounds': None,
+	'quality_grade': None,
+	'location': None
+}
 
-		case 'nuts_2':
-			return ''
+#
+# column extractors
+#
 
-		case 'X':
-			return ''
+def get_image_result(observation):
+	photos = observation['observation_photos']
+	if photos:
+		return photos[0]['photo']['url']
+	return ''
 
-		case 'Y':
-			return ''
+def get_latitude(observation):
+	location = observation['location']
+	return location.split(',')[0] if location else None
+
+def get_longitude(observation):
+	location = observation['location']
+	return location.split(',')[1] if location else None
+
+extractors = {
+	'OBJECTID': lambda observation: observation['id'],
+	'title': constant('Citizen·science·data·on·mosquitos·from·iNaturalist·with·additional·automated·ID'),
+	'description': constant('Data·is·generated·from·the·iNaturalist·database·filtered·by·Mosquitoes·and·quality·grade·before·additional·automated·identifications·are·added'),
+	'dataStreamName': constant('·Research·grade·mosquito·species·occurrence·data·from·user·cell·phone'),
+	'dataStreamDescription': constant('All·species·occurrence·observations·from·a·particular·user·taken·with·a·sensor·or·manually'),
+	'dataStreamObsType': constant('category observation'),
+	'dataStreamUniCategory': constant({
+		"Type": "Annotations potentially including lifecycle phase",
+		"Identified by Human": "Annotations potentially including lifecycle phase",
+		"Identified by Machine": "Annotations potentially including lifecycle phase"
+	}),
+	'observationProObsUID': lambda observation: observation['uuid'],
+	'observationResCatObsPheTime': lambda observation: observation['time_observed_at'],
+	'observationResCatObsResTime': blank,
+	'observationResCatObsResult': nested(lambda observation: {
+		'Type': 'adult',
+		'Human ID': observation['taxon']['name'],
+		'Automated ID': []
+	}),
+	'obsResCatObsResult_Type': constant('adult'),
+	'Identified by Human': lambda observation: observation['taxon']['name'],
+	'Indentified by Human': lambda observation: observation['taxon']['name'],
+	'Identified by Machine': blank,
+	'observationResCatObsSubTime': blank,
+	'observationImaImaStatus': lambda observation: 1 if observation['observation_photos'] else 0,
+	'observationImaImaResult': get_image_result,
+	'observationConParameters': nested(lambda observation: {
+		'captive': observation['captive'],
+		'comments': observation['comments'],
+		'time_zone_offset': observation['time_zone_offset'],
+		'uri': observation['uri'],
+		'icon_url': observation['user']['icon_url'],
+		'sounds': observation['sounds']
+	}),
+	'Aegypti_Certainty': blank,
+	'Tiger_Certainty': blank,
+	'omProcessLicLicName': lambda observation: observation['taxon']['default_photo']['license_code'],
+	'omProcessLicLicURI': blank,
+	'omProcessLicLicAttSource': blank,
+	'omProcessLicLicAttAggregator': constant('iNaturalist'),
+	'omProcessProType': constant('Sensor'),
+	'omPrcoessProType': constant('Sensor'),
+	'omProcessProReference': constant('https://www.inaturalist.org/pages/help'),
+	'omProcessResQuaValStatus': constant(1),
+	'omPrcoessResQuaValStatus': constant(1),
+	'omProcessResQuaValMethod': constant('Human expert validation'),
+	'omPrcoessResQuaValMethod': constant('Human expert validation'),
+	'omProcessResQuaValResult': constant(1),
+	'omPrcoessResQuaValResult': constant(1),
+	'omProcessResQuaQuaGrade': lambda observation: observation['quality_grade'],
+	'omPrcoessResQuaQuaGrade': lambda observation: observation['quality_grade'],
+	'observedProName': constant('Species occurrence'),
+	'observedProDescription': constant('Whether a species is observed at a location'),
+	'observedProDefinition': constant('https://www.sciencedirect.com/topics/earth-and-planetary-sciences/species-occurrence'),
+	'sensorName': lambda observation: observation['uuid'],
+	'sensorDescription': lambda observation: 'Observation take by mobile phone of user: ' + observation['uuid'],
+	'sensorEncType': constant('NC'),
+	'locationName': constant('Anonymous location'),
+	'locationDescription': constant('location.name'),
+	'locationEncType': constant('GeoJSON Point'),
+	'latitude': get_latitude,
+	'longitude': get_longitude,
+	'thingName': constant('sensor.name'),
+	'thingDescription': constant('sensor.description'),
+	'featureIntName': constant('location.name'),
+	'featureIntDescription': constant('location.description'),
+	'featureIntEncType': constant('GeoJSON Point'),
+	'featureIntLocation': constant('latitude, longitude'),
+	'type': constant('FeatureCollection'),
+	'coordinates': lambda observation: '[' + observation['location'] + ']' if observation['location'] else '',
+	'nuts_3': blank,
+	'nuts_2': blank,
+	'X': blank,
+	'Y': blank
+}
 
-		case _:
-			return ''
+#
+# parsing functions
+#
 
-	return ''
+def get_observation_value(observation, key):
+	return extractors.get(key, blank)(observation)
 
 def get_observation_values(observation):
-	values = []
-	for column in columns:
-		value = get_observation_value(observation, column)
-		values.append(value)
-	return values
+	return plan.apply(observation)
 
 #
 # utility functions
@@ -234,22 +182,28 @@ def read_file(filename):
 		data = file.read()
 	return data
 
+def read_observations(filename):
+	if is_url(filename):
+		from pipeline.fetchers import read_url
+		observations = read_url(filename, **fetching)
+	else:
+		observations = read_json_array(filename, 'results')
+	return (project(observation, fields) for observation in observations)
+
 #
 # output functions
 #
 
-def write_csv(filename, observations):
-	with open(filename, 'w', newline='') as file:
-		writer = csv.writer(file)
-
-		# add headers
-		#
-		writer.writerow(columns)
+def write_csv(filename, observations, appending = False, format = None, duplicates = None, cursor = None):
+	with get_writer(filename, columns, format, plan.constants, appending, duplicates) as writer:
 
-		# add columns
+		# add columns, saving the resume cursor as each page of
+		# observations is written
 		#
+		if cursor:
+			observations = cursor.checkpoint(observations, writer)
 		for observation in observations:
-			writer.writerow(get_observation_values(observation))
+			writer.write(get_observation_values(observation))
 
 #
 # main
@@ -259,27 +213,110 @@ if __name__ == '__main__':
 
 	# parse arguments
 	#
-	if (len(sys.argv) < 3):
-		print("Usage: python3 parser.py <input-file-name> <output-file-name");
-		exit();
+	arguments = get_arguments(add_fetch_arguments)
 
 	# get command line arguments
 	#
-	filename = sys.argv[1]
-	outfilename = sys.argv[2]
+	filename = arguments.filename
+	outfilename = arguments.outfilename
 
 	# parse columns to read from schema
 	#
-	columns = []
-	with open(schema, 'r') as file:
-		for line in file:
-			columns.append(line.replace(',', '').replace('REQUIRED', '').replace('MANDATORY', '').strip())
+	columns = read_columns(schema)
 
-	# parse data from observations
+	# choose the output format, where databases are also
+	# keyed by the id of each observation in its source
 	#
-	data = json.loads(read_file(filename))
-	observations = data['results']
+	format = get_format(outfilename, arguments.format)
+	if format == 'sqlite':
+		columns.append(id_column)
+
+	# check for observations that other sources have already
+	# reported, which are flagged in a column of their own
+	# unless they are dropped, where optional stages are only
+	# imported when they are used to keep startup short
+	#
+	duplicate_index = None
+	duplicates = None
+	if arguments.duplicates:
+		from pipeline.duplicates import DuplicateIndex, duplicate_column
+		duplicate_index = DuplicateIndex(arguments.duplicates, arguments.drop_duplicates)
+		duplicates = duplicate_index.get_source(source)
+		if not arguments.drop_duplicates:
+			columns.append(duplicate_column)
+
+	# compile columns into a plan of extractors
+	#
+	plan = compile_plan(columns, extractors, key = sources[source]['id'], schema = read_schema(schema))
 
-	# write transformed data to csv file
+	# time each stage and column when profiling
+	#
+	profile = None
+	if arguments.profile:
+		from pipeline.profiles import Profile
+		profile = Profile(plan)
+
+	# fetch pages from the api when given a url, and append
+	# to the output when resuming from a saved cursor
+	#
+	appending = False
+	cursor = None
+	if is_url(filename):
+		from pipeline.fetchers import Cursor
+		cursor = Cursor(arguments.cursor, outfilename) if arguments.cursor else None
+		if cursor and is_line_output(outfilename, format):
+			cursor.rewind()
+		fetching = {
+			'cursor': cursor,
+			'since_id': arguments.since_id,
+			'concurrency': arguments.concurrency,
+			'rate': arguments.rate
+		}
+		appending = bool(cursor and cursor.id > 0 and os.path.exists(outfilename) and os.path.getsize(outfilename) > 0)
+
+	# only keep new or changed observations when appending
+	#
+	index = None
+	if arguments.delta:
+		from pipeline.deltas import DeltaIndex
+		index = DeltaIndex(arguments.delta, outfilename)
+
+	# stream observations from the results array or the api
+	#
+	observations = read_observations(filename)
+
+	# transform observations in parallel
+	#
+	if arguments.workers > 1:
+		write_csv_shards(source, columns, filename, outfilename, arguments.workers, index = index, format = format, duplicates = duplicates, observations = observations, appending = appending, cursor = cursor)
+
+	else:
+		if index:
+			observations = index.select(observations, sources[source]['id'])
+
+		# write transformed data to the output file, saving the
+		# resume cursor as each page is written to outputs that
+		# are appended to a line at a time, and otherwise once
+		# the whole output has been written
+		#
+		checkpoint = cursor if cursor and is_line_output(outfilename, format) else None
+		if profile:
+			profile.write_csv(outfilename, columns, observations, get_observation_values, appending or (index and index.appending), format, plan.constants, duplicates, checkpoint)
+		else:
+			write_csv(outfilename, observations, appending or (index and index.appending), format, duplicates, checkpoint)
+
+	# save indexes of written observations and the cursor
+	# to resume fetching from
+	#
+	if index:
+		index.commit()
+	if cursor:
+		cursor.commit()
+	if duplicate_index:
+		duplicate_index.close()
+
+	# report time spent per stage and column
 	#
-	write_csv(outfilename, observations)
\ No newline at end of file
+	if profile:
+		profile.print_summary()
+		profile.write_summary(arguments.profile)
\ No newline at end of file
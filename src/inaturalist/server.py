@@ -0,0 +1,107 @@
+################################################################################
+#                                                                              #
+#                                  server.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a stand-in server for recorded iNaturalist API pages.         #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import json
+import bisect
+import argparse
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+#
+# globals
+#
+
+observations = []
+ids = []
+
+#
+# reading functions
+#
+
+def read_recordings(filenames):
+
+	# recordings are saved api responses or single observations,
+	# and are served back as one list ordered by id
+	#
+	recorded = {}
+	for filename in filenames:
+		if os.path.isdir(filename):
+			filenames.extend(os.path.join(filename, name) for name in sorted(os.listdir(filename)) if name.endswith('.json'))
+			continue
+		with open(filename, 'r') as file:
+			data = json.load(file)
+		for observation in data['results'] if 'results' in data else [data]:
+			recorded[observation['id']] = observation
+	return [recorded[id] for id in sorted(recorded)]
+
+#
+# request handler class
+#
+
+class Handler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+
+	def do_GET(self):
+		parts = urllib.parse.urlsplit(self.path)
+		query = dict(urllib.parse.parse_qsl(parts.query))
+		id_above = int(query.get('id_above', 0))
+		per_page = int(query.get('per_page', 30))
+		page = int(query.get('page', 1))
+
+		# serve the requested page of observations after the cursor
+		#
+		start = bisect.bisect_right(ids, id_above)
+		offset = start + (page - 1) * per_page
+		body = json.dumps({
+			'total_results': len(ids) - start,
+			'page': page,
+			'per_page': per_page,
+			'results': observations[offset:offset + per_page]
+		}).encode('utf-8')
+
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 server.py <recording-file-or-directory> ... [options]')
+	parser.add_argument('filenames', nargs='+', metavar='recording-file-or-directory')
+	parser.add_argument('--port', type=int, default=8000)
+	arguments = parser.parse_args()
+
+	# load recorded observations
+	#
+	observations = read_recordings(arguments.filenames)
+	ids = [observation['id'] for observation in observations]
+
+	# serve pages until interrupted
+	#
+	print('Serving ' + str(len(observations)) + ' observations at http://localhost:' + str(arguments.port) + '/v1/observations')
+	ThreadingHTTPServer(('localhost', arguments.port), Handler).serve_forever()
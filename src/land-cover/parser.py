@@ -18,196 +18,106 @@
 import os
 import sys
 import json
-import csv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.readers import read_csv
+from pipeline.plans import constant, blank, id_column, read_schema, read_columns, compile_plan
+from pipeline.shards import write_csv as write_csv_shards
+from pipeline.writers import get_format, get_writer
+from pipeline.sources import sources
+from pipeline.commands import get_arguments
 
 #
 # globals
 #
 
 current = os.path.dirname(os.path.abspath(__file__))
+source = 'land-cover'
 schema = current + '/../../data/land-cover/output/schema.txt'
 columns = []
+plan = None
 count = 0
 
 #
-# parsing functions
+# column extractors
 #
 
-def get_observation_value(observation, key):
+def get_object_id(observation):
 	global count
+	count += 1
+	return count
+
+extractors = {
+	'OBJECTID': get_object_id,
+	'title': constant('Globe Land Cover v1.0.0 OGC'),
+	'description': constant('Land Cover Data Generated by Globe'),
+	'dataStreamName': constant('Globe Land Cover'),
+	'dataStreamDescription': blank,
+	'dataStreamObsType': blank,
+	'dataStreamUniCategory': blank,
+	'observationProObsUID': blank,
+	'observationResCatObsPheTime': blank,
+	'observationResCatObsResTime': blank,
+	'observationResCatObsResult': blank,
+	'obsResCatObsResult_Type': blank,
+	'Identified by Human': blank,
+	'Indentified by Human': blank,
+	'Identified by Machine': blank,
+	'observationResCatObsSubTime': blank,
+	'observationImaImaStatus': blank,
+	'observationImaImaResult': blank,
+	'observationConParameters': blank,
+	'Aegypti_Certainty': blank,
+	'Tiger_Certainty': blank,
+	'omProcessLicLicName': blank,
+	'omProcessLicLicURI': blank,
+	'omProcessLicLicAttSource': blank,
+	'omProcessLicLicAttAggregator': blank,
+	'omProcessProType': blank,
+	'omPrcoessProType': blank,
+	'omProcessProReference': blank,
+	'omProcessResQuaValStatus': blank,
+	'omPrcoessResQuaValStatus': blank,
+	'omProcessResQuaValMethod': blank,
+	'omPrcoessResQuaValMethod': blank,
+	'omProcessResQuaValResult': blank,
+	'omPrcoessResQuaValResult': blank,
+	'omProcessResQuaQuaGrade': blank,
+	'omPrcoessResQuaQuaGrade': blank,
+	'observedProName': blank,
+	'observedProDescription': blank,
+	'observedProDefinition': blank,
+	'sensorName': blank,
+	'sensorDescription': blank,
+	'sensorEncType': blank,
+	'locationName': blank,
+	'locationDescription': blank,
+	'locationEncType': blank,
+	'latitude': blank,
+	'longitude': blank,
+	'thingName': blank,
+	'thingDescription': blank,
+	'featureIntName': blank,
+	'featureIntDescription': blank,
+	'featureIntEncType': blank,
+	'featureIntLocation': blank,
+	'type': blank,
+	'coordinates': blank,
+	'nuts_3': blank,
+	'nuts_2': blank,
+	'X': blank,
+	'Y': blank
+}
 
-	match key:
-
-		case 'OBJECTID':
-			count += 1
-			return count
-
-		case 'title':
-			return 'Globe Land Cover v1.0.0 OGC'
-
-		case 'description':
-			return 'Land Cover Data Generated by Globe'
-
-		case 'dataStreamName':
-			return 'Globe Land Cover'
-
-		case 'dataStreamDescription':
-			return ''
-
-		case 'dataStreamObsType':
-			return ''
-
-		case 'dataStreamUniCategory':
-			return ''
-
-		case 'observationProObsUID':
-			return ''
-
-		case 'observationResCatObsPheTime':
-			return ''
-
-		case 'observationResCatObsResTime':
-			return ''
-
-		case 'observationResCatObsResult':
-			return ''
-
-		case 'obsResCatObsResult_Type':
-			return ''
-
-		case 'Identified by Human' | 'Indentified by Human':
-			return ''
-
-		case 'Identified by Machine' | 'Identified by Machine':
-			return ''
-
-		case 'observationResCatObsSubTime':
-			return ''
-
-		case 'observationImaImaStatus':
-			return ''
-
-		case 'observationImaImaResult':
-			return ''
-
-		case 'observationConParameters':
-			return ''
-
-		case 'Aegypti_Certainty':
-			return ''
-
-		case 'Tiger_Certainty':
-			return ''
-
-		case 'omProcessLicLicName':
-			return ''
-
-		case 'omProcessLicLicURI':
-			return ''
-
-		case 'omProcessLicLicAttSource':
-			return ''
-
-		case 'omProcessLicLicAttAggregator':
-			return ''
-
-		case 'omProcessProType' | 'omPrcoessProType':
-			return ''
-
-		case 'omProcessProReference':
-			return ''
-
-		case 'omProcessResQuaValStatus' | 'omPrcoessResQuaValStatus':
-			return ''
-
-		case 'omProcessResQuaValMethod' | 'omPrcoessResQuaValMethod':
-			return ''
-
-		case 'omProcessResQuaValResult' | 'omPrcoessResQuaValResult':
-			return ''
-
-		case 'omProcessResQuaQuaGrade' | 'omPrcoessResQuaQuaGrade':
-			return ''
-
-		case 'observedProName':
-			return ''
-
-		case 'observedProDescription':
-			return ''
-
-		case 'observedProDefinition':
-			return ''
-
-		case 'sensorName':
-			return ''
-
-		case 'sensorDescription':
-			return ''
-
-		case 'sensorEncType':
-			return ''
-
-		case 'locationName':
-			return ''
-
-		case 'locationDescription':
-			return ''
-
-		case 'locationEncType':
-			return ''
-
-		case 'latitude':
-			return ''
-
-		case 'longitude':
-			return ''
-
-		case 'thingName':
-			return ''
-
-		case 'thingDescription':
-			return ''
-
-		case 'featureIntName':
-			return ''
-
-		case 'featureIntDescription':
-			return ''
-
-		case 'featureIntEncType':
-			return ''
-
-		case 'featureIntLocation':
-			return ''
-
-		case 'type':
-			return ''
-
-		case 'coordinates':
-			return ''
-
-		case 'nuts_3':
-			return ''
-
-		case 'nuts_2':
-			return ''
-
-		case 'X':
-			return ''
-
-		case 'Y':
-			return ''
-
-		case _:
-			return ''
+#
+# parsing functions
+#
 
-	return ''
+def get_observation_value(observation, key):
+	return extractors.get(key, blank)(observation)
 
 def get_observation_values(observation):
-	values = []
-	for column in columns:
-		values.append(get_observation_value(observation, column))
-	return values
+	return plan.apply(observation)
 
 #
 # utility functions
@@ -218,22 +128,20 @@ def read_file(filename):
 		data = file.read()
 	return data
 
+def read_observations(filename):
+	return read_csv(filename)
+
 #
 # output functions
 #
 
-def write_csv(filename, observations):
-	with open(filename, 'w', newline='') as file:
-		writer = csv.writer(file)
-
-		# add headers
-		#
-		writer.writerow(columns)
+def write_csv(filename, observations, appending = False, format = None, duplicates = None):
+	with get_writer(filename, columns, format, plan.constants, appending, duplicates) as writer:
 
 		# add columns
 		#
 		for observation in observations:
-			writer.writerow(get_observation_values(observation))
+			writer.write(get_observation_values(observation))
 
 #
 # main
@@ -243,39 +151,86 @@ if __name__ == '__main__':
 
 	# parse arguments
 	#
-	if (len(sys.argv) < 3):
-		print("Usage: python3 parser.py <input-file-name> <output-file-name");
-		exit();
+	arguments = get_arguments()
 
 	# get command line arguments
 	#
-	filename = sys.argv[1]
-	outfilename = sys.argv[2]
+	filename = arguments.filename
+	outfilename = arguments.outfilename
 
 	# parse columns to read from schema
 	#
-	columns = []
-	with open(schema, 'r') as file:
-		for line in file:
-			columns.append(line.replace(',', '').replace('REQUIRED', '').replace('MANDATORY', '').strip())
+	columns = read_columns(schema)
+
+	# choose the output format, where databases are also
+	# keyed by the id of each observation in its source
+	#
+	format = get_format(outfilename, arguments.format)
+	if format == 'sqlite':
+		columns.append(id_column)
+
+	# check for observations that other sources have already
+	# reported, which are flagged in a column of their own
+	# unless they are dropped, where optional stages are only
+	# imported when they are used to keep startup short
+	#
+	duplicate_index = None
+	duplicates = None
+	if arguments.duplicates:
+		from pipeline.duplicates import DuplicateIndex, duplicate_column
+		duplicate_index = DuplicateIndex(arguments.duplicates, arguments.drop_duplicates)
+		duplicates = duplicate_index.get_source(source)
+		if not arguments.drop_duplicates:
+			columns.append(duplicate_column)
+
+	# compile columns into a plan of extractors
+	#
+	plan = compile_plan(columns, extractors, key = sources[source]['id'], schema = read_schema(schema))
+
+	# time each stage and column when profiling
+	#
+	profile = None
+	if arguments.profile:
+		from pipeline.profiles import Profile
+		profile = Profile(plan)
 
-	# parse data from observations
+	# only keep new or changed observations when appending
 	#
-	observations = []
-	with open(filename) as csvfile:
-		reader = csv.reader(csvfile)
-		index = 0
-		input_columns = []
-		for row in reader:
-			index += 1
-			if index == 1:
-				input_columns = row
-			else:
-				values = {}
-				for i in range(0, len(row)):
-					values[input_columns[i]] = row[i]
-				observations.append(values)
-
-	# write transformed data to csv file
+	index = None
+	if arguments.delta:
+		from pipeline.deltas import DeltaIndex
+		index = DeltaIndex(arguments.delta, outfilename)
+
+	# transform observations in parallel
+	#
+	if arguments.workers > 1:
+		write_csv_shards(source, columns, filename, outfilename, arguments.workers, index = index, format = format, duplicates = duplicates)
+
+	else:
+
+		# stream observations
+		#
+		observations = read_observations(filename)
+		if index:
+			count = index.count
+			observations = index.select(observations, sources[source]['id'])
+
+		# write transformed data to the output file
+		#
+		if profile:
+			profile.write_csv(outfilename, columns, observations, get_observation_values, index and index.appending, format, plan.constants, duplicates)
+		else:
+			write_csv(outfilename, observations, index and index.appending, format, duplicates)
+
+	# save indexes of written observations
+	#
+	if index:
+		index.commit()
+	if duplicate_index:
+		duplicate_index.close()
+
+	# report time spent per stage and column
 	#
-	write_csv(outfilename, observations)
\ No newline at end of file
+	if profile:
+		profile.print_summary()
+		profile.write_summary(arguments.profile)
\ No newline at end of file
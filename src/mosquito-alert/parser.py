@@ -17,193 +17,113 @@
 
 import os
 import sys
-import json
-import csv
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline.readers import read_json_array
+from pipeline.records import project
+from pipeline.plans import blank, id_column, read_schema, read_columns, compile_plan
+from pipeline.shards import write_csv as write_csv_shards
+from pipeline.writers import get_format, get_writer
+from pipeline.sources import sources
+from pipeline.commands import get_arguments
 
 #
 # globals
 #
 
 current = os.path.dirname(os.path.abspath(__file__))
+source = 'mosquito-alert'
 schema = current + '/../../data/mosquito-alert/output/schema.txt'
 columns = []
+plan = None
 
 #
-# parsing functions
+# observation fields
 #
 
-def get_observation_value(observation, key):
-	match key:
-
-		case 'OBJECTID':
-			return ''
-
-		case 'title':
-			return ''
-
-		case 'description':
-			return ''
-
-		case 'dataStreamName':
-			return ''
-
-		case 'dataStreamDescription':
-			return ''
-
-		case 'dataStreamObsType':
-			return ''
-
-		case 'dataStreamUniCategory':
-			return ''
-
-		case 'observationProObsUID':
-			return ''
-
-		case 'observationResCatObsPheTime':
-			return ''
-
-		case 'observationResCatObsResTime':
-			return ''
-
-		case 'observationResCatObsResult':
-			return ''
-
-		case 'obsResCatObsResult_Type':
-			return ''
-
-		case 'Identified by Human' | 'Indentified by Human':
-			return ''
-
-		case 'Identified by Machine' | 'Identified by Machine':
-			return ''
-
-		case 'observationResCatObsSubTime':
-			return ''
-
-		case 'observationImaImaStatus':
-			return ''
-
-		case 'observationImaImaResult':
-			return ''
-
-		case 'observationConParameters':
-			return ''
-
-		case 'Aegypti_Certainty':
-			return ''
-
-		case 'Tiger_Certainty':
-			return ''
-
-		case 'omProcessLicLicName':
-			return ''
-
-		case 'omProcessLicLicURI':
-			return ''
-
-		case 'omProcessLicLicAttSource':
-			return ''
-
-		case 'omProcessLicLicAttAggregator':
-			return ''
-
-		case 'omProcessProType' | 'omPrcoessProType':
-			return ''
-
-		case 'omProcessProReference':
-			return ''
-
-		case 'omProcessResQuaValStatus' | 'omPrcoessResQuaValStatus':
-			return ''
-
-		case 'omProcessResQuaValMethod' | 'omPrcoessResQuaValMethod':
-			return ''
-
-		case 'omProcessResQuaValResult' | 'omPrcoessResQuaValResult':
-			return ''
-
-		case 'omProcessResQuaQuaGrade' | 'omPrcoessResQuaQuaGrade':
-			return ''
-
-		case 'observedProName':
-			return ''
-
-		case 'observedProDescription':
-			return ''
-
-		case 'observedProDefinition':
-			return ''
-
-		case 'sensorName':
-			return ''
-
-		case 'sensorDescription':
-			return ''
-
-		case 'sensorEncType':
-			return ''
-
-		case 'locationName':
-			return ''
-
-		case 'locationDescription':
-			return ''
-
-		case 'locationEncType':
-			return ''
-
-		case 'latitude':
-			return ''
-
-		case 'longitude':
-			return ''
-
-		case 'thingName':
-			return ''
-
-		case 'thingDescription':
-			return ''
-
-		case 'featureIntName':
-			return ''
-
-		case 'featureIntDescription':
-			return ''
-
-		case 'featureIntEncType':
-			return ''
-
-		case 'featureIntLocation':
-			return ''
-
-		case 'type':
-			return ''
-
-		case 'coordinates':
-			return ''
-
-		case 'nuts_3':
-			return ''
-
-		case 'nuts_2':
-			return ''
+# the fields that the extractors read, which are all that is
+# kept of each observation, along with the id that changes
+# are tracked by
+#
+fields = {
+	'version_UUID': None
+}
 
-		case 'X':
-			return ''
+#
+# column extractors
+#
 
-		case 'Y':
-			return ''
+extractors = {
+	'OBJECTID': blank,
+	'title': blank,
+	'description': blank,
+	'dataStreamName': blank,
+	'dataStreamDescription': blank,
+	'dataStreamObsType': blank,
+	'dataStreamUniCategory': blank,
+	'observationProObsUID': blank,
+	'observationResCatObsPheTime': blank,
+	'observationResCatObsResTime': blank,
+	'observationResCatObsResult': blank,
+	'obsResCatObsResult_Type': blank,
+	'Identified by Human': blank,
+	'Indentified by Human': blank,
+	'Identified by Machine': blank,
+	'observationResCatObsSubTime': blank,
+	'observationImaImaStatus': blank,
+	'observationImaImaResult': blank,
+	'observationConParameters': blank,
+	'Aegypti_Certainty': blank,
+	'Tiger_Certainty': blank,
+	'omProcessLicLicName': blank,
+	'omProcessLicLicURI': blank,
+	'omProcessLicLicAttSource': blank,
+	'omProcessLicLicAttAggregator': blank,
+	'omProcessProType': blank,
+	'omPrcoessProType': blank,
+	'omProcessProReference': blank,
+	'omProcessResQuaValStatus': blank,
+	'omPrcoessResQuaValStatus': blank,
+	'omProcessResQuaValMethod': blank,
+	'omPrcoessResQuaValMethod': blank,
+	'omProcessResQuaValResult': blank,
+	'omPrcoessResQuaValResult': blank,
+	'omProcessResQuaQuaGrade': blank,
+	'omPrcoessResQuaQuaGrade': blank,
+	'observedProName': blank,
+	'observedProDescription': blank,
+	'observedProDefinition': blank,
+	'sensorName': blank,
+	'sensorDescription': blank,
+	'sensorEncType': blank,
+	'locationName': blank,
+	'locationDescription': blank,
+	'locationEncType': blank,
+	'latitude': blank,
+	'longitude': blank,
+	'thingName': blank,
+	'thingDescription': blank,
+	'featureIntName': blank,
+	'featureIntDescription': blank,
+	'featureIntEncType': blank,
+	'featureIntLocation': blank,
+	'type': blank,
+	'coordinates': blank,
+	'nuts_3': blank,
+	'nuts_2': blank,
+	'X': blank,
+	'Y': blank
+}
 
-		case _:
-			return ''
+#
+# parsing functions
+#
 
-	return ''
+def get_observation_value(observation, key):
+	return extractors.get(key, blank)(observation)
 
 def get_observation_values(observation):
-	values = []
-	for column in columns:
-		values.append(get_observation_value(observation, column))
-	return values
+	return plan.apply(observation)
 
 #
 # utility functions
@@ -214,22 +134,20 @@ def read_file(filename):
 		data = file.read()
 	return data
 
+def read_observations(filename):
+	return (project(observation, fields) for observation in read_json_array(filename))
+
 #
 # output functions
 #
 
-def write_csv(filename, observations):
-	with open(filename, 'w', newline='') as file:
-		writer = csv.writer(file)
-
-		# add headers
-		#
-		writer.writerow(columns)
+def write_csv(filename, observations, appending = False, format = None, duplicates = None):
+	with get_writer(filename, columns, format, plan.constants, appending, duplicates) as writer:
 
 		# add columns
 		#
 		for observation in observations:
-			writer.writerow(get_observation_values(observation))
+			writer.write(get_observation_values(observation))
 
 #
 # main
@@ -239,26 +157,85 @@ if __name__ == '__main__':
 
 	# parse arguments
 	#
-	if (len(sys.argv) < 3):
-		print("Usage: python3 parser.py <input-file-name> <output-file-name");
-		exit();
+	arguments = get_arguments()
 
 	# get command line arguments
 	#
-	filename = sys.argv[1]
-	outfilename = sys.argv[2]
+	filename = arguments.filename
+	outfilename = arguments.outfilename
 
 	# parse columns to read from schema
 	#
-	columns = []
-	with open(schema, 'r') as file:
-		for line in file:
-			columns.append(line.replace(',', '').replace('REQUIRED', '').replace('MANDATORY', '').strip())
+	columns = read_columns(schema)
+
+	# choose the output format, where databases are also
+	# keyed by the id of each observation in its source
+	#
+	format = get_format(outfilename, arguments.format)
+	if format == 'sqlite':
+		columns.append(id_column)
+
+	# check for observations that other sources have already
+	# reported, which are flagged in a column of their own
+	# unless they are dropped, where optional stages are only
+	# imported when they are used to keep startup short
+	#
+	duplicate_index = None
+	duplicates = None
+	if arguments.duplicates:
+		from pipeline.duplicates import DuplicateIndex, duplicate_column
+		duplicate_index = DuplicateIndex(arguments.duplicates, arguments.drop_duplicates)
+		duplicates = duplicate_index.get_source(source)
+		if not arguments.drop_duplicates:
+			columns.append(duplicate_column)
+
+	# compile columns into a plan of extractors
+	#
+	plan = compile_plan(columns, extractors, key = sources[source]['id'], schema = read_schema(schema))
+
+	# time each stage and column when profiling
+	#
+	profile = None
+	if arguments.profile:
+		from pipeline.profiles import Profile
+		profile = Profile(plan)
+
+	# only keep new or changed observations when appending
+	#
+	index = None
+	if arguments.delta:
+		from pipeline.deltas import DeltaIndex
+		index = DeltaIndex(arguments.delta, outfilename)
+
+	# transform observations in parallel
+	#
+	if arguments.workers > 1:
+		write_csv_shards(source, columns, filename, outfilename, arguments.workers, index = index, format = format, duplicates = duplicates)
+
+	else:
+
+		# stream reports from the top level array
+		#
+		observations = read_observations(filename)
+		if index:
+			observations = index.select(observations, sources[source]['id'])
+
+		# write transformed data to the output file
+		#
+		if profile:
+			profile.write_csv(outfilename, columns, observations, get_observation_values, index and index.appending, format, plan.constants, duplicates)
+		else:
+			write_csv(outfilename, observations, index and index.appending, format, duplicates)
 
-	# parse data from observations
+	# save indexes of written observations
 	#
-	observations = json.loads(read_file(filename))
+	if index:
+		index.commit()
+	if duplicate_index:
+		duplicate_index.close()
 
-	# write transformed data to csv file
+	# report time spent per stage and column
 	#
-	write_csv(outfilename, observations)
\ No newline at end of file
+	if profile:
+		profile.print_summary()
+		profile.write_summary(arguments.profile)
\ No newline at end of file
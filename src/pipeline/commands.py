@@ -0,0 +1,58 @@
+################################################################################
+#                                                                              #
+#                                 commands.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for parsing command line arguments.                 #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import argparse
+from .writers import writers
+
+#
+# argument functions
+#
+
+def get_arguments(add_arguments = None):
+	parser = argparse.ArgumentParser(usage='python3 parser.py <input-file-name> <output-file-name> [options]')
+	parser.add_argument('filename', metavar='input-file-name')
+	parser.add_argument('outfilename', metavar='output-file-name')
+	parser.add_argument('--workers', type=int, default=1, help='number of worker processes to transform with')
+	parser.add_argument('--profile', metavar='profile-file-name', help='time each stage and column in a single process and write a summary as json')
+	parser.add_argument('--format', choices=list(writers), help='format to write, which is otherwise chosen by the output file extension')
+	parser.add_argument('--duplicates', metavar='duplicate-index-file-name', help='flag observations that other sources have already reported, using an index shared by all sources')
+	parser.add_argument('--drop-duplicates', action='store_true', help='drop observations that other sources have already reported rather than flagging them')
+	parser.add_argument('--delta', metavar='index-file-name', help='only transform new or changed observations and append them to the output')
+
+	# add any arguments that are specific to a source
+	#
+	if add_arguments:
+		add_arguments(parser)
+
+	# profiles time a single process, so they would be misread
+	# as timings of a parallel run
+	#
+	arguments = parser.parse_args()
+	if arguments.profile and arguments.workers > 1:
+		parser.error('--profile always runs in a single process and can not be combined with --workers')
+	return arguments
+
+def add_fetch_arguments(parser):
+
+	# options of sources that can be fetched from an api,
+	# which are kept here so that only runs that fetch pay
+	# for importing the fetcher
+	#
+	parser.add_argument('--since-id', type=int, default=0, help='only fetch observations with ids above this id')
+	parser.add_argument('--cursor', metavar='cursor-file-name', help='file that the last written id is saved to and resumed from')
+	parser.add_argument('--concurrency', type=int, default=4, help='number of pages to fetch at once')
+	parser.add_argument('--rate', type=float, default=1, help='maximum number of requests per second')
@@ -0,0 +1,104 @@
+################################################################################
+#                                                                              #
+#                                compression.py                                #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for reading and writing compressed files.           #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+
+#
+# compression functions
+#
+
+# compression modules are only imported when a compressed
+# file is opened, since most runs only read plain files
+#
+
+def open_gzip(filename, mode, **options):
+	import gzip
+	return gzip.open(filename, mode, **options)
+
+def open_bz2(filename, mode, **options):
+	import bz2
+	return bz2.open(filename, mode, **options)
+
+def open_xz(filename, mode, **options):
+	import lzma
+	return lzma.open(filename, mode, **options)
+
+def open_lzma(filename, mode, **options):
+	import lzma
+	return lzma.open(filename, mode, format=lzma.FORMAT_ALONE, **options)
+
+# compressed files are recognized by the magic bytes that
+# they start with, or by their suffix when they are written,
+# where legacy lzma files have no magic bytes of their own
+# but start with the usual properties and dictionary size
+#
+compressions = {
+	'gzip': {'suffixes': ['.gz', '.gzip'], 'magic': b'\x1f\x8b', 'open': open_gzip},
+	'bz2': {'suffixes': ['.bz2'], 'magic': b'BZh', 'open': open_bz2},
+	'xz': {'suffixes': ['.xz'], 'magic': b'\xfd7zXZ\x00', 'open': open_xz},
+	'lzma': {'suffixes': ['.lzma'], 'magic': b'\x5d\x00\x00', 'open': open_lzma}
+}
+
+#
+# querying functions
+#
+
+def get_suffix_compression(filename):
+	suffix = os.path.splitext(filename)[1].lower()
+	for name, compression in compressions.items():
+		if suffix in compression['suffixes']:
+			return name
+	return None
+
+def get_compression(filename, mode = 'r'):
+
+	# the contents of existing files are trusted over their
+	# names, since archived dumps are not always renamed
+	#
+	if mode.startswith('r') and os.path.isfile(filename):
+		with open(filename, 'rb') as file:
+			start = file.read(6)
+		for name, compression in compressions.items():
+			if start.startswith(compression['magic']):
+				return name
+		return None
+	return get_suffix_compression(filename)
+
+def strip_suffix(filename):
+
+	# find the name of a file without its compression suffix,
+	# such as to find the format of output.csv.gz
+	#
+	if get_suffix_compression(filename):
+		return os.path.splitext(filename)[0]
+	return filename
+
+#
+# opening functions
+#
+
+def open_file(filename, mode = 'r', **options):
+
+	# open files in the same way as the open builtin, where
+	# compressed files are decoded or encoded as a stream
+	#
+	compression = get_compression(filename, mode)
+	if not compression:
+		return open(filename, mode, **options)
+	if 'b' not in mode and 't' not in mode:
+		mode += 't'
+	return compressions[compression]['open'](filename, mode, **options)
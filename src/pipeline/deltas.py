@@ -0,0 +1,88 @@
+################################################################################
+#                                                                              #
+#                                  deltas.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for transforming only new or changed data.          #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import json
+import sqlite3
+import hashlib
+
+#
+# fingerprint functions
+#
+
+def get_fingerprint(observation):
+	text = json.dumps(observation, sort_keys=True, separators=(',', ':'), default=str)
+	return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+#
+# delta index class
+#
+
+class DeltaIndex:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, outfilename):
+		self.connection = sqlite3.connect(filename)
+		self.connection.execute('CREATE TABLE IF NOT EXISTS records (id TEXT PRIMARY KEY, fingerprint TEXT)')
+		self.connection.execute('CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value INTEGER)')
+
+		# an index is only valid for the output that it was
+		# built with, so start over if that output is missing
+		#
+		self.appending = os.path.exists(outfilename) and os.path.getsize(outfilename) > 0
+		if not self.appending:
+			self.connection.execute('DELETE FROM records')
+			self.connection.execute('DELETE FROM state')
+
+		# the number of rows already written to the output
+		#
+		row = self.connection.execute('SELECT value FROM state WHERE name = ?', ('count',)).fetchone()
+		self.count = row[0] if row else 0
+
+	#
+	# selecting methods
+	#
+
+	def select(self, observations, key):
+
+		# yield only the observations whose ids are new or
+		# whose contents have changed since they were written
+		#
+		for observation in observations:
+			id = str(observation[key])
+			fingerprint = get_fingerprint(observation)
+			row = self.connection.execute('SELECT fingerprint FROM records WHERE id = ?', (id,)).fetchone()
+			if row and row[0] == fingerprint:
+				continue
+			self.connection.execute('INSERT OR REPLACE INTO records VALUES (?, ?)', (id, fingerprint))
+			self.count += 1
+			yield observation
+
+	#
+	# saving methods
+	#
+
+	def commit(self):
+
+		# only save the index once the output has been written
+		#
+		self.connection.execute('INSERT OR REPLACE INTO state VALUES (?, ?)', ('count', self.count))
+		self.connection.commit()
+		self.connection.close()
@@ -0,0 +1,224 @@
+################################################################################
+#                                                                              #
+#                                duplicates.py                                 #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for finding observations that several sources report.#
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import sqlite3
+import datetime
+import threading
+from .sources import sources
+
+#
+# globals
+#
+
+# observations are likely duplicates if they are within the
+# same grid cell of about 100 meters and within the same
+# hour, and of the same taxon if both sources name one
+#
+precision = 3
+time_bucket = 3600
+commit_size = 10000
+
+# name of the column that flagged duplicates are written to
+#
+duplicate_column = 'duplicateOf'
+
+# sightings are owned by the source that comes first in the
+# registry, whatever order sources are run in
+#
+priorities = {name: count for count, name in enumerate(sources)}
+
+#
+# key functions
+#
+
+def get_time_bucket(value):
+	try:
+		time = datetime.datetime.fromisoformat(value)
+	except (TypeError, ValueError):
+		return None
+	if time.tzinfo is None:
+		time = time.replace(tzinfo=datetime.timezone.utc)
+	return int(time.timestamp() // time_bucket)
+
+def get_key(latitude, longitude, time):
+
+	# observations without a location or time can not be
+	# matched to observations from other sources
+	#
+	try:
+		latitude = round(float(latitude), precision)
+		longitude = round(float(longitude), precision)
+	except (TypeError, ValueError):
+		return None
+	bucket = get_time_bucket(time)
+	if bucket is None:
+		return None
+	return '%.*f,%.*f,%d' % (precision, latitude, precision, longitude, bucket)
+
+def get_taxon(value):
+	return value.strip().lower() if isinstance(value, str) else ''
+
+def is_same_taxon(taxon, other):
+
+	# sources without a taxon, such as the GLOBE sources,
+	# match any taxon, and a genus matches its species
+	#
+	if not taxon or not other:
+		return True
+	return taxon == other or taxon.startswith(other + ' ') or other.startswith(taxon + ' ')
+
+#
+# duplicate index class
+#
+
+class DuplicateIndex:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, drop = False):
+		self.drop = drop
+		self.count = 0
+		self.lock = threading.Lock()
+
+		# keys are kept on disk so that the index does not need
+		# to fit in memory, and one connection is shared by the
+		# threads of all sources
+		#
+		self.connection = sqlite3.connect(filename, isolation_level=None, check_same_thread=False)
+		self.connection.execute('PRAGMA journal_mode = WAL')
+		self.connection.execute('PRAGMA synchronous = NORMAL')
+		self.connection.execute('CREATE TABLE IF NOT EXISTS sightings (key TEXT, taxon TEXT, source TEXT, id TEXT, PRIMARY KEY (key, taxon, source)) WITHOUT ROWID')
+		self.connection.execute('BEGIN')
+
+	#
+	# finding methods
+	#
+
+	def find(self, key, taxon, source, id):
+
+		# observations are duplicates of observations at the same
+		# place and time from sources that come before theirs,
+		# unless their taxa differ, where the first such source
+		# owns the sighting
+		#
+		with self.lock:
+			duplicate = None
+			owner = priorities[source]
+			for other_taxon, other_source, other_id in self.connection.execute('SELECT taxon, source, id FROM sightings WHERE key = ? AND source != ?', (key, source)):
+				if priorities[other_source] < owner and is_same_taxon(taxon, other_taxon):
+					duplicate = other_source + ':' + other_id
+					owner = priorities[other_source]
+			if not duplicate:
+				self.connection.execute('INSERT OR IGNORE INTO sightings VALUES (?, ?, ?, ?)', (key, taxon, source, id))
+			self.count += 1
+			if self.count % commit_size == 0:
+				self.connection.execute('COMMIT')
+				self.connection.execute('BEGIN')
+		return duplicate
+
+	def get_source(self, source):
+		return DuplicateSource(self, source)
+
+	#
+	# saving methods
+	#
+
+	def commit(self):
+		with self.lock:
+			self.connection.execute('COMMIT')
+			self.connection.execute('BEGIN')
+
+	def close(self):
+		self.connection.execute('COMMIT')
+		self.connection.close()
+
+#
+# duplicate source class
+#
+
+class DuplicateSource:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, index, source):
+		self.index = index
+		self.source = source
+
+	#
+	# writing methods
+	#
+
+	def get_writer(self, writer, columns):
+		return DuplicateWriter(writer, self.index, self.source, columns)
+
+#
+# duplicate writer class
+#
+
+class DuplicateWriter:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, writer, index, source, columns):
+		self.writer = writer
+		self.index = index
+		self.source = source
+
+		# find the columns that the key of each row is made of
+		#
+		fields = sources[source]['fields']
+		self.positions = [columns.index(fields[role]) if fields[role] in columns else None for role in ['latitude', 'longitude', 'time']]
+		self.taxon = columns.index(fields['species']) if fields['species'] in columns else None
+		self.id = columns.index('OBJECTID') if 'OBJECTID' in columns else None
+		self.flag = columns.index(duplicate_column) if duplicate_column in columns else None
+
+	#
+	# writing methods
+	#
+
+	def write(self, row):
+		key = get_key(*[row[position] if position is not None else None for position in self.positions])
+		taxon = get_taxon(row[self.taxon]) if self.taxon is not None else ''
+		duplicate = self.index.find(key, taxon, self.source, str(row[self.id]) if self.id is not None else '') if key else None
+
+		# likely duplicates are either dropped or flagged with
+		# the observation that they duplicate
+		#
+		if duplicate and self.index.drop:
+			return
+		if duplicate and self.flag is not None:
+			row[self.flag] = duplicate
+		self.writer.write(row)
+
+	def flush(self):
+		self.writer.flush()
+
+	def close(self):
+		self.writer.close()
+		self.index.commit()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
@@ -0,0 +1,321 @@
+################################################################################
+#                                                                              #
+#                                 fetchers.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for fetching pages of observations from an API.     #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import json
+import time
+import queue
+import asyncio
+import threading
+import http.client
+import urllib.parse
+
+#
+# globals
+#
+
+retries = 5
+backoff = 2
+timeout = 60
+finished = object()
+
+#
+# exception classes
+#
+
+class FetchError(Exception):
+	pass
+
+#
+# rate limiting class
+#
+
+class RateLimiter:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, rate):
+		self.interval = 1 / rate if rate else 0
+		self.time = 0
+		self.lock = asyncio.Lock()
+
+	#
+	# waiting methods
+	#
+
+	async def wait(self):
+
+		# space the start of requests evenly over time
+		#
+		async with self.lock:
+			now = time.monotonic()
+			if self.time > now:
+				await asyncio.sleep(self.time - now)
+				now = self.time
+			self.time = now + self.interval
+
+#
+# connection pool class
+#
+
+class ConnectionPool:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, url, size, rate):
+		parts = urllib.parse.urlsplit(url)
+		self.secure = parts.scheme == 'https'
+		self.host = parts.netloc
+		self.limiter = RateLimiter(rate)
+
+		# connections are created when first used and then
+		# kept alive and reused by later requests
+		#
+		self.connections = asyncio.Queue()
+		for count in range(size):
+			self.connections.put_nowait(None)
+
+	#
+	# helper methods
+	#
+
+	def connect(self):
+		if self.secure:
+			return http.client.HTTPSConnection(self.host, timeout=timeout)
+		else:
+			return http.client.HTTPConnection(self.host, timeout=timeout)
+
+	def request(self, connection, path):
+		connection.request('GET', path, headers={'Accept': 'application/json'})
+		response = connection.getresponse()
+		body = response.read()
+		if response.status != 200:
+			raise FetchError(str(response.status) + ' ' + response.reason + ': ' + path)
+		return json.loads(body)
+
+	#
+	# fetching methods
+	#
+
+	async def get(self, path):
+		connection = await self.connections.get()
+		try:
+			for attempt in range(retries):
+				await self.limiter.wait()
+				if not connection:
+					connection = self.connect()
+				try:
+					return await asyncio.to_thread(self.request, connection, path)
+				except (FetchError, http.client.HTTPException, OSError):
+					connection.close()
+					connection = None
+					if attempt == retries - 1:
+						raise
+					await asyncio.sleep(backoff ** attempt)
+		finally:
+			self.connections.put_nowait(connection)
+
+#
+# fetcher class
+#
+
+class Fetcher:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, url, since_id = 0, per_page = 200, concurrency = 4, rate = 1):
+		parts = urllib.parse.urlsplit(url)
+		self.url = url
+		self.path = parts.path
+		self.since_id = since_id
+		self.per_page = int(dict(urllib.parse.parse_qsl(parts.query)).get('per_page', per_page))
+		self.concurrency = concurrency
+		self.rate = rate
+
+		# the cursor and paging parameters are always set by
+		# the fetcher, and any other query parameters are kept
+		#
+		paging = ['id_above', 'page', 'per_page', 'order', 'order_by']
+		self.query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query) if name not in paging]
+
+	#
+	# helper methods
+	#
+
+	def get_path(self, cursor, page):
+		query = self.query + [
+			('id_above', cursor),
+			('per_page', self.per_page),
+			('page', page),
+			('order_by', 'id'),
+			('order', 'asc')
+		]
+		return self.path + '?' + urllib.parse.urlencode(query)
+
+	#
+	# fetching methods
+	#
+
+	async def fetch_pages(self):
+		pool = ConnectionPool(self.url, self.concurrency, self.rate)
+		cursor = self.since_id
+
+		# fetch a window of pages after the cursor at once and
+		# yield them in order, then move the cursor to the last
+		# id of the window
+		#
+		while True:
+			tasks = [asyncio.create_task(pool.get(self.get_path(cursor, page))) for page in range(1, self.concurrency + 1)]
+			try:
+				for task in tasks:
+					results = (await task)['results']
+					if results:
+						yield results
+					if len(results) < self.per_page:
+						return
+					cursor = results[-1]['id']
+			finally:
+				for task in tasks:
+					task.cancel()
+
+	def read_pages(self, size = 8):
+
+		# run the fetcher in a thread of its own that fills a
+		# bounded queue, so that pages are fetched ahead while
+		# earlier pages are being transformed
+		#
+		pages = queue.Queue(size)
+
+		async def produce():
+			async for page in self.fetch_pages():
+				await asyncio.to_thread(pages.put, page)
+
+		def run():
+			try:
+				asyncio.run(produce())
+				pages.put(finished)
+			except Exception as exception:
+				pages.put(exception)
+
+		threading.Thread(target=run, daemon=True).start()
+		while True:
+			page = pages.get()
+			if page is finished:
+				return
+			if isinstance(page, Exception):
+				raise page
+			yield page
+
+#
+# cursor functions
+#
+
+def read_cursor(filename):
+
+	# cursor files hold the last id that was written, which
+	# may be followed by the size of the output at that id
+	#
+	if filename and os.path.exists(filename):
+		with open(filename, 'r') as file:
+			values = [int(value) for value in file.read().split()]
+		if values:
+			return values[0], values[1] if len(values) > 1 else None
+	return 0, None
+
+def write_cursor(filename, cursor, size = None):
+	with open(filename + '.tmp', 'w') as file:
+		file.write(str(cursor) if size is None else str(cursor) + ' ' + str(size))
+	os.replace(filename + '.tmp', filename)
+
+#
+# cursor class
+#
+
+class Cursor:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, outfilename = None):
+		self.filename = filename
+		self.outfilename = outfilename
+		self.id, self.size = read_cursor(filename)
+		self.fetched = self.id
+
+	#
+	# saving methods
+	#
+
+	def save(self, id):
+
+		# only save ids whose observations are in the output,
+		# so that a run that is stopped resumes after them
+		#
+		if id > self.id:
+			self.id = id
+			self.size = os.path.getsize(self.outfilename) if self.outfilename and os.path.exists(self.outfilename) else None
+			write_cursor(self.filename, id, self.size)
+
+	def rewind(self):
+
+		# drop rows that a stopped run wrote to the output after
+		# the cursor was last saved, which are fetched again
+		#
+		if self.size is not None and os.path.exists(self.outfilename) and os.path.getsize(self.outfilename) > self.size:
+			os.truncate(self.outfilename, self.size)
+
+	def checkpoint(self, observations, output):
+
+		# once the next observation is asked for, the rows of
+		# the pages before it have been written, so they are
+		# flushed and the last id of those pages is saved
+		#
+		for observation in observations:
+			if self.fetched > self.id:
+				output.flush()
+				self.save(self.fetched)
+			yield observation
+
+	def commit(self):
+
+		# once the output has been written, it holds every
+		# observation that was fetched
+		#
+		self.save(self.fetched)
+
+#
+# reading functions
+#
+
+def read_url(url, cursor = None, since_id = 0, concurrency = 4, rate = 1):
+
+	# yield observations from each page and keep the last id
+	# that was fetched, which is saved as the resume cursor
+	# once the output holds it
+	#
+	fetcher = Fetcher(url, since_id or (cursor.id if cursor else 0), concurrency=concurrency, rate=rate)
+	for page in fetcher.read_pages():
+		yield from page
+		if cursor:
+			cursor.fetched = page[-1]['id']
@@ -0,0 +1,208 @@
+################################################################################
+#                                                                              #
+#                                   plans.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for compiling column extraction plans.              #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import re
+import json
+
+#
+# globals
+#
+
+# name of the column that holds the id that the source gave
+# an observation, which is only written when it is requested
+#
+id_column = 'sourceId'
+
+# dicts and lists are written as compact json by one encoder
+# that is reused for every value
+#
+encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+# flags that schema lines may end with, and the schemas that
+# have been read, which are kept until their files change
+#
+flags = re.compile('REQUIRED|MANDATORY')
+schemas = {}
+
+#
+# extractor classes
+#
+
+class Constant:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, value):
+		self.value = value
+
+	#
+	# calling methods
+	#
+
+	def __call__(self, observation):
+		return self.value
+
+class Nested:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, extract):
+		self.extract = extract
+
+	#
+	# calling methods
+	#
+
+	def __call__(self, observation):
+		return encode(self.extract(observation))
+
+#
+# extractor functions
+#
+
+def constant(value):
+	return Constant(value)
+
+blank = constant('')
+
+def nested(extract):
+
+	# mark an extractor whose dicts or lists are written as
+	# json rather than as python values
+	#
+	return Nested(extract)
+
+def encode(value):
+	if isinstance(value, (dict, list)):
+		return encoder.encode(value)
+	return value
+
+#
+# schema class
+#
+
+class Schema:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, columns, required = (), mandatory = ()):
+		self.columns = columns
+		self.required = set(required)
+		self.mandatory = set(mandatory)
+
+#
+# schema functions
+#
+
+def parse_schema(filename):
+	columns = []
+	required = []
+	mandatory = []
+	with open(filename, 'r') as file:
+		for line in file:
+			column = flags.sub('', line.replace(',', '')).strip()
+			columns.append(column)
+			for flag in flags.findall(line):
+				(required if flag == 'REQUIRED' else mandatory).append(column)
+	return Schema(columns, required, mandatory)
+
+def read_schema(filename):
+
+	# schemas are parsed once per process, and again only if
+	# the modification time or size of their file changes
+	#
+	status = os.stat(filename)
+	stamp = (status.st_mtime_ns, status.st_size)
+	if filename not in schemas or schemas[filename][0] != stamp:
+		schemas[filename] = (stamp, parse_schema(filename))
+	return schemas[filename][1]
+
+def read_columns(filename):
+
+	# return a copy, since callers may add columns of their own
+	#
+	return list(read_schema(filename).columns)
+
+#
+# plan class
+#
+
+class Plan:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, columns, extractors, default = blank, schema = None):
+		self.columns = columns
+		self.template = []
+		self.slots = []
+		self.constants = set()
+		self.extractors = {}
+		self.required = schema.required if schema else set()
+		self.mandatory = schema.mandatory if schema else set()
+
+		# values of constant columns are placed in a row
+		# template once, with nested values encoded once, so
+		# that rows only fill dynamic slots
+		#
+		for count, column in enumerate(columns):
+			extract = extractors.get(column, default)
+			self.extractors[column] = extract
+			if isinstance(extract, Constant):
+				self.template.append(encode(extract.value))
+				self.constants.add(column)
+			else:
+				self.template.append(None)
+				self.slots.append((count, extract))
+
+	#
+	# applying methods
+	#
+
+	def apply(self, observation):
+		row = self.template.copy()
+		for count, extract in self.slots:
+			row[count] = extract(observation)
+		return row
+
+#
+# plan functions
+#
+
+def get_field(key):
+	return lambda observation: observation[key]
+
+def compile_plan(columns, extractors, default = blank, key = None, schema = None):
+
+	# the id column is filled from the field that the source
+	# identifies observations by
+	#
+	if key:
+		extractors = {**extractors, id_column: get_field(key)}
+
+	# resolve each column to its extractor once so that
+	# rows only need to apply the extractors in order
+	#
+	return Plan(columns, extractors, default, schema)
@@ -0,0 +1,239 @@
+################################################################################
+#                                                                              #
+#                                 profiles.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for profiling the stages of a transform.            #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import io
+import csv
+import json
+import time
+import resource
+from . import readers
+from .plans import blank
+from .writers import get_writer
+from .compression import open_file
+
+#
+# globals
+#
+
+missing = object()
+
+#
+# timed file class
+#
+
+class TimedFile:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, file, profile):
+		self.file = file
+		self.profile = profile
+
+	#
+	# reading methods
+	#
+
+	def read(self, *args):
+		start = time.perf_counter()
+		data = self.file.read(*args)
+		self.profile.add('stages', 'read', time.perf_counter() - start)
+		return data
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+		start = time.perf_counter()
+		try:
+			return next(self.file)
+		finally:
+			self.profile.add('stages', 'read', time.perf_counter() - start)
+
+	#
+	# closing methods
+	#
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.file.close()
+
+#
+# profile class
+#
+
+class Profile:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, plan):
+		self.stages = {}
+		self.columns = {}
+
+		# time every dynamic column, and list constant columns
+		# since they are filled from the row template for free
+		#
+		for count, column in enumerate(plan.columns):
+			self.columns[column] = {'seconds': 0, 'calls': 0, 'constant': True, 'required': column in plan.required, 'blank': plan.extractors[column] is blank}
+		plan.slots = [(count, self.time_extractor(plan.columns[count], extract)) for count, extract in plan.slots]
+
+		# time reads of input files
+		#
+		readers.opener = self.open
+
+	#
+	# helper methods
+	#
+
+	def add(self, table, name, seconds, calls = 1):
+		entries = getattr(self, table)
+		if name not in entries:
+			entries[name] = {'seconds': 0, 'calls': 0}
+		entries[name]['seconds'] += seconds
+		entries[name]['calls'] += calls
+
+	def open(self, filename, mode = 'r'):
+		return TimedFile(open_file(filename, mode), self)
+
+	def time_extractor(self, column, extract):
+		entry = self.columns[column]
+		entry['constant'] = False
+
+		def timed(observation):
+			start = time.perf_counter()
+			value = extract(observation)
+			entry['seconds'] += time.perf_counter() - start
+			entry['calls'] += 1
+			return value
+
+		return timed
+
+	#
+	# output methods
+	#
+
+	def write_csv(self, filename, columns, observations, get_observation_values, appending = False, format = 'csv', constants = (), duplicates = None, cursor = None):
+		if format != 'csv' or duplicates:
+			return self.write_rows(filename, columns, observations, get_observation_values, appending, format, constants, duplicates, cursor)
+
+		with open_file(filename, 'a' if appending else 'w', newline='') as file:
+			buffer = io.StringIO(newline='')
+			writer = csv.writer(buffer)
+
+			# add headers
+			#
+			if not appending:
+				writer.writerow(columns)
+
+			# add columns, timing each stage of every row
+			#
+			if cursor:
+				observations = cursor.checkpoint(observations, file)
+			observations = iter(observations)
+			while True:
+				start = time.perf_counter()
+				observation = next(observations, missing)
+				if observation is missing:
+					break
+				transformed = time.perf_counter()
+				values = get_observation_values(observation)
+				serialized = time.perf_counter()
+				writer.writerow(values)
+				text = buffer.getvalue()
+				buffer.seek(0)
+				buffer.truncate()
+				written = time.perf_counter()
+				file.write(text)
+				finished = time.perf_counter()
+
+				self.add('stages', 'decode', transformed - start)
+				self.add('stages', 'transform', serialized - transformed)
+				self.add('stages', 'serialize', written - serialized)
+				self.add('stages', 'write', finished - written)
+			file.write(buffer.getvalue())
+
+		# time spent reading the input is part of the time that
+		# was spent waiting for the next observation
+		#
+		if 'read' in self.stages and 'decode' in self.stages:
+			self.stages['decode']['seconds'] -= self.stages['read']['seconds']
+
+	def write_rows(self, filename, columns, observations, get_observation_values, appending = False, format = None, constants = (), duplicates = None, cursor = None):
+		with get_writer(filename, columns, format, constants, appending, duplicates) as writer:
+
+			# add columns, where columnar writers serialize and
+			# write whole batches of rows at a time
+			#
+			if cursor:
+				observations = cursor.checkpoint(observations, writer)
+			observations = iter(observations)
+			while True:
+				start = time.perf_counter()
+				observation = next(observations, missing)
+				if observation is missing:
+					break
+				transformed = time.perf_counter()
+				values = get_observation_values(observation)
+				serialized = time.perf_counter()
+				writer.write(values)
+				finished = time.perf_counter()
+
+				self.add('stages', 'decode', transformed - start)
+				self.add('stages', 'transform', serialized - transformed)
+				self.add('stages', 'write', finished - serialized)
+			start = time.perf_counter()
+			writer.flush()
+			self.add('stages', 'write', time.perf_counter() - start, 0)
+
+		if 'read' in self.stages and 'decode' in self.stages:
+			self.stages['decode']['seconds'] -= self.stages['read']['seconds']
+
+	def get_summary(self):
+		return {
+			'stages': self.stages,
+			'columns': self.columns,
+			'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		}
+
+	def print_summary(self):
+		total = sum(entry['seconds'] for entry in self.stages.values()) or 1
+		print('stage'.ljust(40), 'seconds'.rjust(10), 'calls'.rjust(12), 'percent'.rjust(8))
+		for name in ['read', 'decode', 'transform', 'serialize', 'write']:
+			if name in self.stages:
+				entry = self.stages[name]
+				print(name.ljust(40), ('%.3f' % entry['seconds']).rjust(10), str(entry['calls']).rjust(12), ('%.1f%%' % (100 * entry['seconds'] / total)).rjust(8))
+		print()
+		print('column'.ljust(40), 'seconds'.rjust(10), 'calls'.rjust(12), 'percent'.rjust(8))
+		for name, entry in sorted(self.columns.items(), key=lambda item: -item[1]['seconds']):
+			if entry['constant']:
+				continue
+			print(name.ljust(40), ('%.3f' % entry['seconds']).rjust(10), str(entry['calls']).rjust(12), ('%.1f%%' % (100 * entry['seconds'] / total)).rjust(8))
+		print(str(sum(entry['constant'] for entry in self.columns.values())) + ' constant columns')
+		blanks = [name for name, entry in self.columns.items() if entry['required'] and entry['blank']]
+		if blanks:
+			print('required columns that are always blank: ' + ', '.join(blanks))
+		print()
+		print('peak memory'.ljust(40), ('%d MB' % (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024)).rjust(10))
+
+	def write_summary(self, filename):
+		with open(filename, 'w') as file:
+			file.write(json.dumps(self.get_summary(), indent=4))
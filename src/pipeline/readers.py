@@ -0,0 +1,171 @@
+################################################################################
+#                                                                              #
+#                                  readers.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for incrementally reading observations.             #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import json
+import csv
+from .records import get_record_type
+from .compression import open_file
+
+#
+# globals
+#
+
+decoder = json.JSONDecoder()
+whitespace = ' \t\n\r'
+chunk_size = 1 << 16
+
+# function that input files are opened with, which decodes
+# compressed files and may be replaced to wrap input files,
+# such as to time reads
+#
+opener = open_file
+
+#
+# json streaming class
+#
+
+class JsonStream:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, file):
+		self.file = file
+		self.buffer = ''
+		self.count = 0
+		self.finished = False
+
+	#
+	# helper methods
+	#
+
+	def fill(self, size = chunk_size):
+
+		# discard consumed text before appending more
+		#
+		data = self.file.read(size)
+		if data:
+			self.buffer = self.buffer[self.count:] + data
+			self.count = 0
+		else:
+			self.finished = True
+		return bool(data)
+
+	def current(self):
+		while True:
+			while self.count < len(self.buffer) and self.buffer[self.count] in whitespace:
+				self.count += 1
+			if self.count < len(self.buffer):
+				return self.buffer[self.count]
+			if not self.fill():
+				return None
+
+	def skip(self, number = 1):
+		self.count += number
+
+	def expect(self, char):
+		if self.current() != char:
+			raise ValueError('Expected ' + repr(char) + ' but found ' + repr(self.current()))
+		self.skip()
+
+	#
+	# reading methods
+	#
+
+	def read_value(self):
+		self.current()
+
+		# a value is only complete if it is followed by more text
+		# or the end of the file, otherwise a number such as 12
+		# may really be the start of 1234 in the next chunk
+		#
+		size = chunk_size
+		while True:
+			try:
+				value, end = decoder.raw_decode(self.buffer, self.count)
+				if end < len(self.buffer) or self.finished:
+					self.count = end
+					return value
+			except json.JSONDecodeError:
+				if self.finished:
+					raise
+			self.fill(size)
+			size *= 2
+
+	def find_key(self, key):
+		self.expect('{')
+		while self.current() != '}':
+			name = self.read_value()
+			self.expect(':')
+			if name == key:
+				return True
+			self.read_value()
+			if self.current() == ',':
+				self.skip()
+		return False
+
+	def read_items(self):
+		self.expect('[')
+		if self.current() == ']':
+			self.skip()
+			return
+		while True:
+			yield self.read_value()
+			char = self.current()
+			self.skip()
+			if char == ']':
+				return
+			if char != ',':
+				raise ValueError('Expected \',\' or \']\' but found ' + repr(char))
+
+#
+# querying functions
+#
+
+def is_url(filename):
+	return filename.startswith('http://') or filename.startswith('https://')
+
+#
+# reading functions
+#
+
+def read_json_array(filename, key = None):
+
+	# yield the items of a json array one at a time, where
+	# the array is either the whole file or the named key
+	# of the top level object
+	#
+	with opener(filename, 'r') as file:
+		stream = JsonStream(file)
+		if key and not stream.find_key(key):
+			raise KeyError(key)
+		yield from stream.read_items()
+
+def read_csv(filename):
+
+	# yield the rows of a csv file as records keyed by the
+	# names in its header row
+	#
+	with opener(filename, 'r') as csvfile:
+		reader = csv.reader(csvfile)
+		header = next(reader, None)
+		if header is None:
+			return
+		record = get_record_type(header)
+		for row in reader:
+			yield record(row)
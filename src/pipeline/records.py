@@ -0,0 +1,73 @@
+################################################################################
+#                                                                              #
+#                                  records.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for compact observation records.                    #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+#
+# globals
+#
+
+record_types = {}
+
+#
+# record functions
+#
+
+def get_record_type(names):
+	names = tuple(names)
+	if names in record_types:
+		return record_types[names]
+
+	# records are tuples that share a single column index
+	# so that each row does not need its own dict of keys
+	#
+	index = {name: count for count, name in enumerate(names)}
+	get = tuple.__getitem__
+
+	class Record(tuple):
+		__slots__ = ()
+		columns = index
+
+		def __getitem__(self, key):
+			if isinstance(key, str):
+				return get(self, index[key])
+			return get(self, key)
+
+		def __reduce__(self):
+
+			# pickle the shared names so that records can be
+			# sent to worker processes in batches
+			#
+			return (get_record, (names, tuple(self)))
+
+	record_types[names] = Record
+	return Record
+
+def get_record(names, values):
+	return get_record_type(names)(values)
+
+def project(value, fields):
+
+	# keep only the named fields of a json object, and the
+	# named fields of the objects within it, as records, but
+	# keep objects that are missing fields as they are so
+	# that reading them fails in the same way
+	#
+	if not isinstance(value, dict):
+		return value
+	for name in fields:
+		if name not in value:
+			return value
+	return get_record_type(fields)([value[name] if subfields is None else project(value[name], subfields) for name, subfields in fields.items()])
@@ -0,0 +1,78 @@
+################################################################################
+#                                                                              #
+#                                  runner.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for running several data sources at once.           #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .plans import read_columns
+from .shards import write_csv
+from .deltas import DeltaIndex
+from .duplicates import DuplicateIndex, duplicate_column
+from .sources import sources, get_input_path, get_output_path, get_index_path, load_parser
+
+#
+# running functions
+#
+
+def run_source(executor, name, workers, directory, delta = False, duplicates = None):
+	parser = load_parser(name)
+	columns = read_columns(parser.schema)
+	if duplicates and not duplicates.drop:
+		columns.append(duplicate_column)
+	start = time.perf_counter()
+	result = {
+		'source': name,
+		'rows': 0,
+		'seconds': 0,
+		'error': None
+	}
+	try:
+		outfilename = get_output_path(name, directory)
+		index = DeltaIndex(get_index_path(name, directory), outfilename) if delta else None
+		result['rows'] = write_csv(name, columns, get_input_path(name, directory), outfilename, workers, executor, index, duplicates = duplicates.get_source(name) if duplicates else None)
+		if index:
+			index.commit()
+	except Exception as exception:
+		result['error'] = str(exception)
+	result['seconds'] = time.perf_counter() - start
+	return result
+
+def run_sources(names, workers, directory, delta = False, duplicates = None, drop = False):
+
+	# load parsers before starting threads so that no two
+	# threads import the same parser at the same time
+	#
+	for name in names:
+		load_parser(name)
+
+	# each source is driven by its own thread, and all of
+	# their shards are transformed by one shared pool
+	#
+	# sources that share one index of duplicates are instead
+	# run one at a time in the order of the registry, so that
+	# each sighting is owned by the same source every run
+	#
+	index = DuplicateIndex(duplicates, drop) if duplicates else None
+	try:
+		with ProcessPoolExecutor(workers) as executor:
+			if index:
+				return [run_source(executor, name, workers, directory, delta, index) for name in sorted(names, key=list(sources).index)]
+			with ThreadPoolExecutor(len(names)) as threads:
+				futures = [threads.submit(run_source, executor, name, workers, directory, delta, index) for name in names]
+				return [future.result() for future in futures]
+	finally:
+		if index:
+			index.close()
@@ -0,0 +1,248 @@
+################################################################################
+#                                                                              #
+#                                  shards.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for transforming observations in parallel.          #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import io
+import os
+import csv
+import itertools
+import collections
+import contextlib
+from .records import get_record_type
+from .plans import read_schema, compile_plan
+from .writers import get_format, get_writer, is_line_output
+from .compression import get_compression
+from .sources import sources, load_parser
+
+#
+# globals
+#
+
+block_size = 1 << 20
+shards_per_worker = 4
+slice_size = 1000
+plans = {}
+
+#
+# range functions
+#
+
+def get_csv_ranges(filename, number):
+
+	# split a csv file into byte ranges that end on record
+	# boundaries, which are newlines outside of quotes
+	#
+	size = os.path.getsize(filename)
+	step = max(size // number, 1)
+	boundaries = []
+	target = 0
+	offset = 0
+	quotes = 0
+	with open(filename, 'rb') as file:
+		while True:
+			block = file.read(block_size)
+			if not block:
+				break
+			position = 0
+			while target < offset + len(block):
+				index = block.find(b'\n', max(target - offset, position))
+				while index != -1:
+					quotes += block.count(b'"', position, index)
+					position = index
+					if quotes % 2 == 0:
+						break
+					index = block.find(b'\n', index + 1)
+				if index == -1:
+					break
+				boundaries.append(offset + index + 1)
+				target = offset + index + 1 + step
+			quotes += block.count(b'"', position)
+			offset += len(block)
+
+	# the first range holds the header row
+	#
+	boundaries = [0] + boundaries + [size]
+	ranges = []
+	for start, end in zip(boundaries, boundaries[1:]):
+		if end > start:
+			ranges.append((start, end))
+	return ranges
+
+def read_range(filename, start, end):
+	with open(filename, 'rb') as file:
+		file.seek(start)
+		data = file.read(end - start)
+	return io.TextIOWrapper(io.BytesIO(data))
+
+#
+# worker functions
+#
+
+def get_parser(name, columns):
+
+	# parsers are loaded and compiled once per worker process
+	# and per source, so one pool can serve several sources
+	#
+	key = (name, tuple(columns))
+	if key not in plans:
+		parser = load_parser(name)
+		plans[key] = compile_plan(columns, parser.extractors, key = sources[name]['id'], schema = read_schema(parser.schema))
+	parser = load_parser(name)
+	parser.columns = columns
+	parser.plan = plans[key]
+	return parser
+
+def transform(name, columns, observations, count, text = True):
+	parser = get_parser(name, columns)
+
+	# set the row counter that sequential object ids start from
+	#
+	parser.count = count
+
+	# rows for formats other than csv, or that are checked
+	# for duplicates, are returned as values so that they can
+	# be written by the writer in the main process
+	#
+	if not text:
+		rows = [parser.get_observation_values(observation) for observation in observations]
+		return rows, len(rows)
+
+	file = io.StringIO(newline='')
+	writer = csv.writer(file)
+	rows = 0
+	for observation in observations:
+		writer.writerow(parser.get_observation_values(observation))
+		rows += 1
+	return file.getvalue(), rows
+
+def count_range(filename, start, end):
+	return sum(1 for row in csv.reader(read_range(filename, start, end)))
+
+def transform_range(name, columns, filename, start, end, header, count, text = True):
+	record = get_record_type(header)
+	rows = csv.reader(read_range(filename, start, end))
+	return transform(name, columns, (record(row) for row in rows), count, text)
+
+def transform_slice(name, columns, observations, count, text = True):
+	return transform(name, columns, observations, count, text)
+
+#
+# job functions
+#
+
+def get_range_jobs(executor, name, columns, filename, number, text = True):
+	ranges = get_csv_ranges(filename, number)
+	if not ranges:
+		return
+
+	# count the records in each range so that every range
+	# knows the row number that it starts from
+	#
+	header = next(csv.reader(read_range(filename, *ranges[0])), [])
+	ranges = ranges[1:]
+	counts = [executor.submit(count_range, filename, start, end) for start, end in ranges]
+	count = 0
+	for (start, end), number in zip(ranges, counts):
+		yield (transform_range, name, columns, filename, start, end, header, count, text)
+		count += number.result()
+
+def get_slice_jobs(name, columns, observations, count = 0, text = True, ids = None):
+	observations = iter(observations)
+	while True:
+		observations_slice = list(itertools.islice(observations, slice_size))
+		if not observations_slice:
+			return
+
+		# keep the id of the last observation of each slice in
+		# the order that the slices are submitted
+		#
+		if ids is not None:
+			ids.append(observations_slice[-1][sources[name]['id']])
+		yield (transform_slice, name, columns, observations_slice, count, text)
+		count += len(observations_slice)
+
+def get_results(executor, jobs, window):
+
+	# keep a bounded number of jobs in flight and yield their
+	# results in the order that they were submitted
+	#
+	pending = collections.deque()
+	for job in jobs:
+		pending.append(executor.submit(*job))
+		if len(pending) >= window:
+			yield pending.popleft().result()
+	while pending:
+		yield pending.popleft().result()
+
+#
+# output functions
+#
+
+def write_csv(name, columns, filename, outfilename, workers, executor = None, index = None, observations = None, appending = False, format = None, duplicates = None, cursor = None):
+	parser = load_parser(name)
+	format = get_format(outfilename, format)
+	text = format == 'csv' and not duplicates
+
+	# split plain csv files by byte ranges and everything
+	# else, including compressed files that can not be
+	# seeked into, into slices of the observations that are read,
+	# where only new or changed observations are kept when
+	# appending to the output of a previous run
+	#
+	# process pools are only imported when they are needed,
+	# since importing them takes longer than a small run
+	#
+	if not executor:
+		from concurrent.futures import ProcessPoolExecutor
+	with ProcessPoolExecutor(workers) if not executor else contextlib.nullcontext(executor) as executor:
+		checkpoints = None
+		if observations is None and not index and filename.endswith('.csv') and not get_compression(filename):
+			jobs = get_range_jobs(executor, name, columns, filename, workers * shards_per_worker, text)
+		else:
+			if observations is None:
+				observations = parser.read_observations(filename)
+			count = 0
+			if index:
+				count = index.count
+				observations = index.select(observations, sources[name]['id'])
+
+			# save the resume cursor as each slice is written to
+			# outputs that are appended to a line at a time, and
+			# otherwise once the whole output has been written
+			#
+			if cursor and is_line_output(outfilename, format):
+				checkpoints = collections.deque()
+			jobs = get_slice_jobs(name, columns, observations, count, text, checkpoints)
+
+		appending = appending or (index and index.appending)
+		constants = get_parser(name, columns).plan.constants
+		with get_writer(outfilename, columns, format, constants, appending, duplicates) as writer:
+
+			# add rows in input order
+			#
+			count = 0
+			for results, rows in get_results(executor, jobs, workers * 2):
+				if text:
+					writer.write_text(results)
+				else:
+					for row in results:
+						writer.write(row)
+				count += rows
+				if checkpoints is not None:
+					writer.flush()
+					cursor.save(checkpoints.popleft())
+
+	return count
@@ -0,0 +1,115 @@
+################################################################################
+#                                                                              #
+#                                  sources.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for locating the data source parsers.               #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import importlib.util
+
+#
+# globals
+#
+
+current = os.path.dirname(os.path.abspath(__file__))
+data = os.path.normpath(os.path.join(current, '..', '..', 'data'))
+parsers = {}
+
+#
+# source registry
+#
+
+# the fields of each source name the output columns that
+# play each role in stages that combine sources, where a
+# role is None if the source has no such column
+#
+sources = {
+	'habitat-mapper': {
+		'input': 'input/input.csv',
+		'output': 'output/output.csv',
+		'id': 'mhm_MosquitoHabitatMapperId',
+		'fields': {
+			'latitude': 'latitude',
+			'longitude': 'longitude',
+			'time': 'phenomenonTime',
+			'species': None,
+			'grade': 'qualityGrade'
+		}
+	},
+	'inaturalist': {
+		'input': 'input/input.json',
+		'output': 'output/output.csv',
+		'id': 'id',
+		'fields': {
+			'latitude': 'latitude',
+			'longitude': 'longitude',
+			'time': 'observationResCatObsPheTime',
+			'species': 'Indentified by Human',
+			'grade': 'omPrcoessResQuaQuaGrade'
+		}
+	},
+	'land-cover': {
+		'input': 'input/input.csv',
+		'output': 'output/output.csv',
+		'id': 'lc_LandCoverId',
+		'fields': {
+			'latitude': 'latitude',
+			'longitude': 'longitude',
+			'time': 'phenomenonTime',
+			'species': None,
+			'grade': 'qualityGrade'
+		}
+	},
+	'mosquito-alert': {
+		'input': 'input/input.json',
+		'output': 'output/output.csv',
+		'id': 'version_UUID',
+		'fields': {
+			'latitude': 'latitude',
+			'longitude': 'longitude',
+			'time': 'observationResCatObsPheTime',
+			'species': 'Indentified by Human',
+			'grade': 'omPrcoessResQuaQuaGrade'
+		}
+	}
+}
+names = list(sources)
+
+#
+# source functions
+#
+
+def get_parser_path(name):
+	return os.path.normpath(os.path.join(current, '..', name, 'parser.py'))
+
+def get_input_path(name, directory = data):
+	return os.path.join(directory, name, sources[name]['input'])
+
+def get_output_path(name, directory = data):
+	return os.path.join(directory, name, sources[name]['output'])
+
+def get_index_path(name, directory = data):
+	return get_output_path(name, directory) + '.index'
+
+def load_parser(name):
+
+	# parser scripts live in directories that are not valid
+	# package names, so load them by path, once per process
+	#
+	if name not in parsers:
+		spec = importlib.util.spec_from_file_location(name.replace('-', '_') + '_parser', get_parser_path(name))
+		module = importlib.util.module_from_spec(spec)
+		spec.loader.exec_module(module)
+		parsers[name] = module
+	return parsers[name]
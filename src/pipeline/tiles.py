@@ -0,0 +1,166 @@
+################################################################################
+#                                                                              #
+#                                   tiles.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for counting observations in map tiles.             #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import math
+import sqlite3
+from .readers import read_csv
+from .sources import sources, get_output_path
+
+#
+# globals
+#
+
+max_zoom = 14
+spill_size = 1 << 18
+max_latitude = 85.0511287798
+
+#
+# tile functions
+#
+
+def get_tile(latitude, longitude, zoom):
+
+	# find the web mercator tile that holds a point, where
+	# points beyond the poles of the projection are clamped
+	#
+	latitude = max(-max_latitude, min(max_latitude, latitude))
+	size = 1 << zoom
+	x = int((longitude + 180) / 360 * size)
+	y = int((1 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2 * size)
+	return min(max(x, 0), size - 1), min(max(y, 0), size - 1)
+
+def to_float(value):
+
+	# coordinates that are blank or are not finite, such as
+	# nan or inf, have no tile
+	#
+	try:
+		value = float(value)
+	except (TypeError, ValueError):
+		return None
+	return value if math.isfinite(value) else None
+
+#
+# tile pyramid class
+#
+
+class TilePyramid:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, zoom = max_zoom):
+		self.zoom = zoom
+		self.counts = {}
+		self.points = 0
+		self.connection = sqlite3.connect(filename, isolation_level=None)
+		self.connection.execute('PRAGMA journal_mode = WAL')
+		self.connection.execute('PRAGMA synchronous = NORMAL')
+
+		# counts are kept in a table keyed by tile, so that the
+		# counts of one tile are next to each other on disk
+		#
+		self.connection.execute('DROP TABLE IF EXISTS tiles')
+		self.connection.execute('CREATE TABLE tiles (zoom INTEGER, x INTEGER, y INTEGER, source TEXT, species TEXT, grade TEXT, count INTEGER, PRIMARY KEY (zoom, x, y, source, species, grade)) WITHOUT ROWID')
+		self.connection.execute('CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)')
+
+	#
+	# adding methods
+	#
+
+	def add(self, source, latitude, longitude, species = '', grade = ''):
+
+		# a point counts towards one tile per zoom level, and
+		# the tiles of lower levels are found from the tile of
+		# the highest level by dropping bits
+		#
+		x, y = get_tile(latitude, longitude, self.zoom)
+		for zoom in range(self.zoom, -1, -1):
+			key = (zoom, x >> (self.zoom - zoom), y >> (self.zoom - zoom), source, species, grade)
+			self.counts[key] = self.counts.get(key, 0) + 1
+		self.points += 1
+
+		# counts are added to the tile index whenever they
+		# outgrow memory
+		#
+		if len(self.counts) >= spill_size:
+			self.spill()
+
+	def spill(self):
+		self.connection.execute('BEGIN')
+		self.connection.executemany('INSERT INTO tiles VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO UPDATE SET count = count + excluded.count', (key + (count,) for key, count in sorted(self.counts.items())))
+		self.connection.execute('COMMIT')
+		self.counts = {}
+
+	#
+	# closing methods
+	#
+
+	def close(self):
+		self.spill()
+		self.connection.executemany('INSERT OR REPLACE INTO metadata VALUES (?, ?)', [
+			('min_zoom', '0'),
+			('max_zoom', str(self.zoom)),
+			('points', str(self.points)),
+			('scheme', 'xyz')
+		])
+		self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+		self.connection.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+#
+# reading functions
+#
+
+def read_points(name, filename):
+
+	# yield the location, species and grade of the rows of
+	# an output file, skipping rows that have no finite location
+	#
+	fields = sources[name]['fields']
+	for row in read_csv(filename):
+		latitude = to_float(row[fields['latitude']])
+		longitude = to_float(row[fields['longitude']])
+		if latitude is None or longitude is None:
+			continue
+		species = row[fields['species']] if fields['species'] else ''
+		grade = row[fields['grade']] if fields['grade'] else ''
+		yield latitude, longitude, species, grade
+
+#
+# output functions
+#
+
+def write_tiles(names, directory, filename, zoom = max_zoom):
+
+	# count the points of all sources in one pass over their
+	# output files
+	#
+	counts = {}
+	with TilePyramid(filename, zoom) as pyramid:
+		for name in names:
+			counts[name] = 0
+			for latitude, longitude, species, grade in read_points(name, get_output_path(name, directory)):
+				pyramid.add(name, latitude, longitude, species, grade)
+				counts[name] += 1
+	return counts
@@ -0,0 +1,506 @@
+################################################################################
+#                                                                              #
+#                                  writers.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for writing transformed rows to output files.       #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import csv
+import json
+from .plans import id_column
+from .compression import open_file, strip_suffix, get_suffix_compression
+
+#
+# globals
+#
+
+batch_size = 65536
+transaction_size = 1 << 20
+
+# columns of database tables that are indexed once they
+# have been loaded
+#
+indexes = [
+	['OBJECTID'],
+	['latitude', 'longitude']
+]
+
+# columns that are written with native types by columnar
+# and geojson writers rather than as strings
+#
+numeric_types = {
+	'OBJECTID': 'int64',
+	'latitude': 'float64',
+	'longitude': 'float64',
+	'imageStatus': 'int8',
+	'observationImaImaStatus': 'int8',
+	'validationStatus': 'int8',
+	'omProcessResQuaValStatus': 'int8',
+	'omPrcoessResQuaValStatus': 'int8',
+	'omProcessResQuaValResult': 'int8',
+	'omPrcoessResQuaValResult': 'int8'
+}
+
+#
+# conversion functions
+#
+
+def to_integer(value):
+	if value is None or value == '':
+		return None
+	try:
+		return int(value)
+	except ValueError:
+		try:
+			return int(float(value))
+		except ValueError:
+			return None
+
+def to_float(value):
+	if value is None or value == '':
+		return None
+	try:
+		return float(value)
+	except ValueError:
+		return None
+
+def get_converter(column):
+	if column not in numeric_types:
+		return to_string
+	return to_float if numeric_types[column].startswith('float') else to_integer
+
+def to_string(value):
+	if value is None or isinstance(value, str):
+		return value
+	return str(value)
+
+def get_sql_type(column):
+	if column not in numeric_types:
+		return 'TEXT'
+	return 'REAL' if numeric_types[column].startswith('float') else 'INTEGER'
+
+def quote(name):
+	return '"' + name.replace('"', '""') + '"'
+
+def get_unique_names(columns):
+
+	# columnar files can not be read back with repeated field
+	# names, so repeats are numbered the way pandas numbers
+	# repeated csv headers
+	#
+	names = []
+	counts = {}
+	for column in columns:
+		name = column
+		while name in counts:
+			counts[column] += 1
+			name = column + '.' + str(counts[column])
+		counts[name] = 0
+		names.append(name)
+	return names
+
+#
+# csv writer class
+#
+
+class CsvWriter:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, columns, constants = (), appending = False):
+		self.file = open_file(filename, 'a' if appending else 'w', newline='')
+		self.writer = csv.writer(self.file)
+
+		# add headers
+		#
+		if not appending:
+			self.writer.writerow(columns)
+
+	#
+	# writing methods
+	#
+
+	def write(self, row):
+		self.writer.writerow(row)
+
+	def write_text(self, text):
+		self.file.write(text)
+
+	def flush(self):
+		self.file.flush()
+
+	def close(self):
+		self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+#
+# columnar writer class
+#
+
+class ColumnarWriter:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, columns, constants = (), appending = False):
+		try:
+			import pyarrow
+		except ImportError:
+			raise ImportError('Writing ' + self.format + ' files requires the pyarrow package (pip install pyarrow)')
+		if appending:
+			raise ValueError('Appending is not supported for ' + self.format + ' files')
+		if get_suffix_compression(filename):
+			raise ValueError('Compressed ' + self.format + ' files are not supported since ' + self.format + ' files are compressed internally')
+
+		self.pyarrow = pyarrow
+		self.filename = filename
+		self.columns = columns
+		self.batch = [[] for column in columns]
+		self.count = 0
+
+		# constant columns repeat one value, so they are stored
+		# as dictionaries, and known numeric columns are stored
+		# with native types
+		#
+		fields = []
+		self.converters = []
+		for column, name in zip(columns, get_unique_names(columns)):
+			if column in numeric_types:
+				fields.append(pyarrow.field(name, getattr(pyarrow, numeric_types[column])()))
+			elif column in constants:
+				fields.append(pyarrow.field(name, pyarrow.dictionary(pyarrow.int32(), pyarrow.string())))
+			else:
+				fields.append(pyarrow.field(name, pyarrow.string()))
+			self.converters.append(get_converter(column))
+		self.schema = pyarrow.schema(fields)
+		self.writer = self.open()
+
+	#
+	# writing methods
+	#
+
+	def write(self, row):
+		for values, value in zip(self.batch, row):
+			values.append(value)
+		self.count += 1
+		if self.count >= batch_size:
+			self.flush()
+
+	def flush(self):
+
+		# write the buffered rows as one row group or batch
+		#
+		if not self.count:
+			return
+		arrays = []
+		for values, converter, field in zip(self.batch, self.converters, self.schema):
+			values = [converter(value) for value in values]
+			if self.pyarrow.types.is_dictionary(field.type):
+				arrays.append(self.pyarrow.array(values, self.pyarrow.string()).dictionary_encode())
+			else:
+				arrays.append(self.pyarrow.array(values, field.type))
+		self.writer.write_table(self.pyarrow.Table.from_arrays(arrays, schema=self.schema))
+		self.batch = [[] for column in self.columns]
+		self.count = 0
+
+	def close(self):
+		self.flush()
+		self.writer.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+class ParquetWriter(ColumnarWriter):
+	format = 'parquet'
+
+	def open(self):
+		import pyarrow.parquet
+		return pyarrow.parquet.ParquetWriter(self.filename, self.schema, compression='zstd')
+
+class ArrowWriter(ColumnarWriter):
+	format = 'arrow'
+
+	def open(self):
+		import pyarrow.ipc
+		return pyarrow.ipc.new_file(self.filename, self.schema)
+
+#
+# geojson writer class
+#
+
+class GeoJsonWriter:
+	format = 'geojson'
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, columns, constants = (), appending = False):
+		if appending and self.format == 'geojson':
+			raise ValueError('Appending is not supported for geojson files, use ndjson instead')
+
+		self.file = open_file(filename, 'a' if appending else 'w')
+		self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+		self.count = 0
+
+		# every column other than the coordinates becomes a
+		# property of each feature
+		#
+		self.latitude = columns.index('latitude') if 'latitude' in columns else None
+		self.longitude = columns.index('longitude') if 'longitude' in columns else None
+		self.properties = []
+		for count, (column, name) in enumerate(zip(columns, get_unique_names(columns))):
+			if count not in (self.latitude, self.longitude):
+				self.properties.append((count, name, get_converter(column)))
+
+		# features are streamed between the opening and closing
+		# of the collection rather than built up in memory
+		#
+		if self.format == 'geojson':
+			self.file.write('{"type":"FeatureCollection","features":[\n')
+
+	#
+	# getting methods
+	#
+
+	def get_geometry(self, row):
+		if self.latitude is None or self.longitude is None:
+			return None
+		latitude = to_float(row[self.latitude])
+		longitude = to_float(row[self.longitude])
+		if latitude is None or longitude is None:
+			return None
+		return {
+			'type': 'Point',
+			'coordinates': [longitude, latitude]
+		}
+
+	def get_feature(self, row):
+		return {
+			'type': 'Feature',
+			'geometry': self.get_geometry(row),
+			'properties': {name: convert(row[count]) for count, name, convert in self.properties}
+		}
+
+	#
+	# writing methods
+	#
+
+	def write(self, row):
+		text = self.encoder.encode(self.get_feature(row))
+		if self.format == 'geojson' and self.count:
+			self.file.write(',\n' + text)
+		else:
+			self.file.write(text if self.format == 'geojson' else text + '\n')
+		self.count += 1
+
+	def flush(self):
+		self.file.flush()
+
+	def close(self):
+		if self.format == 'geojson':
+			self.file.write('\n]}\n')
+		self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+class NdjsonWriter(GeoJsonWriter):
+	format = 'ndjson'
+
+#
+# sqlite writer class
+#
+
+class SqliteWriter:
+	format = 'sqlite'
+	table = 'observations'
+
+	#
+	# constructor
+	#
+
+	def __init__(self, filename, columns, constants = (), appending = False):
+		if get_suffix_compression(filename):
+			raise ValueError('Compressed sqlite files are not supported')
+
+		# transactions are begun and committed explicitly, and
+		# sqlite is only imported by runs that write databases
+		#
+		import sqlite3
+		self.connection = sqlite3.connect(filename, isolation_level=None)
+		self.connection.execute('PRAGMA journal_mode = WAL')
+		self.connection.execute('PRAGMA synchronous = NORMAL')
+		self.columns = columns
+		self.names = get_unique_names(columns)
+		self.converters = [get_converter(column) for column in columns]
+		self.keyed = id_column in columns
+		self.batch = []
+		self.count = 0
+
+		# a full refresh replaces the table, while appending
+		# updates the rows of observations that have changed
+		#
+		if not appending:
+			self.connection.execute('DROP TABLE IF EXISTS ' + quote(self.table))
+		self.created = not self.get_exists()
+		self.connection.execute('CREATE TABLE IF NOT EXISTS ' + quote(self.table) + ' (' + ', '.join(quote(name) + ' ' + get_sql_type(column) for column, name in zip(columns, self.names)) + ')')
+
+		# indexes are only created after a bulk load, since
+		# that is much faster than updating them for every
+		# row, except that updates need the unique index of
+		# the key to find the rows that they replace
+		#
+		if self.keyed and not self.created:
+			self.create_key_index()
+		self.statement = self.get_statement(upserting = self.keyed and not self.created)
+		self.connection.execute('BEGIN')
+
+	#
+	# querying methods
+	#
+
+	def get_exists(self):
+		return self.connection.execute('SELECT 1 FROM sqlite_master WHERE type = \'table\' AND name = ?', (self.table,)).fetchone() is not None
+
+	def get_statement(self, upserting = False):
+		statement = 'INSERT INTO ' + quote(self.table) + ' (' + ', '.join(quote(name) for name in self.names) + ') VALUES (' + ', '.join('?' for name in self.names) + ')'
+		if upserting:
+			statement += ' ON CONFLICT (' + quote(id_column) + ') DO UPDATE SET ' + ', '.join(quote(name) + ' = excluded.' + quote(name) for name in self.names if name != id_column)
+		return statement
+
+	#
+	# indexing methods
+	#
+
+	def create_key_index(self):
+		self.connection.execute('CREATE UNIQUE INDEX IF NOT EXISTS ' + quote(self.table + '_' + id_column) + ' ON ' + quote(self.table) + ' (' + quote(id_column) + ')')
+
+	def create_indexes(self):
+
+		# keep the last row written for each observation, as an
+		# upsert would have, before the key is made unique
+		#
+		if self.keyed:
+			self.connection.execute('DELETE FROM ' + quote(self.table) + ' WHERE rowid NOT IN (SELECT max(rowid) FROM ' + quote(self.table) + ' GROUP BY ' + quote(id_column) + ')')
+			self.create_key_index()
+		for columns in indexes:
+			if all(column in self.names for column in columns):
+				self.connection.execute('CREATE INDEX IF NOT EXISTS ' + quote(self.table + '_' + '_'.join(columns)) + ' ON ' + quote(self.table) + ' (' + ', '.join(quote(column) for column in columns) + ')')
+
+	#
+	# writing methods
+	#
+
+	def write(self, row):
+		self.batch.append([convert(value) for convert, value in zip(self.converters, row)])
+		if len(self.batch) >= batch_size:
+			self.flush()
+
+	def flush(self):
+		if not self.batch:
+			return
+		self.connection.executemany(self.statement, self.batch)
+		self.count += len(self.batch)
+		self.batch = []
+
+		# commit in large transactions to bound the size of
+		# the write ahead log
+		#
+		if self.count >= transaction_size:
+			self.connection.execute('COMMIT')
+			self.connection.execute('BEGIN')
+			self.count = 0
+
+	def close(self):
+		self.flush()
+		if self.created:
+			self.create_indexes()
+		self.connection.execute('COMMIT')
+		self.connection.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+#
+# writer functions
+#
+
+writers = {
+	'csv': CsvWriter,
+	'parquet': ParquetWriter,
+	'arrow': ArrowWriter,
+	'geojson': GeoJsonWriter,
+	'ndjson': NdjsonWriter,
+	'sqlite': SqliteWriter
+}
+
+line_formats = ['csv', 'ndjson']
+
+extensions = {
+	'.parquet': 'parquet',
+	'.arrow': 'arrow',
+	'.feather': 'arrow',
+	'.geojson': 'geojson',
+	'.ndjson': 'ndjson',
+	'.geojsonl': 'ndjson',
+	'.geojsons': 'ndjson',
+	'.sqlite': 'sqlite',
+	'.sqlite3': 'sqlite',
+	'.db': 'sqlite'
+}
+
+def get_format(filename, format = None):
+	if format:
+		return format
+	return extensions.get(os.path.splitext(strip_suffix(filename))[1].lower(), 'csv')
+
+def is_line_output(filename, format = None):
+
+	# outputs that are written a line at a time hold every
+	# row that has been flushed, and can be appended to
+	#
+	return get_format(filename, format) in line_formats and not get_suffix_compression(filename)
+
+def get_writer(filename, columns, format = None, constants = (), appending = False, duplicates = None):
+	writer = writers[get_format(filename, format)](filename, columns, constants, appending)
+
+	# check rows against the observations of other sources
+	# before they are written
+	#
+	if duplicates:
+		writer = duplicates.get_writer(writer, columns)
+	return writer
+
+def write_rows(filename, columns, rows, format = None, constants = (), appending = False):
+	with get_writer(filename, columns, format, constants, appending) as writer:
+		for row in rows:
+			writer.write(row)
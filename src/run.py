@@ -0,0 +1,76 @@
+################################################################################
+#                                                                              #
+#                                    run.py                                    #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for running the data source parsers.                #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import time
+import argparse
+from pipeline.sources import names, data
+from pipeline.runner import run_sources
+from pipeline.tiles import write_tiles
+
+#
+# output functions
+#
+
+def print_results(results, seconds):
+	print('source'.ljust(16), 'rows'.rjust(12), 'seconds'.rjust(10), 'rows/s'.rjust(12))
+	for result in results:
+		if result['error']:
+			print(result['source'].ljust(16), 'error: ' + result['error'])
+		else:
+			rate = result['rows'] / result['seconds'] if result['seconds'] else 0
+			print(result['source'].ljust(16), str(result['rows']).rjust(12), ('%.2f' % result['seconds']).rjust(10), str(int(rate)).rjust(12))
+	print('total'.ljust(16), str(sum(result['rows'] for result in results)).rjust(12), ('%.2f' % seconds).rjust(10))
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 run.py [<source-name> ...] [options]')
+	parser.add_argument('sources', nargs='*', metavar='source-name', help='sources to run: ' + ', '.join(names))
+	parser.add_argument('--data', default=data, help='data directory holding the input and output files')
+	parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of worker processes shared by all sources')
+	parser.add_argument('--delta', action='store_true', help='only transform new or changed observations and append them to the outputs')
+	parser.add_argument('--duplicates', metavar='duplicate-index-file-name', help='flag observations that other sources have already reported')
+	parser.add_argument('--drop-duplicates', action='store_true', help='drop observations that other sources have already reported rather than flagging them')
+	parser.add_argument('--tiles', metavar='tile-index-file-name', help='count the observations of the outputs in map tiles')
+	arguments = parser.parse_args()
+	for name in arguments.sources:
+		if name not in names:
+			parser.error('unknown source: ' + name)
+
+	# run sources concurrently
+	#
+	start = time.perf_counter()
+	results = run_sources(arguments.sources or names, arguments.workers, arguments.data, arguments.delta, arguments.duplicates, arguments.drop_duplicates)
+	print_results(results, time.perf_counter() - start)
+
+	# report failure if any source failed
+	#
+	if any(result['error'] for result in results):
+		sys.exit(1)
+
+	# count observations in map tiles once all of the outputs
+	# have been written
+	#
+	if arguments.tiles:
+		write_tiles(arguments.sources or names, arguments.data, arguments.tiles)
@@ -0,0 +1,48 @@
+################################################################################
+#                                                                              #
+#                                   tiles.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a script for counting observations in map tiles.              #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import time
+import argparse
+from pipeline.sources import names, data
+from pipeline.tiles import max_zoom, write_tiles
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 tiles.py <tile-index-file-name> [<source-name> ...] [options]')
+	parser.add_argument('filename', metavar='tile-index-file-name')
+	parser.add_argument('sources', nargs='*', metavar='source-name', help='sources to count: ' + ', '.join(names))
+	parser.add_argument('--data', default=data, help='data directory holding the output files')
+	parser.add_argument('--zoom', type=int, default=max_zoom, help='highest zoom level to count tiles at')
+	arguments = parser.parse_args()
+	for name in arguments.sources:
+		if name not in names:
+			parser.error('unknown source: ' + name)
+
+	# count points of every source in tiles
+	#
+	start = time.perf_counter()
+	counts = write_tiles(arguments.sources or names, arguments.data, arguments.filename, arguments.zoom)
+	print('source'.ljust(16), 'points'.rjust(12))
+	for name, count in counts.items():
+		print(name.ljust(16), str(count).rjust(12))
+	print('total'.ljust(16), str(sum(counts.values())).rjust(12), ('%.2f' % (time.perf_counter() - start)).rjust(10))
@@ -0,0 +1,151 @@
+################################################################################
+#                                                                              #
+#                                 compiler.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for running a compiled Wrangle recipe.              #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import csv
+import json
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from engine import read_transforms
+from utilities.engine import get_table
+from utilities.compiler import load_recipe, cache_directory
+from utilities.optimizer import Optimizer
+from pipeline.compression import open_file, strip_suffix
+from pipeline.writers import get_writer
+
+#
+# globals
+#
+
+current = os.path.dirname(os.path.abspath(__file__))
+
+#
+# reading functions
+#
+
+def read_records(filename):
+
+	# yield the names of the input columns followed by the
+	# records, where json files are a single column of objects
+	#
+	if strip_suffix(filename).endswith('.json'):
+		with open_file(filename, 'r') as file:
+			data = json.load(file)
+		yield ['column1']
+		for item in (data if isinstance(data, list) else [data]):
+			yield [item]
+	else:
+		with open_file(filename, 'r', newline='') as file:
+			yield from csv.reader(file)
+
+def read_columns(filename):
+	with open_file(filename, 'r', newline='') as file:
+		rows = list(csv.reader(file))
+	return get_table(rows[1:], rows[0] if rows else []).columns
+
+#
+# checking functions
+#
+
+def check(source, filename, outfilename):
+
+	# run the parser of the source on the same input and
+	# compare the columns of the two outputs that have the
+	# same name, row by row
+	#
+	with tempfile.TemporaryDirectory() as directory:
+		expected_filename = os.path.join(directory, 'expected.csv')
+		subprocess.run([sys.executable, os.path.join(current, '..', source, 'parser.py'), filename, expected_filename], check=True)
+		expected = read_columns(expected_filename)
+	actual = read_columns(outfilename)
+
+	matching = 0
+	for name, column in actual.items():
+		if name not in expected:
+			continue
+		same = sum(1 for value, expected_value in zip(column, expected[name]) if value == expected_value)
+		total = max(len(column), len(expected[name]))
+		if same == total:
+			matching += 1
+			continue
+		for value, expected_value in zip(column, expected[name]):
+			if value != expected_value:
+				break
+		print(name + ': ' + str(same) + ' of ' + str(total) + ' rows match, recipe ' + repr(value) + ' != parser ' + repr(expected_value))
+
+	print(str(matching) + ' of ' + str(len([name for name in actual if name in expected])) + ' shared columns match')
+	print('Only in recipe: ' + ', '.join(name for name in actual if name not in expected))
+	print('Only in parser: ' + ', '.join(name for name in expected if name not in actual))
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	parser = argparse.ArgumentParser(usage='python3 compiler.py <recipe-file-name> <input-file-name> <output-file-name> [options]')
+	parser.add_argument('recipe', metavar='recipe-file-name')
+	parser.add_argument('filename', metavar='input-file-name')
+	parser.add_argument('outfilename', metavar='output-file-name')
+	parser.add_argument('--cache', metavar='directory', default=cache_directory, help='directory to keep compiled recipes in')
+	parser.add_argument('--optimize', action='store_true', help='optimize the recipe before compiling it')
+	parser.add_argument('--check', metavar='source', help='compare the csv output with the output of the parser of a source')
+	arguments = parser.parse_args()
+
+	# compile the recipe for the columns of the input file,
+	# or load it if it has been compiled before
+	#
+	transforms = read_transforms(arguments.recipe)
+	records = read_records(arguments.filename)
+	names = next(records, [])
+	if arguments.optimize and not any(transform['transform'] == 'header' for transform in transforms):
+		transforms = Optimizer(transforms, names).optimize()
+	elif arguments.optimize:
+		transforms = Optimizer(transforms).optimize()
+	recipe = load_recipe(transforms, names, arguments.cache)
+	transform = recipe.transform
+
+	# write output file
+	#
+	with get_writer(arguments.outfilename, recipe.columns) as writer:
+		for record in records:
+
+			# short rows are missing their last values
+			#
+			if len(record) < len(names):
+				record += [None] * (len(names) - len(record))
+			row = transform(record)
+			if row is not None:
+				writer.write(row)
+
+	# report what could not be compiled
+	#
+	for number, name in recipe.skipped:
+		print('Skipped ' + name + ' at line ' + str(number))
+	if recipe.missing:
+		print('Missing columns: ' + ', '.join(recipe.missing))
+
+	# compare with the parser of the source
+	#
+	if arguments.check:
+		check(arguments.check, arguments.filename, arguments.outfilename)
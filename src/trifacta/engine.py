@@ -0,0 +1,101 @@
+################################################################################
+#                                                                              #
+#                                  engine.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for running a Wrangle recipe on a data file.        #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import gc
+import csv
+import json
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilities.parser import Parser
+from utilities.engine import Engine, get_table, get_object_table
+from pipeline.compression import open_file, strip_suffix
+from pipeline.writers import get_writer
+
+#
+# reading functions
+#
+
+def read_transforms(filename):
+
+	# recipes are read as text or as json that has already
+	# been parsed
+	#
+	if filename.endswith('.json'):
+		with open(filename, 'r') as file:
+			return json.load(file)
+	return Parser().read(filename)
+
+def read_table(filename, header = True):
+	if strip_suffix(filename).endswith('.json'):
+		with open_file(filename, 'r') as file:
+			data = json.load(file)
+		return get_object_table(data if isinstance(data, list) else [data])
+
+	with open_file(filename, 'r', newline='') as file:
+		rows = list(csv.reader(file))
+	if header and rows:
+		return get_table(rows[1:], rows[0])
+	return get_table(rows)
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	if (len(sys.argv) < 4):
+		print("Usage: python3 engine.py <recipe-file-name> <input-file-name> <output-file-name>");
+		exit();
+
+	# get command line arguments
+	#
+	recipe = sys.argv[1]
+	filename = sys.argv[2]
+	outfilename = sys.argv[3]
+
+	# files are read and written as millions of values with
+	# no cycles between them, so they are never collected
+	#
+	gc.disable()
+
+	# read input file, where recipes with a header transform
+	# read the header row as data
+	#
+	transforms = read_transforms(recipe)
+	table = read_table(filename, not any(transform['transform'] == 'header' for transform in transforms))
+
+	# run recipe
+	#
+	engine = Engine(transforms)
+	engine.run(table)
+
+	# write output file
+	#
+	with get_writer(outfilename, table.get_names()) as writer:
+		for row in table.get_rows():
+			writer.write(row)
+
+	# report what could not be run
+	#
+	for number, name in engine.skipped:
+		print('Skipped ' + name + ' at line ' + str(number))
+	if engine.missing:
+		print('Missing columns: ' + ', '.join(sorted(engine.missing)))
\ No newline at end of file
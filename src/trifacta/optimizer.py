@@ -0,0 +1,81 @@
+################################################################################
+#                                                                              #
+#                                 optimizer.py                                 #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for optimizing a Wrangle recipe.                    #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import sys
+import csv
+import json
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from engine import read_transforms
+from utilities.optimizer import Optimizer
+from pipeline.compression import open_file, strip_suffix
+
+#
+# reading functions
+#
+
+def read_names(filename):
+
+	# json files are a single column of objects, and csv
+	# files are named by their header row
+	#
+	if strip_suffix(filename).endswith('.json'):
+		return ['column1']
+	with open_file(filename, 'r', newline='') as file:
+		return next(csv.reader(file), [])
+
+#
+# main
+#
+
+if __name__ == '__main__':
+
+	# parse arguments
+	#
+	if (len(sys.argv) < 3):
+		print("Usage: python3 optimizer.py <recipe-file-name> <output-file-name> [<input-file-name>]");
+		exit();
+
+	# get command line arguments
+	#
+	filename = sys.argv[1]
+	outfilename = sys.argv[2]
+
+	# read the columns of the input file, if there is one,
+	# so that they are known to exist
+	#
+	transforms = read_transforms(filename)
+	names = None
+	if len(sys.argv) > 3 and not any(transform['transform'] == 'header' for transform in transforms):
+		names = read_names(sys.argv[3])
+
+	# optimize recipe
+	#
+	optimizer = Optimizer(transforms, names)
+	optimized = optimizer.optimize()
+
+	# write output file
+	#
+	with open(outfilename, "w") as file:
+		file.write(json.dumps(optimized, indent=4))
+
+	# report the steps that were removed
+	#
+	print('Removed ' + str(len(transforms) - len(optimized)) + ' of ' + str(len(transforms)) + ' steps')
+	for name, count in optimizer.removed.items():
+		print('  ' + name + ': ' + str(count))
@@ -0,0 +1,355 @@
+################################################################################
+#                                                                              #
+#                                 compiler.py                                  #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for compiling a Wrangle recipe to python.           #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import os
+import re
+import json
+import hashlib
+import importlib.util
+from .engine import Engine, Table, converters, is_literal, is_column, get_literal, get_name, get_names, is_constant, get_constant, get_params, get_pattern, get_path, get_item, is_missing, is_true, to_text, to_string, to_object, to_number, compare, if_missing, join_arrays, get_now, get_year, get_month
+
+#
+# globals
+#
+
+# the version of the generated code, which is part of the
+# key of each recipe so that older code is not reused
+#
+version = 3
+cache_directory = os.path.join(os.path.expanduser('~'), '.cache', 'trifacta')
+
+#
+# generated code functions
+#
+
+def split_text(value, on):
+	if not isinstance(value, str):
+		return value, None
+	parts = value.split(on, 1)
+	return parts[0], parts[1] if len(parts) > 1 else None
+
+def split_pattern(value, pattern):
+	if not isinstance(value, str):
+		return value, None
+	parts = pattern.split(value, 1)
+	return parts[0], parts[1] if len(parts) > 1 else None
+
+def replace_text(value, text, replacement, count):
+	return value.replace(text, replacement, count) if isinstance(value, str) else value
+
+def replace_pattern(value, pattern, replacement, count):
+	return pattern.sub(replacement, value, count) if isinstance(value, str) else value
+
+# names that the generated code is run with
+#
+helpers = {function.__name__: function for function in [
+	to_text, to_string, to_object, get_item, is_missing,
+	split_text, split_pattern, replace_text, replace_pattern,
+	is_true, compare, if_missing, join_arrays, get_now, get_year, get_month
+] + list(converters.values())}
+helpers['re'] = re
+
+#
+# compiler class
+#
+
+class Compiler(Engine):
+
+	#
+	# constructor
+	#
+
+	def __init__(self, transforms):
+		Engine.__init__(self, transforms)
+		self.names = []
+		self.inputs = {}
+		self.lines = []
+		self.constants = []
+		self.count = 0
+
+	#
+	# helper methods
+	#
+
+	def assign(self, code):
+		self.count += 1
+		name = 'value' + str(self.count)
+		self.lines.append('\t' + name + ' = ' + code)
+		return name
+
+	def constant(self, code):
+		name = 'constant' + str(len(self.constants) + 1)
+		self.constants.append(name + ' = ' + code)
+		return name
+
+	def get_column(self, table, name):
+		if not self.has_column(table, name):
+			return 'None'
+		return table.columns[name]
+
+	def evaluate(self, table, value, rows = None):
+
+		# expressions are assigned so that the columns that
+		# are made from them are computed once
+		#
+		code = self.generate(table, value)
+		return self.assign(code) if isinstance(value, dict) and code != 'None' else code
+
+	def generate(self, table, value):
+		if isinstance(value, dict):
+			function = self.functions.get(value['name'])
+			if not function:
+				self.skip(value['name'])
+				return 'None'
+			return function(table, value, None)
+		if isinstance(value, list):
+			return '(' + ''.join(self.generate(table, item) + ', ' for item in value) + ')'
+		if is_column(value):
+			return self.get_column(table, get_name(value))
+		return repr(get_constant(value))
+
+	#
+	# expression functions
+	#
+
+	def choose(self, table, value, rows):
+
+		# conditional expressions only evaluate the branch that
+		# each row takes
+		#
+		condition, result, other = [self.generate(table, param) for param in get_params(value, 3)]
+		return '(' + result + ' if is_true(' + condition + ') else ' + other + ')'
+
+	def test_missing(self, table, value, rows):
+		param = get_params(value, 1)[0]
+		if isinstance(param, list):
+			return 'any(map(is_missing, ' + self.generate(table, param) + '))'
+		return 'is_missing(' + self.generate(table, param) + ')'
+
+	def fill_missing(self, table, value, rows):
+		param, default = [self.generate(table, param) for param in get_params(value, 2)]
+		return 'if_missing(' + param + ', ' + default + ')'
+
+	def merge_values(self, table, value, rows):
+		items, delimiter = get_params(value, 2)
+		delimiter = get_literal(delimiter) if is_literal(delimiter) else ''
+		return repr(delimiter) + '.join((' + ''.join('to_text(' + self.generate(table, item) + '), ' for item in (items if isinstance(items, list) else [items])) + '))'
+
+	def concat_arrays(self, table, value, rows):
+		arrays = get_params(value, 1)[0]
+		return 'join_arrays(' + self.generate(table, arrays if isinstance(arrays, list) else [arrays]) + ')'
+
+	def now(self, table, value, rows):
+
+		# the time is taken once each time the recipe is loaded
+		#
+		name = get_params(value, 1)[0]
+		name = get_literal(name) if is_literal(name) else 'UTC'
+		try:
+			get_now(name)
+		except (KeyError, ValueError):
+			self.skip('NOW ' + name)
+			return 'None'
+		return self.constant('get_now(' + repr(name) + ')')
+
+	def year(self, table, value, rows):
+		return 'get_year(' + self.generate(table, get_params(value, 1)[0]) + ')'
+
+	def month(self, table, value, rows):
+		return 'get_month(' + self.generate(table, get_params(value, 1)[0]) + ')'
+
+	def compare_values(self, table, value, rows):
+		left, right = get_params(value, 2)
+
+		# comparisons with text that is not a number are always
+		# comparisons of text
+		#
+		if is_constant(right) and to_number(get_constant(right)) is None:
+			return '(to_text(' + self.generate(table, left) + ') ' + value['name'] + ' ' + repr(to_text(get_constant(right))) + ')'
+		return 'compare(' + repr(value['name']) + ', ' + self.generate(table, left) + ', ' + self.generate(table, right) + ')'
+
+	#
+	# column transforms
+	#
+
+	def header(self, table, parameters):
+		columns = list(table.columns.items())
+		table.columns = {}
+		for name, code in columns:
+			if code in self.inputs:
+				name = self.names[self.inputs[code]] or name
+			table.columns[table.get_unique_name(name)] = code
+
+	def nest(self, table, parameters):
+		names = get_names(parameters['col'])
+		codes = [self.get_column(table, name) for name in names]
+		if parameters.get('into') == 'array':
+			code = '[' + ', '.join(codes) + ']'
+		else:
+			code = '{' + ', '.join(repr(name) + ': ' + code for name, code in zip(names, codes)) + '}'
+		table.put(get_name(parameters['as']), self.assign(code))
+
+	def unnest(self, table, parameters):
+		name = get_name(parameters['col'])
+		if not self.has_column(table, name):
+			return
+		value = self.assign('to_object(' + table.columns[name] + ')')
+		position = table.get_position(name) + 1
+		for key in get_names(parameters['keys']):
+			path = get_path(key)
+			table.put(table.get_unique_name(str(path[-1])), self.assign('get_item(' + value + ', ' + repr(path) + ')'), position)
+			position += 1
+
+	def merge(self, table, parameters):
+		names = [name for name in get_names(parameters['col']) if self.has_column(table, name)]
+		if not names:
+			return
+		delimiter = get_name(parameters['with']) if 'with' in parameters else ''
+		code = self.assign(repr(delimiter) + '.join((' + ''.join('to_text(' + table.columns[name] + '), ' for name in names) + '))')
+		position = table.get_position(names[0])
+		table.remove(names)
+		name = get_name(parameters['as']) if 'as' in parameters else table.get_unique_name('column1')
+		table.insert([(name, code)], position)
+
+	def settype(self, table, parameters):
+		converter = converters.get(parameters.get('type'))
+		if not converter:
+			return
+		for name in get_names(parameters['col']):
+			if self.has_column(table, name):
+				table.put(name, self.assign(converter.__name__ + '(' + table.columns[name] + ')'))
+
+	def splitpatterns(self, table, parameters):
+		name = get_name(parameters['col'])
+		if parameters.get('type') != 'on' or 'on' not in parameters:
+			self.skip('splitpatterns ' + str(parameters.get('type')))
+			return
+		if not self.has_column(table, name):
+			return
+		on = parameters['on']
+		if is_literal(on):
+			parts = self.assign('split_text(' + table.columns[name] + ', ' + repr(get_literal(on)) + ')')
+		else:
+			pattern = self.constant('re.compile(' + repr(get_pattern(on).pattern) + ')')
+			parts = self.assign('split_pattern(' + table.columns[name] + ', ' + pattern + ')')
+		names = table.get_numbered_names(name, 2)
+		position = table.get_position(name)
+		table.remove([name])
+		columns = []
+		for number, new_name in enumerate(names):
+			columns.append((new_name, self.assign(parts + '[' + str(number) + ']')))
+		table.insert(columns, position)
+
+	def replacepatterns(self, table, parameters):
+		replacement = get_name(parameters.get('with', "''"))
+		count = 0 if parameters.get('global') in (True, 'true') else 1
+		on = parameters['on']
+		if not is_literal(on):
+			pattern = self.constant('re.compile(' + repr(get_pattern(on).pattern) + ')')
+		for name in get_names(parameters['col']):
+			if not self.has_column(table, name):
+				continue
+			if is_literal(on):
+				code = 'replace_text(' + table.columns[name] + ', ' + repr(get_literal(on)) + ', ' + repr(replacement) + ', ' + str(count or -1) + ')'
+			else:
+				code = 'replace_pattern(' + table.columns[name] + ', ' + pattern + ', ' + repr(replacement.replace('\\', '\\\\')) + ', ' + str(count) + ')'
+			table.put(name, self.assign(code))
+
+	#
+	# row transforms
+	#
+
+	def delete(self, table, parameters):
+
+		# rows are deleted by returning nothing for them
+		#
+		if parameters.get('with') == 'missing values' and 'in' in parameters:
+			self.lines.append('\tif is_missing(' + self.get_column(table, get_name(parameters['in'])) + '):')
+			self.lines.append('\t\treturn None')
+		elif parameters.get('target') != 'rows':
+			table.remove([name for name in get_names(parameters['target']) if self.has_column(table, name)])
+
+	def sort(self, table, parameters):
+
+		# the order of rows is not known one row at a time
+		#
+		self.skip('sort')
+
+	#
+	# compiling methods
+	#
+
+	def compile(self, names):
+
+		# input columns are read from the positions of each
+		# record, where recipes with a header transform name
+		# them from the header row
+		#
+		self.names = list(names)
+		header = any(transform['transform'] == 'header' for transform in self.transforms)
+		table = Table()
+		for index, name in enumerate(self.names):
+			code = 'record[' + str(index) + ']'
+			self.inputs[code] = index
+			table.columns[table.get_unique_name('column' + str(index + 1) if header else name)] = code
+		self.run(table)
+
+		# write the values of the output columns as text,
+		# except for literals which already are
+		#
+		codes = [code if code[:1] in ('"', "'") or code == 'None' else 'to_string(' + code + ')' for code in table.columns.values()]
+		lines = ['# generated from a Wrangle recipe', '']
+		lines.append('columns = ' + repr(table.get_names()))
+		lines.append('skipped = ' + repr(self.skipped))
+		lines.append('missing = ' + repr(sorted(self.missing)))
+		lines += self.constants
+		lines += ['', 'def transform(record):']
+		lines += self.lines
+		lines.append('\treturn (' + ''.join(code + ', ' for code in codes) + ')')
+		return '\n'.join(lines) + '\n'
+
+#
+# caching functions
+#
+
+def get_key(transforms, names):
+	text = json.dumps([version, transforms, list(names)], sort_keys=True)
+	return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+def load_recipe(transforms, names, directory = cache_directory):
+
+	# recipes are compiled once for each set of input columns
+	# and then loaded from the cache, where python also keeps
+	# the bytecode of the generated module
+	#
+	name = 'recipe_' + get_key(transforms, names)
+	filename = os.path.join(directory, name + '.py')
+	if not os.path.exists(filename):
+		source = Compiler(transforms).compile(names)
+		os.makedirs(directory, exist_ok=True)
+		temporary = filename + '.' + str(os.getpid())
+		with open(temporary, 'w', encoding='utf-8') as file:
+			file.write(source)
+		os.replace(temporary, filename)
+
+	# load the generated module with the functions it calls
+	#
+	specification = importlib.util.spec_from_file_location(name, filename)
+	module = importlib.util.module_from_spec(specification)
+	module.__dict__.update(helpers)
+	specification.loader.exec_module(module)
+	return module
@@ -0,0 +1,714 @@
+################################################################################
+#                                                                              #
+#                                  engine.py                                   #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for running a Wrangle recipe over columns of data.  #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import re
+import gc
+import json
+import operator
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from itertools import zip_longest
+
+#
+# globals
+#
+
+# names of the character classes that may appear in braces
+# in a Wrangle pattern and the expressions they stand for
+#
+pattern_classes = {
+	'start': '^',
+	'end': '$',
+	'any': '.',
+	'digit': '[0-9]',
+	'alpha': '[A-Za-z]',
+	'upper': '[A-Z]',
+	'lower': '[a-z]',
+	'alphanumeric': '[A-Za-z0-9]',
+	'delim': '[ ,;:|\\t]'
+}
+class_pattern = re.compile(r'\{([\w-]+)\}')
+identifier = re.compile(r'[^\W\d]\w*$')
+date_pattern = re.compile(r'\s*(\d{4})-(\d{1,2})')
+
+# operators of the comparisons in expressions
+#
+comparisons = {
+	'==': operator.eq,
+	'!=': operator.ne,
+	'<': operator.lt,
+	'<=': operator.le,
+	'>': operator.gt,
+	'>=': operator.ge
+}
+reflections = {
+	'==': '__eq__',
+	'!=': '__ne__',
+	'<': '__gt__',
+	'<=': '__ge__',
+	'>': '__lt__',
+	'>=': '__le__'
+}
+
+# dicts and lists are written as compact json, like the
+# nested columns of the parsers
+#
+encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+#
+# token functions
+#
+
+def is_literal(token):
+	return isinstance(token, str) and token[:1] == "'" and token[-1:] == "'"
+
+def is_column(token):
+	return isinstance(token, str) and (token[:1] == '{' and token[-1:] == '}' or identifier.match(token) is not None)
+
+def get_literal(token):
+	return token[1:-1]
+
+def get_name(token):
+	if token[:1] == '{' and token[-1:] == '}' or is_literal(token):
+		return token[1:-1]
+	return token
+
+def get_names(value):
+	if isinstance(value, list):
+		return [get_name(token) for token in value]
+	return [get_name(value)]
+
+def is_constant(token):
+	return not isinstance(token, (dict, list)) and not is_column(token)
+
+def get_constant(token):
+	return get_literal(token) if is_literal(token) else token
+
+def get_params(value, count):
+	params = value['params']
+	return params[:count] + [None] * (count - len(params))
+
+def get_pattern(token):
+
+	# patterns in backquotes are regular expressions with
+	# character classes in braces, anything else is text
+	#
+	if token[:1] == '`' and token[-1:] == '`':
+		return re.compile(class_pattern.sub(lambda match: pattern_classes.get(match.group(1), match.group(0)), token[1:-1]))
+	return re.compile(re.escape(get_name(token)))
+
+#
+# value functions
+#
+
+def is_missing(value):
+	return value is None or value == ''
+
+def to_text(value):
+	if isinstance(value, str):
+		return value
+	return '' if value is None else to_string(value)
+
+def to_string(value):
+	if value is None or isinstance(value, str):
+		return value
+	if isinstance(value, bool):
+		return 'true' if value else 'false'
+	if isinstance(value, (dict, list, tuple)):
+		return encoder.encode(value)
+	return str(value)
+
+def to_integer(value):
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		return value
+
+def to_float(value):
+	try:
+		return float(value)
+	except (TypeError, ValueError):
+		return value
+
+def to_object(value):
+	if isinstance(value, (dict, list)):
+		return value
+	if isinstance(value, str) and value[:1] in ('{', '['):
+		try:
+			return json.loads(value)
+		except ValueError:
+			return None
+	return None
+
+def to_nested(value):
+	return to_object(value) or value
+
+def get_item(value, path):
+	for key in path:
+		if not isinstance(value, dict):
+			return None
+		value = value.get(key)
+	return value
+
+def get_path(key):
+
+	# keys of nested objects are written as json arrays
+	#
+	if key[:1] == '[':
+		try:
+			return json.loads(key)
+		except ValueError:
+			pass
+	return [key]
+
+#
+# expression value functions
+#
+
+def is_true(value):
+	return value is True or isinstance(value, str) and value.lower() == 'true'
+
+def to_number(value):
+	if isinstance(value, bool):
+		return None
+	if isinstance(value, (int, float)):
+		return value
+	try:
+		return float(value)
+	except (TypeError, ValueError):
+		return None
+
+def compare(name, value, other):
+
+	# values that are both numbers are compared as numbers
+	# and anything else is compared as text
+	#
+	number, other_number = to_number(value), to_number(other)
+	if number is not None and other_number is not None:
+		return comparisons[name](number, other_number)
+	return comparisons[name](to_text(value), to_text(other))
+
+def compare_column(name, values, other):
+
+	# values that are compared to a constant only convert
+	# the constant once, where text that is not a number is
+	# always compared as text, by the method of the text
+	# that compares it to the values on its left
+	#
+	number, text = to_number(other), to_text(other)
+	if number is None:
+		return list(map(getattr(text, reflections[name]), map(to_text, values)))
+	return [compare(name, value, number) for value in values]
+
+def if_missing(value, default):
+	return default if is_missing(value) else value
+
+def to_array(value):
+	if isinstance(value, (list, tuple)):
+		return list(value)
+	value = to_object(value)
+	return value if isinstance(value, list) else []
+
+def join_arrays(arrays):
+	values = []
+	for array in arrays:
+		values += to_array(array)
+	return values
+
+def get_now(name):
+	now = datetime.now(timezone.utc if name.upper() == 'UTC' else ZoneInfo(name))
+	return now.strftime('%Y-%m-%d %H:%M:%S')
+
+def get_year(value):
+	match = date_pattern.match(value) if isinstance(value, str) else None
+	return int(match.group(1)) if match else None
+
+def get_month(value):
+	match = date_pattern.match(value) if isinstance(value, str) else None
+	return int(match.group(2)) if match else None
+
+# value types that are converted when a column is set to
+# them, where other types keep the values they had
+#
+converters = {
+	'String': to_string,
+	'Integer': to_integer,
+	'Float': to_float,
+	'Map': to_nested,
+	'Array': to_nested
+}
+
+#
+# table class
+#
+
+class Table:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, names = (), columns = ()):
+		self.columns = dict(zip(names, columns))
+		self.count = len(columns[0]) if columns else 0
+
+	#
+	# querying methods
+	#
+
+	def get_names(self):
+		return list(self.columns)
+
+	def get_position(self, name):
+		return self.get_names().index(name)
+
+	def get_unique_name(self, name):
+		if name not in self.columns:
+			return name
+		number = 1
+		while name + str(number) in self.columns:
+			number += 1
+		return name + str(number)
+
+	def get_numbered_names(self, name, count):
+
+		# number new columns after the name without its number,
+		# skipping any numbers that are already taken
+		#
+		stem = name.rstrip('0123456789') or name
+		names = []
+		number = 1
+		while len(names) < count:
+			if stem + str(number) not in self.columns:
+				names.append(stem + str(number))
+			number += 1
+		return names
+
+	def get_rows(self):
+		return zip(*[list(map(to_string, column)) for column in self.columns.values()])
+
+	#
+	# column methods
+	#
+
+	def put(self, name, values, position = None):
+		if position is None or name in self.columns:
+			self.columns[name] = values
+		else:
+			self.insert([(name, values)], position)
+
+	def insert(self, columns, position):
+		items = list(self.columns.items())
+		items[position:position] = columns
+		self.columns = dict(items)
+
+	def rename(self, name, new_name):
+		self.columns = {(new_name if key == name else key): column for key, column in self.columns.items()}
+
+	def remove(self, names):
+		for name in names:
+			self.columns.pop(name, None)
+
+	def keep(self, names):
+		self.columns = {name: column for name, column in self.columns.items() if name in names}
+
+	#
+	# row methods
+	#
+
+	def select(self, indices):
+		self.columns = {name: [column[index] for index in indices] for name, column in self.columns.items()}
+		self.count = len(indices)
+
+#
+# table functions
+#
+
+def get_table(rows, names = None):
+
+	# rows without a header are named the way that Wrangle
+	# names the columns of a file without one
+	#
+	columns = [list(column) for column in zip_longest(*rows)]
+	names = list(names or [])
+	names += ['column' + str(number) for number in range(len(names) + 1, len(columns) + 1)]
+	table = Table(names, columns)
+	if not columns:
+		table.count = len(rows)
+	return table
+
+def get_object_table(objects):
+
+	# json files are read as a single column of objects
+	#
+	return Table(['column1'], [list(objects)])
+
+#
+# engine class
+#
+
+class Engine:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, transforms):
+		self.transforms = transforms
+		self.number = 0
+		self.skipped = []
+		self.missing = set()
+		self.operations = {
+			'header': self.header,
+			'derive': self.derive,
+			'set': self.set,
+			'rename': self.rename,
+			'drop': self.drop,
+			'Delete': self.delete,
+			'nest': self.nest,
+			'unnest': self.unnest,
+			'move': self.move,
+			'merge': self.merge,
+			'settype': self.settype,
+			'splitpatterns': self.splitpatterns,
+			'replacepatterns': self.replacepatterns,
+			'sort': self.sort
+		}
+		self.functions = {
+			'IF': self.choose,
+			'ISNULL': self.test_missing,
+			'ISMISSING': self.test_missing,
+			'IFNULL': self.fill_missing,
+			'IFMISSING': self.fill_missing,
+			'MERGE': self.merge_values,
+			'ARRAYCONCAT': self.concat_arrays,
+			'NOW': self.now,
+			'YEAR': self.year,
+			'MONTH': self.month
+		}
+		for name in comparisons:
+			self.functions[name] = self.compare_values
+
+	#
+	# helper methods
+	#
+
+	def skip(self, description):
+		self.skipped.append((self.number, description))
+
+	def has_column(self, table, name):
+		if name not in table.columns:
+			self.missing.add(name)
+			return False
+		return True
+
+	def get_column(self, table, name):
+		if not self.has_column(table, name):
+			return [None] * table.count
+		return table.columns[name]
+
+	def get_count(self, table, rows):
+		return table.count if rows is None else len(rows)
+
+	def evaluate(self, table, value, rows = None):
+
+		# expressions are evaluated for all of the rows of the
+		# table or else for the rows that are listed
+		#
+		count = self.get_count(table, rows)
+		if isinstance(value, dict):
+			function = self.functions.get(value['name'])
+			if not function:
+				self.skip(value['name'])
+				return [None] * count
+			return function(table, value, rows)
+
+		# arrays are columns of tuples of their items
+		#
+		if isinstance(value, list):
+			if not value:
+				return [()] * count
+			return list(zip(*[self.evaluate(table, item, rows) for item in value]))
+		if is_column(value):
+			column = self.get_column(table, get_name(value))
+			return list(column) if rows is None else [column[row] for row in rows]
+		return [get_constant(value)] * count
+
+	#
+	# expression functions
+	#
+
+	def choose(self, table, value, rows):
+
+		# each branch is only evaluated for the rows that take
+		# it, so the conditions of nested branches are only
+		# tested on the rows that reach them
+		#
+		condition, result, other = get_params(value, 3)
+		tests = list(map(is_true, self.evaluate(table, condition, rows)))
+		indices = range(table.count) if rows is None else rows
+		chosen = [row for row, test in zip(indices, tests) if test]
+		if len(chosen) == len(tests):
+			return self.evaluate(table, result, rows)
+		if not chosen:
+			return self.evaluate(table, other, rows)
+		results = iter(self.evaluate(table, result, chosen))
+		others = iter(self.evaluate(table, other, [row for row, test in zip(indices, tests) if not test]))
+		return [next(results) if test else next(others) for test in tests]
+
+	def test_missing(self, table, value, rows):
+
+		# empty csv cells are the only nulls that can be read,
+		# so null and missing values are the same, and arrays
+		# are missing if any of their items are
+		#
+		param = get_params(value, 1)[0]
+		if isinstance(param, list):
+			return [any(map(is_missing, items)) for items in self.evaluate(table, param, rows)]
+		return list(map(is_missing, self.evaluate(table, param, rows)))
+
+	def fill_missing(self, table, value, rows):
+		param, default = get_params(value, 2)
+		values = self.evaluate(table, param, rows)
+		indices = range(table.count) if rows is None else rows
+		missing = [row for row, item in zip(indices, values) if is_missing(item)]
+		if not missing:
+			return values
+		defaults = iter(self.evaluate(table, default, missing))
+		return [next(defaults) if is_missing(item) else item for item in values]
+
+	def merge_values(self, table, value, rows):
+		items, delimiter = get_params(value, 2)
+		delimiter = get_literal(delimiter) if is_literal(delimiter) else ''
+		count = self.get_count(table, rows)
+		columns = []
+		for item in (items if isinstance(items, list) else [items]):
+			if is_constant(item):
+				columns.append([to_text(get_constant(item))] * count)
+			else:
+				columns.append(map(to_text, self.evaluate(table, item, rows)))
+		if not columns:
+			return [''] * count
+		return list(map(delimiter.join, zip(*columns)))
+
+	def concat_arrays(self, table, value, rows):
+		arrays = get_params(value, 1)[0]
+		return list(map(join_arrays, self.evaluate(table, arrays if isinstance(arrays, list) else [arrays], rows)))
+
+	def now(self, table, value, rows):
+		name = get_params(value, 1)[0]
+		try:
+			now = get_now(get_literal(name) if is_literal(name) else 'UTC')
+		except (KeyError, ValueError):
+			self.skip('NOW ' + str(name))
+			now = None
+		return [now] * self.get_count(table, rows)
+
+	def year(self, table, value, rows):
+		return list(map(get_year, self.evaluate(table, get_params(value, 1)[0], rows)))
+
+	def month(self, table, value, rows):
+		return list(map(get_month, self.evaluate(table, get_params(value, 1)[0], rows)))
+
+	def compare_values(self, table, value, rows):
+		name = value['name']
+		left, right = get_params(value, 2)
+		values = self.evaluate(table, left, rows)
+		if is_constant(right):
+			return compare_column(name, values, get_constant(right))
+		return [compare(name, item, other) for item, other in zip(values, self.evaluate(table, right, rows))]
+
+	#
+	# column transforms
+	#
+
+	def header(self, table, parameters):
+		if not table.count:
+			return
+		columns = list(table.columns.values())
+		names = [to_text(column[0]) or 'column' + str(number) for number, column in enumerate(columns, 1)]
+		table.columns = {}
+		for name, column in zip(names, columns):
+			del column[0]
+			table.columns[table.get_unique_name(name)] = column
+		table.count -= 1
+
+	def derive(self, table, parameters):
+		name = get_name(parameters['as']) if 'as' in parameters else table.get_unique_name('column1')
+		table.put(name, self.evaluate(table, parameters.get('value')))
+
+	def set(self, table, parameters):
+		for name in get_names(parameters['col']):
+			if self.has_column(table, name):
+				table.put(name, self.evaluate(table, parameters.get('value')))
+
+	def rename(self, table, parameters):
+		mapping = parameters.get('mapping', [])
+		for name, new_name in zip(mapping[::2], mapping[1::2]):
+			if self.has_column(table, get_name(name)):
+				table.rename(get_name(name), get_name(new_name))
+
+	def drop(self, table, parameters):
+		names = get_names(parameters['col'])
+		if parameters.get('action') == 'Keep':
+			table.keep(names)
+		else:
+			table.remove([name for name in names if self.has_column(table, name)])
+
+	def nest(self, table, parameters):
+		names = get_names(parameters['col'])
+		columns = [self.get_column(table, name) for name in names]
+		if parameters.get('into') == 'array':
+			values = [list(items) for items in zip(*columns)]
+		else:
+			values = [dict(zip(names, items)) for items in zip(*columns)]
+		table.put(get_name(parameters['as']), values)
+
+	def unnest(self, table, parameters):
+		name = get_name(parameters['col'])
+		if not self.has_column(table, name):
+			return
+		objects = list(map(to_object, table.columns[name]))
+		position = table.get_position(name) + 1
+		for key in get_names(parameters['keys']):
+			path = get_path(key)
+			table.put(table.get_unique_name(str(path[-1])), [get_item(value, path) for value in objects], position)
+			position += 1
+
+	def move(self, table, parameters):
+		names = [name for name in get_names(parameters['col']) if self.has_column(table, name)]
+		columns = [(name, table.columns[name]) for name in names]
+		table.remove(names)
+
+		# find where the columns go relative to their target
+		#
+		position = parameters.get('position')
+		target = get_name(parameters[position]) if position in ('after', 'before') and position in parameters else None
+		if target and self.has_column(table, target):
+			table.insert(columns, table.get_position(target) + (1 if position == 'after' else 0))
+		elif position == 'start':
+			table.insert(columns, 0)
+		else:
+			table.insert(columns, len(table.columns))
+
+	def merge(self, table, parameters):
+		names = [name for name in get_names(parameters['col']) if self.has_column(table, name)]
+		if not names:
+			return
+		delimiter = get_name(parameters['with']) if 'with' in parameters else ''
+		values = [delimiter.join(map(to_text, items)) for items in zip(*[table.columns[name] for name in names])]
+		position = table.get_position(names[0])
+		table.remove(names)
+		name = get_name(parameters['as']) if 'as' in parameters else table.get_unique_name('column1')
+		table.insert([(name, values)], position)
+
+	def settype(self, table, parameters):
+		converter = converters.get(parameters.get('type'))
+		if not converter:
+			return
+		for name in get_names(parameters['col']):
+			if self.has_column(table, name):
+				table.put(name, list(map(converter, table.columns[name])))
+
+	def splitpatterns(self, table, parameters):
+		name = get_name(parameters['col'])
+		if parameters.get('type') != 'on' or 'on' not in parameters:
+			self.skip('splitpatterns ' + str(parameters.get('type')))
+			return
+		if not self.has_column(table, name):
+			return
+
+		# split on the first match of the pattern into two
+		# columns that replace the one that was split
+		#
+		on = parameters['on']
+		if is_literal(on):
+			on = get_literal(on)
+			parts = [value.split(on, 1) if isinstance(value, str) else [value] for value in table.columns[name]]
+		else:
+			pattern = get_pattern(on)
+			parts = [pattern.split(value, 1) if isinstance(value, str) else [value] for value in table.columns[name]]
+		names = table.get_numbered_names(name, 2)
+		position = table.get_position(name)
+		table.remove([name])
+		columns = []
+		for number, new_name in enumerate(names):
+			columns.append((new_name, [part[number] if len(part) > number else None for part in parts]))
+		table.insert(columns, position)
+
+	def replacepatterns(self, table, parameters):
+		replacement = get_name(parameters.get('with', "''"))
+		count = 0 if parameters.get('global') in (True, 'true') else 1
+		on = parameters['on']
+		for name in get_names(parameters['col']):
+			if not self.has_column(table, name):
+				continue
+			column = table.columns[name]
+			if is_literal(on):
+				text = get_literal(on)
+				values = [value.replace(text, replacement, count or -1) if isinstance(value, str) else value for value in column]
+			else:
+				pattern = get_pattern(on)
+				values = [pattern.sub(replacement.replace('\\', '\\\\'), value, count) if isinstance(value, str) else value for value in column]
+			table.put(name, values)
+
+	#
+	# row transforms
+	#
+
+	def delete(self, table, parameters):
+
+		# delete the rows with missing values in a column or
+		# else the column that is named
+		#
+		if parameters.get('with') == 'missing values' and 'in' in parameters:
+			column = self.get_column(table, get_name(parameters['in']))
+			table.select([index for index, value in enumerate(column) if not is_missing(value)])
+		elif parameters.get('target') != 'rows':
+			table.remove([name for name in get_names(parameters['target']) if self.has_column(table, name)])
+
+	def sort(self, table, parameters):
+		order = parameters.get('order')
+		if not is_column(order):
+			self.skip('sort ' + str(order))
+			return
+		keys = list(map(to_text, self.get_column(table, get_name(order))))
+		table.select(sorted(range(table.count), key=keys.__getitem__))
+
+	#
+	# running methods
+	#
+
+	def run(self, table):
+
+		# transforms make millions of short lived values but no
+		# cycles, so collecting while they run only rescans the
+		# columns of the table
+		#
+		enabled = gc.isenabled()
+		gc.disable()
+		try:
+			for self.number, transform in enumerate(self.transforms, 1):
+				operation = self.operations.get(transform['transform'])
+				if operation:
+					operation(table, transform['parameters'])
+				else:
+					self.skip(transform['transform'])
+		finally:
+			if enabled:
+				gc.enable()
+		return table
@@ -0,0 +1,444 @@
+################################################################################
+#                                                                              #
+#                                 optimizer.py                                 #
+#                                                                              #
+################################################################################
+#                                                                              #
+#        This is a utility for optimizing a parsed Wrangle recipe.             #
+#                                                                              #
+#        Author(s): Abe Megahed                                                #
+#                                                                              #
+#        This file is subject to the terms and conditions defined in           #
+#        'LICENSE.txt', which is part of this source code distribution.        #
+#                                                                              #
+################################################################################
+#     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
+################################################################################
+
+import copy
+from .engine import Engine, Table, identifier, is_literal, is_column, get_literal, get_name, get_names
+
+#
+# globals
+#
+
+# transforms whose columns are not all named in their
+# parameters, which nothing is moved across
+#
+barriers = ['header', 'Keep', 'filter', 'countpattern']
+transforms = list(Engine([]).operations)
+functions = list(Engine([]).functions)
+digits = '0123456789'
+
+# transforms that only change the values of their columns
+#
+value_transforms = ['set', 'settype', 'replacepatterns']
+
+#
+# step functions
+#
+
+def get_references(value):
+
+	# every name that a step could refer to, which includes
+	# literals since the names of new columns are quoted
+	#
+	if isinstance(value, dict):
+		for item in value.values():
+			yield from get_references(item)
+	elif isinstance(value, list):
+		for item in value:
+			yield from get_references(item)
+	elif isinstance(value, str):
+		yield get_name(value)
+
+def get_token(name):
+	return name if identifier.match(name) else '{' + name + '}'
+
+def get_columns(step):
+	return get_names(step['parameters'].get('col', []))
+
+def set_columns(step, names):
+	step['parameters']['col'] = [get_token(name) for name in names]
+
+def get_mapping(step):
+	mapping = step['parameters'].get('mapping', [])
+	return [(get_name(name), get_name(new_name)) for name, new_name in zip(mapping[::2], mapping[1::2])]
+
+def set_mapping(step, pairs):
+	step['parameters']['mapping'] = [item for name, new_name in pairs for item in (get_token(name), "'" + new_name + "'")]
+
+def get_functions(value):
+	if isinstance(value, dict):
+		yield value['name']
+		value = value['params']
+	if isinstance(value, list):
+		for item in value:
+			yield from get_functions(item)
+
+def has_function(step):
+
+	# calls of functions that the engine can not run are
+	# left where they are, since what they do is not known
+	#
+	return any(name not in functions for value in step['parameters'].values() for name in get_functions(value))
+
+def is_drop(step):
+	return step['transform'] == 'drop' and step['parameters'].get('action') != 'Keep'
+
+def is_barrier(step):
+	return step['transform'] in barriers or step['transform'] not in transforms or step['transform'] == 'drop' and not is_drop(step) or has_function(step)
+
+def get_mentions(step):
+	references = set(get_references(step['parameters']))
+	if step['transform'] in ('derive', 'merge') and 'as' not in step['parameters']:
+		references.add('column1')
+
+	# new columns may be named after others with a number
+	#
+	return references | {reference.rstrip(digits) for reference in references}
+
+def mentions(step, names):
+	references = get_mentions(step)
+	return any(name in references or name.rstrip(digits) in references for name in names)
+
+def rename_columns(step, name, new_name):
+	set_columns(step, [new_name if column == name else column for column in get_columns(step)])
+	position, target = get_target(step)
+	if target == name:
+		step['parameters'][position] = get_token(new_name)
+
+def get_target(step):
+	position = step['parameters'].get('position')
+	if position in ('after', 'before') and position in step['parameters']:
+		return position, get_name(step['parameters'][position])
+	return None, None
+
+#
+# optimizer class
+#
+
+class Optimizer:
+
+	#
+	# constructor
+	#
+
+	def __init__(self, transforms, names = None):
+		self.transforms = transforms
+		self.names = set(names or [])
+		self.removed = {}
+
+	#
+	# helper methods
+	#
+
+	def remove(self, name, number = 1):
+		if number:
+			self.removed[name] = self.removed.get(name, 0) + number
+
+	def get_count(self):
+		return sum(self.removed.values())
+
+	def is_known(self, steps, index, name):
+
+		# check whether a column could exist before a step
+		#
+		return name in self.names or any(mentions(step, [name]) for step in steps[:index])
+
+	def find_mention(self, steps, start, names):
+		for index in range(start, len(steps)):
+			if is_barrier(steps[index]) or mentions(steps[index], names):
+				return index
+		return None
+
+	#
+	# constant folding
+	#
+
+	def fold_constants(self, steps):
+
+		# columns derived from literals keep their values until
+		# they are changed, and the derive that defines them
+		# can be rewritten until anything else mentions them
+		#
+		constants = {}
+		definitions = {}
+		kept = []
+		for step in steps:
+			transform, parameters = step['transform'], step['parameters']
+			if is_barrier(step):
+				constants, definitions = {}, {}
+				kept.append(step)
+				continue
+
+			# copies of constant columns are constants as well
+			#
+			if transform == 'derive' and is_column(parameters.get('value')) and get_name(parameters['value']) in constants:
+				parameters['value'] = constants[get_name(parameters['value'])]
+
+			# values of constant columns are set where they are
+			# defined
+			#
+			names = get_columns(step)
+			if transform in value_transforms and names and all(name in definitions for name in names):
+				folded = self.fold_values(step, [constants[name] for name in names])
+				if folded is not None:
+					for name, value in zip(names, folded):
+						constants[name] = value
+						kept[definitions[name]]['parameters']['value'] = value
+					self.remove('constant folding')
+					continue
+
+			# forget constants that are mentioned by anything but
+			# a move, which does not change their values
+			#
+			for name in list(constants):
+				if mentions(step, [name]) and transform != 'move':
+					constants.pop(name)
+					definitions.pop(name, None)
+
+			if transform == 'derive' and is_literal(parameters.get('value')) and 'as' in parameters:
+				name = get_name(parameters['as'])
+				constants[name] = parameters['value']
+				if not self.is_known(kept, len(kept), name):
+					definitions[name] = len(kept)
+			kept.append(step)
+		return kept
+
+	def fold_values(self, step, values):
+
+		# run a step on a row of its constant values, where
+		# only values that are still text can be folded
+		#
+		names = get_columns(step)
+		table = Table(names, [[get_literal(value)] for value in values])
+		engine = Engine([step])
+		engine.run(table)
+		folded = [table.columns[name][0] for name in names]
+		if engine.skipped or engine.missing or not all(isinstance(value, str) for value in folded):
+			return None
+		return ["'" + value + "'" for value in folded]
+
+	#
+	# dead column elimination
+	#
+
+	def eliminate_dead_columns(self, steps):
+
+		# walk backwards from each drop, where columns that are
+		# dropped are dead until something before uses them
+		#
+		dead = {}
+		seen = set()
+		kept = []
+		for index in range(len(steps) - 1, -1, -1):
+			step = steps[index]
+			transform, parameters = step['transform'], step['parameters']
+			if is_drop(step):
+				for name in get_columns(step):
+					dead[name] = step
+				seen |= get_mentions(step)
+				kept.append(step)
+				continue
+
+			# remove steps that only make or change dead columns
+			#
+			if transform in ('derive', 'nest') and 'as' in parameters and get_name(parameters['as']) in dead:
+				name = get_name(parameters['as'])
+				if not self.is_known(steps, index, name):
+					drop = dead.pop(name)
+					set_columns(drop, [column for column in get_columns(drop) if column != name])
+				self.remove('dead columns')
+				continue
+			names = get_columns(step)
+			if transform in value_transforms + ['move'] and names and not has_function(step):
+				position, target = get_target(step)
+				live = [name for name in names if name not in dead]
+				if target not in dead and len(live) < len(names):
+					if not live:
+						self.remove('dead columns')
+						continue
+					set_columns(step, live)
+
+			# renamed dead columns are dropped by their old name
+			#
+			if transform == 'rename':
+				pairs = []
+				for name, new_name in get_mapping(step):
+					if new_name in dead and name not in seen and not self.is_known(steps, index, new_name):
+						drop = dead.pop(new_name)
+						set_columns(drop, [name if column == new_name else column for column in get_columns(drop)])
+						dead[name] = drop
+					else:
+						pairs.append((name, new_name))
+				if not pairs:
+					self.remove('dead columns')
+					continue
+				set_mapping(step, pairs)
+
+			# anything else that mentions a dead column uses it
+			#
+			if is_barrier(step):
+				dead = {}
+			for name in list(dead):
+				if mentions(step, [name]):
+					dead.pop(name)
+			seen |= get_mentions(step)
+			kept.append(step)
+
+		# drops that are left with no columns are removed
+		#
+		kept.reverse()
+		steps = [step for step in kept if not is_drop(step) or get_columns(step)]
+		self.remove('dead columns', len(kept) - len(steps))
+		return steps
+
+	#
+	# rename and move fusion
+	#
+
+	def fuse_renames(self, steps):
+
+		# new columns that are renamed are made with their new
+		# name when only moves have mentioned them in between,
+		# where the moves are changed to use the new name
+		#
+		definitions = {}
+		kept = []
+		for step in steps:
+			transform, parameters = step['transform'], step['parameters']
+			if is_barrier(step):
+				definitions = {}
+			if transform == 'rename':
+				pairs = []
+				for name, new_name in get_mapping(step):
+					if name in definitions and not self.is_known(kept, len(kept), new_name):
+						index, moves = definitions.pop(name)
+						kept[index]['parameters']['as'] = "'" + new_name + "'"
+						for move in moves:
+							rename_columns(kept[move], name, new_name)
+						definitions[new_name] = (index, moves)
+					else:
+						pairs.append((name, new_name))
+				if not pairs:
+					self.remove('rename fusion')
+					continue
+				set_mapping(step, pairs)
+
+				# renames that follow each other are one rename, and
+				# chains of renames of a column are one pair
+				#
+				if kept and kept[-1]['transform'] == 'rename':
+					pairs = get_mapping(kept[-1])
+					for name, new_name in get_mapping(step):
+						chain = [index for index, pair in enumerate(pairs) if pair[1] == name]
+						if chain and not any(name in pair or new_name in pair for pair in pairs[chain[-1] + 1:]):
+							pairs[chain[-1]] = (pairs[chain[-1]][0], new_name)
+						else:
+							pairs.append((name, new_name))
+					set_mapping(kept[-1], pairs)
+					self.remove('rename fusion')
+					step = kept[-1]
+					kept.pop()
+
+			# anything but a move that mentions a new column keeps
+			# its name
+			#
+			for name in list(definitions):
+				if mentions(step, [name]):
+					if transform == 'move' and not has_function(step):
+						definitions[name][1].append(len(kept))
+					else:
+						definitions.pop(name)
+			if transform in ('derive', 'nest') and 'as' in parameters and not self.is_known(kept, len(kept), get_name(parameters['as'])):
+				definitions[get_name(parameters['as'])] = (len(kept), [])
+			kept.append(step)
+		return kept
+
+	def fuse_moves(self, steps):
+		index = 0
+		while index < len(steps):
+			step = steps[index]
+			position, target = get_target(step)
+			names = get_columns(step)
+			if step['transform'] != 'move' or not names or has_function(step):
+				index += 1
+				continue
+
+			# find the next step that mentions the moved columns
+			#
+			following = self.find_mention(steps, index + 1, names)
+			if following is None:
+				index += 1
+				continue
+			other = steps[following]
+			other_position, other_target = get_target(other)
+			other_names = get_columns(other)
+			if other['transform'] != 'move' or has_function(other):
+				index += 1
+				continue
+
+			# moves of all of the moved columns undo the move
+			#
+			if set(names) <= set(other_names) and other_target not in names:
+				del steps[index]
+				self.remove('move fusion')
+				continue
+
+			# moves next to the moved columns are one move, when
+			# nothing in between mentions where they were moved
+			#
+			anchor = names[-1] if position == 'after' else names[0]
+			mention = self.find_mention(steps, index + 1, [target]) if target else None
+			if target and other_position == position and other_target == anchor and not set(other_names) & set(names + [target]) and (mention is None or mention >= following):
+				set_columns(other, names + other_names if position == 'after' else other_names + names)
+				other['parameters'][position] = get_token(target)
+				del steps[index]
+				self.remove('move fusion')
+				continue
+			index += 1
+		return steps
+
+	#
+	# drop reordering
+	#
+
+	def move_drops(self, steps):
+
+		# move each drop to just after the last step before it
+		# that mentions its columns, or into the first drop it
+		# passes on the way
+		#
+		kept = []
+		for step in steps:
+			if not is_drop(step):
+				kept.append(step)
+				continue
+			names = get_columns(step)
+			index = len(kept)
+			while index > 0 and not is_barrier(kept[index - 1]) and not mentions(kept[index - 1], names):
+				index -= 1
+			drops = [other for other in kept[index:] if is_drop(other)]
+			if drops:
+				set_columns(drops[0], get_columns(drops[0]) + [name for name in names if name not in get_columns(drops[0])])
+				self.remove('early drops')
+				continue
+			kept.insert(index, step)
+		return kept
+
+	#
+	# optimizing methods
+	#
+
+	def optimize(self):
+		steps = copy.deepcopy(self.transforms)
+		count = None
+		while count != len(steps):
+			count = len(steps)
+			steps = self.fold_constants(steps)
+			steps = self.eliminate_dead_columns(steps)
+			steps = self.move_drops(steps)
+			steps = self.fuse_renames(steps)
+			steps = self.fuse_moves(steps)
+		return steps
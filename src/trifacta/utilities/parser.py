@@ -15,8 +15,17 @@
 #     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
 ################################################################################
 
+import re
 from .tokenizer import Tokenizer
 
+#
+# globals
+#
+
+identifier = re.compile(r'[^\W\d]\w*$')
+digits = list('0123456789.')
+operators = ['==', '!=', '<', '<=', '>', '>=']
+
 #
 # parsing class
 #
@@ -30,6 +39,7 @@ class Parser:
 	def __init__(self):
 		self.tokenizer = Tokenizer()
 		self.tokens = []
+		self.positions = []
 		self.count = 0
 
 	#
@@ -45,6 +55,14 @@ class Parser:
 	def skip(self, number = 1):
 		self.count += number
 
+	def follows(self):
+
+		# check whether the current token starts right where
+		# the one before it ends
+		#
+		line, column = self.positions[self.count - 1]
+		return self.positions[self.count] == (line, column + len(str(self.tokens[self.count - 1])))
+
 	#
 	# unit parsing methods
 	#
@@ -69,25 +87,88 @@ class Parser:
 		self.skip()
 		return items
 
+	def parse_number(self):
+
+		# numbers are scanned a digit at a time, so the digits
+		# that follow each other with no space are joined
+		#
+		number = self.current()
+		self.skip()
+		while self.current() in digits and self.follows():
+			number += self.current()
+			self.skip()
+		return number
+
+	def parse_operator(self):
+		operator = self.current()
+		if operator not in ('=', '!', '<', '>'):
+			return None
+		if self.next() == '=':
+			self.skip()
+			if self.follows():
+				operator += '='
+		self.skip()
+
+		# a single equals sign compares as well
+		#
+		if operator == '=':
+			operator = '=='
+		return operator if operator in operators else None
+
+	def parse_arguments(self, closing):
+		arguments = []
+		self.skip()
+		while self.current() is not None and self.current() != closing:
+			arguments.append(self.parse_expression())
+			if self.current() == ',':
+				self.skip()
+			elif self.current() != closing:
+				self.skip()
+		self.skip()
+		return arguments
+
+	def parse_operand(self):
+		token = self.current()
+
+		# parse array
+		#
+		if token == '[':
+			return self.parse_arguments(']')
+
+		# parse function call
+		#
+		elif isinstance(token, str) and identifier.match(token) and self.next() == '(':
+			return self.parse_function_call()
+
+		# parse number
+		#
+		elif token == '-' or token in digits:
+			return self.parse_number()
+
+		# parse single value
+		#
+		else:
+			self.skip()
+			return token
+
+	def parse_expression(self):
+		value = self.parse_operand()
+		operator = self.parse_operator()
+		if operator:
+			return {
+				'type': 'operator',
+				'name': operator,
+				'params': [value, self.parse_operand()]
+			}
+		return value
+
 	def parse_function_call(self):
 		function_name = self.current()
 		self.skip()
 
 		params = []
 		if self.current() == '(':
-			self.skip();
-			if self.current() == '[':
-				params = self.parse_array()
-			else:
-				params = self.parse_list()
-			self.skip()
-
-		# while self.next() != ')':
-		#	params.append(self.current())
-		#	self.skip()
-		# params.append(self.current())
-		# self.skip(2)
-		# value = function_name + '(' + ''.join(params) + ')'
+			params = self.parse_arguments(')')
 		return {
 			'type': 'function',
 			'name': function_name,
@@ -113,7 +194,7 @@ class Parser:
 			# parse function call
 			#
 			elif self.next() == '(':
-				value = self.parse_function_call()
+				value = self.parse_expression()
 
 			# parse single value
 			#
@@ -124,8 +205,9 @@ class Parser:
 			parameters[name] = value
 		return parameters
 
-	def parse_transform(self, line):
-		self.tokens = self.tokenizer.scan(line)
+	def parse_transform(self, line, number = 1):
+		self.tokens = self.tokenizer.scan(line, number)
+		self.positions = self.tokenizer.positions
 		self.count = 0
 		name = self.current()
 
@@ -169,6 +251,6 @@ class Parser:
 	def read(self, filename):
 		transforms = []
 		with open(filename, 'r') as file:
-			for line in file:
-				transforms.append(self.parse_transform(line))
+			for number, line in enumerate(file, 1):
+				transforms.append(self.parse_transform(line, number))
 		return transforms
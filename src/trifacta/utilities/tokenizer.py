@@ -15,6 +15,26 @@
 #     Copyright (C) 2025, Data Science Institute, University of Wisconsin      #
 ################################################################################
 
+import re
+
+#
+# globals
+#
+
+# pattern that matches the whitespace before a token and the
+# whole token, with one group per kind of token, where any
+# quote or brace that is matched as a symbol was not closed,
+# and symbols are never spaces so that trailing spaces are
+# not matched as a token
+#
+token_pattern = re.compile(r""" *(?:(\{[^}]*\})|'([^'\\]*(?:\\.[^'\\]*)*)'|("[^"]*")|(`[^`]*`)|([^\W\d]\w*)|([^ ]))""", re.DOTALL)
+escapes = re.compile(r'\\(.)', re.DOTALL)
+unclosed = {
+	'{': 'Unterminated object',
+	'"': 'Unterminated string',
+	'`': 'Unterminated pattern'
+}
+
 #
 # class definition
 #
@@ -28,6 +48,7 @@ class Tokenizer:
 	def __init__(self):
 		self.chars = []
 		self.count = 0
+		self.positions = []
 
 	#
 	# helper methods
@@ -35,7 +56,7 @@ class Tokenizer:
 
 	def start(self, chars = None):
 		self.count = 0
-		if chars:
+		if chars is not None:
 			self.chars = chars
 
 	def current(self):
@@ -50,124 +71,130 @@ class Tokenizer:
 	def finished(self):
 		return self.count == len(self.chars) - 1
 
+	def get_position(self, text, position):
+		line = self.line + text.count('\n', 0, position)
+		return line, position - (text.rfind('\n', 0, position) + 1) + 1
+
+	def fail(self, text, position, message):
+		line, column = self.get_position(text, position)
+		raise ValueError(message + ' at line ' + str(line) + ', column ' + str(column))
+
 	#
 	# scanning functions
 	#
 
-	def scan_whitespace(self):
-		while self.current() == ' ':
-			self.skip()
-
-	def scan_object(self):
-		string = ''
-		while self.current() != '}':
-			string += self.current()
-			self.skip()
-		string += self.current()
-		self.skip()
-
-		return string
-
-	def scan_single_quoted_string(self):
-		string = ''
-		self.skip()
-		while self.current() != "'" and not self.finished():
-			if self.current() == '\\':
-				self.skip()
-				string += self.current()
-				self.skip()
-			else:
-				string += self.current()
-				self.skip()
-		self.skip()
-		return "'" + string + "'"
-
-	def scan_double_quoted_string(self):
-		string = ''
-		self.skip()
-		while self.current() != '"':
-			string += self.current()
-			self.skip()
-		self.skip()
-
-		return '"' + string + '"'
-
-	def scan_pattern(self):
-		string = ''
-		self.skip()
-		while self.current() != "`":
-			string += self.current()
-			self.skip()
-		self.skip()
-
-		return "`" + string + "`"
-
-	def scan_identifier(self):
-		string = ''
-		self.skip
-		char = self.current()
-		while char != None and (char.isalpha() or char.isdigit() or char == '_'):
-			string += char
-			self.skip()
-			char = self.current()
+	def scan_single_quoted_string(self, text, position):
+
+		# strings that are not closed end before the last char
+		# of the line, so they are scanned a char at a time
+		#
+		last = len(text) - 1
+		count = position + 1
+		chars = []
+		while count < len(text) and text[count] != "'" and count != last:
+			if text[count] == '\\':
+				count += 1
+				if count == len(text):
+					break
+			chars.append(text[count])
+			count += 1
+		if count >= len(text):
+			self.fail(text, position, 'Unterminated string')
+		return "'" + ''.join(chars) + "'", count + 1
+
+	def scan_identifier(self, text, position):
+
+		# identifiers hold letters, digits and underscores, which
+		# only differ from the word chars of patterns outside
+		# of ascii
+		#
+		count = position
+		while count < len(text) and (text[count].isalpha() or text[count].isdigit() or text[count] == '_'):
+			count += 1
+		string = text[position:count]
 
 		if (string == 'true'):
-			return True
+			return True, count
 		elif (string == 'false'):
-			return False
+			return False, count
 		else:
-			return string
-
-	def scan_symbol(self):
-		token = None
-		if (self.current() != "\n"):
-			token = self.current()
-		self.skip()
-		return token
+			return string, count
 
 	#
 	# scanning methods
 	#
 
-	def scan(self, line):
+	def scan(self, line, number = 1):
 		tokens = []
+		positions = []
+		self.line = number
 
 		# start
 		#
 		self.start(line)
-
-		# scan chars
+		text = self.chars
+		last = len(text) - 1
+		multiline = text.find('\n', 0, last) != -1
+		line_start = 0
+		counted = 0
+		position = 0
+
+		# match whole tokens, where scanning stops once the last
+		# char is reached, before skipping whitespace, and
+		# starts over after tokens that are scanned by hand
 		#
-		while not self.finished():
-			token = None
-
-			# scan through whitespace
-			#
-			self.scan_whitespace()
-
-			# scan items
-			#
-			char = self.current()
-			if char == None:
-				break;
-			elif char == '{':
-				token = self.scan_object()
-			elif char == "'":
-				token = self.scan_single_quoted_string()
-			elif char == '"':
-				token = self.scan_double_quoted_string()
-			elif char == "`":
-				token = self.scan_pattern()
-			elif char.isalpha() or char == '_':
-				token = self.scan_identifier()
-			else:
-				token = self.scan_symbol()
-
-			# add to tokens
-			#
-			if token:
-				tokens.append(token)
-
+		scanning = True
+		while scanning:
+			scanning = False
+			for match in token_pattern.finditer(text, position):
+				if match.start() == last:
+					break
+				kind = match.lastindex
+				token = match.group(kind)
+				start = match.start(kind)
+				position = match.end()
+
+				if kind == 2:
+					if '\\' in token:
+						token = escapes.sub(r'\1', token)
+					token = "'" + token + "'"
+				elif kind == 5:
+					if token == 'true':
+						token = True
+					elif token == 'false':
+						token = False
+					elif not token.isascii():
+						if text[start].isalpha() or text[start] == '_':
+							token, position = self.scan_identifier(text, start)
+						else:
+							token, position = text[start], start + 1
+						scanning = True
+				elif kind == 6:
+					if token == '\n':
+						token = None
+					elif token == "'":
+						token, position = self.scan_single_quoted_string(text, start)
+						scanning = True
+					elif token in unclosed:
+						self.fail(text, start, unclosed[token])
+
+				# add to tokens along with their line and column,
+				# where newlines have no token but false does
+				#
+				if token is not None:
+					if multiline:
+						newlines = text.count('\n', counted, start)
+						if newlines:
+							number += newlines
+							line_start = text.rfind('\n', counted, start) + 1
+						counted = start
+					tokens.append(token)
+					positions.append((number, start - line_start + 1))
+				if scanning:
+					break
+
+		self.count = position
+		self.positions = positions
 		return tokens
 
 	def echo(self, filename):